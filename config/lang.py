@@ -22,6 +22,65 @@ frame_debug_name = "frame_debug_name"
 frame_help_name = "frame_help_name"
 frame_threads_name = "frame_threads_name"
 frame_command_name = "frame_command_name"
+frame_jobs_name = "frame_jobs_name"
+frame_jobs_list_name = "frame_jobs_list_name"
+frame_probe_workers_name = "frame_probe_workers_name"
+frame_segments_name = "frame_segments_name"
+label_segment_workers = "label_segment_workers"
+label_segments_help = "label_segments_help"
+frame_fast_path_name = "frame_fast_path_name"
+label_force_encode = "label_force_encode"
+job_state_skipped = "job_state_skipped"
+strategy_encode = "strategy_encode"
+strategy_copy_video = "strategy_copy_video"
+strategy_remux = "strategy_remux"
+strategy_skip = "strategy_skip"
+strategy_resumed = "strategy_resumed"
+frame_extra_outputs_name = "frame_extra_outputs_name"
+job_state_copying = "job_state_copying"
+frame_scratch_name = "frame_scratch_name"
+label_scratch_help = "label_scratch_help"
+space_title = "space_title"
+space_required = "space_required"
+space_free = "space_free"
+space_scratch = "space_scratch"
+space_question = "space_question"
+button_tune_name = "button_tune_name"
+label_tune = "label_tune"
+label_tune_running = "label_tune_running"
+label_tune_none = "label_tune_none"
+error_invalid_number = "error_invalid_number"
+button_pause_name = "button_pause_name"
+button_resume_name = "button_resume_name"
+button_move_up_name = "button_move_up_name"
+button_move_down_name = "button_move_down_name"
+label_low_priority = "label_low_priority"
+job_state_paused = "job_state_paused"
+label_placement = "label_placement"
+label_log_level = "label_log_level"
+label_log_filter = "label_log_filter"
+label_log_max_lines = "label_log_max_lines"
+queue_column_file = "queue_column_file"
+queue_column_codec = "queue_column_codec"
+queue_column_duration = "queue_column_duration"
+queue_column_resolution = "queue_column_resolution"
+queue_column_size = "queue_column_size"
+queue_column_status = "queue_column_status"
+queue_status_probing = "queue_status_probing"
+queue_status_ready = "queue_status_ready"
+queue_status_unreadable = "queue_status_unreadable"
+button_folder_name = "button_folder_name"
+title_select_folder = "title_select_folder"
+label_scan_codecs = "label_scan_codecs"
+label_scan_extensions = "label_scan_extensions"
+scan_filter_all = "scan_filter_all"
+scan_filter_h264_hevc = "scan_filter_h264_hevc"
+scan_filter_prores_dnxhr = "scan_filter_prores_dnxhr"
+scan_filter_mjpeg = "scan_filter_mjpeg"
+label_scan_progress = "label_scan_progress"
+label_extra_outputs_help = "label_extra_outputs_help"
+resume_title = "resume_title"
+resume_question = "resume_question"
 
 button_close_name = "button_close_name"
 button_files_name = "button_files_name"
@@ -31,6 +90,10 @@ button_output_name = "button_output_name"
 button_convert_name = "button_convert_name"
 button_cancel_name = "button_cancel_name"
 button_emptylogs_name = "button_emptylogs_name"
+button_cancel_job_name = "button_cancel_job_name"
+button_estimate_name = "button_estimate_name"
+label_estimate = "label_estimate"
+label_no_history = "label_no_history"
 
 label_h264_name = "label_h264_name"
 label_help_files_name1 = "label_help_files_name1"
@@ -52,9 +115,17 @@ title_video_files = "title_video_files"
 title_select_output = "title_select_output"
 confirmation_remove_label = "confirmation_remove_label"
 conversion_inprogress = "conversion_inprogress"
+conversion_preparing = "conversion_preparing"
 end_batch = "end_batch"
 end_batch_notice = "end_batch_notice"
 cuda_unknown = "cuda_unknown"
+mode_unavailable = "mode_unavailable"
+end_batch_failed = "end_batch_failed"
+job_state_queued = "job_state_queued"
+job_state_running = "job_state_running"
+job_state_done = "job_state_done"
+job_state_failed = "job_state_failed"
+job_state_canceled = "job_state_canceled"
 
 lang, enc = locale.getdefaultlocale()
 
@@ -85,6 +156,8 @@ dict['fr_FR'][confirmation_remove_label] = "Effacer toute la liste ?"
 dict['en_US'][confirmation_remove_label] = "Clear the entire list ?"
 dict['fr_FR'][conversion_inprogress] = "Conversion en cours"
 dict['en_US'][conversion_inprogress] = "Conversion in progress"
+dict['fr_FR'][conversion_preparing] = "Préparation du lot (analyse des fichiers, espace disque)..."
+dict['en_US'][conversion_preparing] = "Preparing the batch (probing files, disk space)..."
 dict["fr_FR"][error_read_time] = "Impossible de lire la durée de la vidéo."
 dict["en_US"][error_read_time] = "Unable to read video duration."
 dict['fr_FR'][end_batch] = "Fin de la conversion"
@@ -93,6 +166,20 @@ dict['fr_FR'][end_batch_notice] = "Tous les fichiers ont été traités."
 dict['en_US'][end_batch_notice] = "All files have been processed."
 dict['fr_FR'][cuda_unknown] = "Mode inconnu ou non disponible sans CUDA."
 dict['en_US'][cuda_unknown] = "Unknown mode or unavailable without CUDA."
+dict['fr_FR'][mode_unavailable] = "Mode non disponible : l'encodeur nécessaire est absent de FFmpeg sur cette machine."
+dict['en_US'][mode_unavailable] = "Mode unavailable: the required encoder is missing from FFmpeg on this machine."
+dict['fr_FR'][end_batch_failed] = "Les fichiers suivants n'ont pas pu être convertis"
+dict['en_US'][end_batch_failed] = "The following files could not be converted"
+dict['fr_FR'][job_state_queued] = "En attente"
+dict['en_US'][job_state_queued] = "Queued"
+dict['fr_FR'][job_state_running] = "En cours"
+dict['en_US'][job_state_running] = "Running"
+dict['fr_FR'][job_state_done] = "Terminé"
+dict['en_US'][job_state_done] = "Done"
+dict['fr_FR'][job_state_failed] = "Échec"
+dict['en_US'][job_state_failed] = "Failed"
+dict['fr_FR'][job_state_canceled] = "Annulé"
+dict['en_US'][job_state_canceled] = "Canceled"
 
 dict['fr_FR'][tab_files_name] = "Fichiers"
 dict['en_US'][tab_files_name] = "Files"
@@ -120,6 +207,14 @@ dict['fr_FR'][button_cancel_name] = "Annuler"
 dict['en_US'][button_cancel_name] = "Cancel"
 dict['fr_FR'][button_emptylogs_name] = "Vider les logs"
 dict['en_US'][button_emptylogs_name] = "Empty Logs"
+dict['fr_FR'][button_cancel_job_name] = "Annuler le job"
+dict['en_US'][button_cancel_job_name] = "Cancel Job"
+dict['fr_FR'][button_estimate_name] = "Estimer la durée"
+dict['en_US'][button_estimate_name] = "Estimate Duration"
+dict['fr_FR'][label_estimate] = "Durée estimée du lot"
+dict['en_US'][label_estimate] = "Estimated batch duration"
+dict['fr_FR'][label_no_history] = "pas encore d'historique pour ce mode"
+dict['en_US'][label_no_history] = "no history yet for this mode"
 
 dict["fr_FR"][frame_files_name] = "Sélection des fichiers"
 dict["en_US"][frame_files_name] = "File Selection"
@@ -137,6 +232,124 @@ dict['fr_FR'][frame_progress_name] = "Progression"
 dict['en_US'][frame_progress_name] = "Progress"
 dict['fr_FR'][frame_command_name] = "Commandes"
 dict['en_US'][frame_command_name] = "Commands"
+dict['fr_FR'][frame_jobs_name] = "Jobs simultanés"
+dict['en_US'][frame_jobs_name] = "Concurrent Jobs"
+dict['fr_FR'][frame_jobs_list_name] = "Jobs"
+dict['en_US'][frame_jobs_list_name] = "Jobs"
+dict['fr_FR'][frame_probe_workers_name] = "Analyses ffprobe simultanées"
+dict['en_US'][frame_probe_workers_name] = "Concurrent ffprobe analyses"
+dict['fr_FR'][frame_segments_name] = "Encodage segmenté"
+dict['en_US'][frame_segments_name] = "Segmented Encoding"
+dict['fr_FR'][label_segment_workers] = "Segments parallèles par fichier (0 = désactivé)"
+dict['en_US'][label_segment_workers] = "Parallel segments per file (0 = off)"
+dict['fr_FR'][label_segments_help] = "Modes libx264/libx265, fichiers de plus de 5 minutes"
+dict['en_US'][label_segments_help] = "libx264/libx265 modes, files longer than 5 minutes"
+dict['fr_FR'][frame_fast_path_name] = "Fichiers déjà au format cible"
+dict['en_US'][frame_fast_path_name] = "Files Already in Target Format"
+dict['fr_FR'][label_force_encode] = "Toujours ré-encoder (désactive l'ignorance, le remux et la copie vidéo)"
+dict['en_US'][label_force_encode] = "Always re-encode (disables skip, remux and video copy)"
+dict['fr_FR'][job_state_skipped] = "Ignoré"
+dict['en_US'][job_state_skipped] = "Skipped"
+dict['fr_FR'][strategy_encode] = "Ré-encodés"
+dict['en_US'][strategy_encode] = "Re-encoded"
+dict['fr_FR'][strategy_copy_video] = "Vidéo copiée, audio converti"
+dict['en_US'][strategy_copy_video] = "Video copied, audio converted"
+dict['fr_FR'][strategy_remux] = "Remux (-c copy)"
+dict['en_US'][strategy_remux] = "Remuxed (-c copy)"
+dict['fr_FR'][strategy_skip] = "Ignorés (déjà au format cible)"
+dict['en_US'][strategy_skip] = "Skipped (already in target format)"
+dict['fr_FR'][strategy_resumed] = "Déjà convertis (lot repris)"
+dict['en_US'][strategy_resumed] = "Already converted (resumed batch)"
+dict['fr_FR'][frame_extra_outputs_name] = "Sorties supplémentaires"
+dict['en_US'][frame_extra_outputs_name] = "Additional Outputs"
+dict['fr_FR'][label_extra_outputs_help] = "Produites en plus du mode choisi, à partir d'un seul décodage de chaque fichier :"
+dict['en_US'][label_extra_outputs_help] = "Produced in addition to the selected mode, from a single decode of each file:"
+dict['fr_FR'][job_state_copying] = "Copie vers la destination"
+dict['en_US'][job_state_copying] = "Copying to destination"
+dict['fr_FR'][frame_scratch_name] = "Dossier de travail local"
+dict['en_US'][frame_scratch_name] = "Local Scratch Directory"
+dict['fr_FR'][label_scratch_help] = "(facultatif) encodage sur un disque local rapide, puis copie vers la destination en arrière-plan"
+dict['en_US'][label_scratch_help] = "(optional) encode on a fast local disk, then copy to the destination in the background"
+dict['fr_FR'][space_title] = "Espace disque insuffisant"
+dict['en_US'][space_title] = "Not enough disk space"
+dict['fr_FR'][space_required] = "Taille estimée des fichiers produits"
+dict['en_US'][space_required] = "Estimated output size"
+dict['fr_FR'][space_free] = "Espace libre sur la destination"
+dict['en_US'][space_free] = "Free space on destination"
+dict['fr_FR'][space_scratch] = "Dossier de travail (requis / libre)"
+dict['en_US'][space_scratch] = "Scratch directory (required / free)"
+dict['fr_FR'][space_question] = "Le disque risque d'être plein avant la fin du lot. Lancer quand même ?"
+dict['en_US'][space_question] = "The disk may fill up before the batch ends. Start anyway?"
+dict['fr_FR'][button_tune_name] = "Réglage auto"
+dict['en_US'][button_tune_name] = "Auto-tune"
+dict['fr_FR'][label_tune] = "Réglage pour ce mode"
+dict['en_US'][label_tune] = "Tuning for this mode"
+dict['fr_FR'][label_tune_running] = "calibration en cours..."
+dict['en_US'][label_tune_running] = "calibrating..."
+dict['fr_FR'][label_tune_none] = "aucun (0 = choix de FFmpeg, 1 job)"
+dict['en_US'][label_tune_none] = "none (0 = FFmpeg's choice, 1 job)"
+dict['fr_FR'][error_invalid_number] = "Les nombres de threads et de jobs doivent être des entiers positifs ou nuls (0 = auto)."
+dict['en_US'][error_invalid_number] = "Thread and job counts must be non-negative integers (0 = auto)."
+dict['fr_FR'][button_pause_name] = "Pause"
+dict['en_US'][button_pause_name] = "Pause"
+dict['fr_FR'][button_resume_name] = "Reprendre"
+dict['en_US'][button_resume_name] = "Resume"
+dict['fr_FR'][button_move_up_name] = "Monter"
+dict['en_US'][button_move_up_name] = "Move Up"
+dict['fr_FR'][button_move_down_name] = "Descendre"
+dict['en_US'][button_move_down_name] = "Move Down"
+dict['fr_FR'][label_low_priority] = "Priorité basse (libère le poste : nice 19, E/S au repos)"
+dict['en_US'][label_low_priority] = "Low priority (frees the workstation: nice 19, idle I/O)"
+dict['fr_FR'][job_state_paused] = "En pause"
+dict['en_US'][job_state_paused] = "Paused"
+dict['fr_FR'][label_placement] = "Épingler chaque job sur ses propres cœurs d'un nœud NUMA (machines multi-processeurs)"
+dict['en_US'][label_placement] = "Pin each job to its own cores on one NUMA node (multi-socket machines)"
+dict['fr_FR'][label_log_level] = "Niveau"
+dict['en_US'][label_log_level] = "Level"
+dict['fr_FR'][label_log_filter] = "Job / texte"
+dict['en_US'][label_log_filter] = "Job / text"
+dict['fr_FR'][label_log_max_lines] = "Lignes conservées"
+dict['en_US'][label_log_max_lines] = "Lines kept"
+dict['fr_FR'][queue_column_file] = "Fichier"
+dict['en_US'][queue_column_file] = "File"
+dict['fr_FR'][queue_column_codec] = "Codec"
+dict['en_US'][queue_column_codec] = "Codec"
+dict['fr_FR'][queue_column_duration] = "Durée"
+dict['en_US'][queue_column_duration] = "Duration"
+dict['fr_FR'][queue_column_resolution] = "Résolution"
+dict['en_US'][queue_column_resolution] = "Resolution"
+dict['fr_FR'][queue_column_size] = "Taille"
+dict['en_US'][queue_column_size] = "Size"
+dict['fr_FR'][queue_column_status] = "État"
+dict['en_US'][queue_column_status] = "Status"
+dict['fr_FR'][queue_status_probing] = "Analyse..."
+dict['en_US'][queue_status_probing] = "Probing..."
+dict['fr_FR'][queue_status_ready] = "Prêt"
+dict['en_US'][queue_status_ready] = "Ready"
+dict['fr_FR'][queue_status_unreadable] = "Illisible"
+dict['en_US'][queue_status_unreadable] = "Unreadable"
+dict['fr_FR'][button_folder_name] = "Ajouter un dossier"
+dict['en_US'][button_folder_name] = "Add Folder"
+dict['fr_FR'][title_select_folder] = "Sélectionner un dossier (import récursif)"
+dict['en_US'][title_select_folder] = "Select a Folder (recursive import)"
+dict['fr_FR'][label_scan_codecs] = "Codec (import de dossier)"
+dict['en_US'][label_scan_codecs] = "Codec (folder import)"
+dict['fr_FR'][label_scan_extensions] = "Extensions"
+dict['en_US'][label_scan_extensions] = "Extensions"
+dict['fr_FR'][scan_filter_all] = "Tous"
+dict['en_US'][scan_filter_all] = "All"
+dict['fr_FR'][scan_filter_h264_hevc] = "H.264/HEVC uniquement"
+dict['en_US'][scan_filter_h264_hevc] = "H.264/HEVC only"
+dict['fr_FR'][scan_filter_prores_dnxhr] = "ProRes/DNxHR uniquement"
+dict['en_US'][scan_filter_prores_dnxhr] = "ProRes/DNxHR only"
+dict['fr_FR'][scan_filter_mjpeg] = "MJPEG uniquement"
+dict['en_US'][scan_filter_mjpeg] = "MJPEG only"
+dict['fr_FR'][label_scan_progress] = "{seen} fichiers parcourus, {added} ajoutés, {excluded} sorties exclues, {rejected} autres codecs"
+dict['en_US'][label_scan_progress] = "{seen} files scanned, {added} added, {excluded} outputs excluded, {rejected} other codecs"
+dict['fr_FR'][resume_title] = "Lot interrompu"
+dict['en_US'][resume_title] = "Interrupted batch"
+dict['fr_FR'][resume_question] = "Un lot n'a pas été terminé. Recharger ses fichiers ? Les fichiers déjà convertis ne seront pas ré-encodés"
+dict['en_US'][resume_question] = "A batch was not completed. Reload its files? Files already converted will not be re-encoded"
 
 dict['fr_FR'][label_h264_name] = "Les fichiers H.264/H.265 sont marqués en rouge."
 dict['en_US'][label_h264_name] = "H.264/H.265 files are marked in red."
@@ -156,4 +369,5 @@ dict["fr_FR"][label_inwait] = "En attente"
 dict["en_US"][label_inwait] = "Waiting.."
 
 def get(key):
-    return dict[lang][key] if key in dict[lang] else dict["en_US"][key]
\ No newline at end of file
+    texts = dict.get(lang, dict["en_US"])
+    return texts[key] if key in texts else dict["en_US"][key]
\ No newline at end of file
@@ -1,9 +1,4 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-import tkinter.font as tkFont
-
-from click import style
-from distro import name
+from tkinter import ttk
 
 ## TODO
 # Voir encore la couleur des bordures des boutons
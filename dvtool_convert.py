@@ -1,34 +1,73 @@
 #!/usr/bin/python3
 # VERSION 1.1
 
-import libs.libui as libui
-import libs.libtools as libtools
+import logging
+import sys
 
 
-def main() -> None:
+def main(profile_startup: bool = False) -> int:
+    import libs.libstartup as libstartup
+    libstartup.start()
+
+    # Import différé : le mode ligne de commande ne doit pas charger tkinter
+    import libs.libui as libui
+    import libs.libtools as libtools
+    libstartup.mark("imports")
+
+    # Vérification rapide (PATH) ; ffmpeg/ffprobe et les encodeurs sont interrogés en arrière-plan
     if not libtools.check_ffmpeg():
-        return
+        return 3
+    libstartup.mark("check_ffmpeg")
 
-    root, notebook, input_files, output_dir, bold_font, close_button  = libui.create_princ()
+    root, notebook, output_dir, bold_font, close_button  = libui.create_princ()
+    libstartup.mark("window")
 
     #### ONGLET FICHIERS
-    files_list, input_files, select_button, remove_button, clear_button, output_button, output_dir = libui.create_files_tab(notebook, input_files, output_dir)
-
-    #### ONGLET OPTIONS
-    conversion_option, num_threads = libui.create_options_tab(notebook, bold_font)
+    file_queue, select_button, remove_button, clear_button, output_button, output_dir = libui.create_files_tab(notebook, output_dir)
+    libstartup.mark("files_tab")
 
-    #### ONGLET TRAITEMENT
-    libui.create_processing_tab(root, notebook, input_files, output_dir, files_list,
+    #### ONGLETS OPTIONS ET TRAITEMENT (construits à leur première ouverture)
+    conversion_option, num_threads, num_jobs = libui.create_options_tab(notebook, bold_font)
+    libui.create_processing_tab(root, notebook, file_queue, output_dir,
                                 select_button, remove_button, clear_button, output_button,
-                                close_button, conversion_option, num_threads)
+                                close_button, conversion_option, num_threads, num_jobs)
+    libtools.start_background_checks(conversion_option)
 
-    #### ONGLET DEBUG
-    debug_tab = libui.create_debug_tab(notebook)
+    #### PILOTAGE PAR SCRIPT (socket de contrôle)
+    libtools.start_control_server()
+    libstartup.mark("control_server")
 
-    #### ONGLET AIDE
+    #### REPRISE D'UN LOT INTERROMPU
+    if not profile_startup:
+        libtools.offer_resume(file_queue, output_dir, conversion_option)
+
+    #### ONGLETS DEBUG ET AIDE (construits à leur première ouverture)
+    libui.create_debug_tab(notebook)
     libui.create_help_tab(notebook, bold_font)
+    libstartup.mark("tabs")
+
+    # Premier affichage : la fenêtre est dessinée quand la boucle Tk devient inactive
+    def on_shown():
+        libstartup.mark("first_draw")
+        report = libstartup.report()
+        logging.debug(f"Startup : {report['total_ms']} ms ({report['steps']})")
+        if profile_startup:
+            import json
+            print(json.dumps(report))
+            root.destroy()
+    root.after_idle(on_shown)
 
     root.mainloop()
+    if profile_startup:
+        return 0 if libstartup.report()["ok"] else 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:] == ["--profile-startup"]:
+        # Rapport de démarrage (JSON sur stdout) ; code de retour 1 au-delà de l'objectif
+        sys.exit(main(profile_startup=True))
+    if len(sys.argv) > 1:
+        # Mode sans interface graphique (serveurs de rendu)
+        import libs.libcli as libcli
+        sys.exit(libcli.main(sys.argv[1:]))
+    sys.exit(main())
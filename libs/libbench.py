@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable, List, Optional
+import libs.libcaps as libcaps
+import libs.libffmpeg as libffmpeg
+import libs.libpaths as libpaths
+import libs.libprogress as libprogress
+
+# Banc d'essai des modes de conversion : sources synthétiques (lavfi testsrc2) encodées
+# par chaque mode à plusieurs nombres de threads et de jobs simultanés. Les mesures
+# (images/s, vitesse, temps CPU, pic mémoire, taille produite) sont écrites en JSON et
+# comparées à une référence enregistrée pour repérer les régressions.
+
+BENCH_VERSION = 1
+DEFAULT_DURATION = 10
+DEFAULT_SIZES = ("1080p",)
+SIZES = {"1080p": "1920x1080", "2160p": "3840x2160"}
+# Écart toléré par rapport à la référence (10 %)
+DEFAULT_TOLERANCE = 0.10
+
+# Encodage des sources synthétiques, par type de source
+SOURCE_ARGS = {
+    "h264": (["-c:v", "libx264", "-preset", "medium", "-crf", "18", "-pix_fmt", "yuv420p",
+              "-c:a", "aac", "-b:a", "192k"], ".mp4"),
+    "hevc": (["-c:v", "libx265", "-preset", "medium", "-crf", "22", "-pix_fmt", "yuv420p", "-tag:v", "hvc1",
+              "-c:a", "aac", "-b:a", "192k"], ".mp4"),
+    "prores": (["-c:v", "prores_ks", "-profile:v", "3", "-pix_fmt", "yuv422p10le", "-c:a", "pcm_s16le"], ".mov"),
+    "mjpeg": (["-c:v", "mjpeg", "-q:v", "2", "-pix_fmt", "yuvj422p", "-c:a", "pcm_s16le"], ".mov"),
+}
+
+def sources_for_mode(mode: str) -> List[str]:
+    """Types de sources adaptés à un mode (d'après son libellé d'entrée)."""
+    if mode.startswith("H.264/H.265"):
+        return ["h264", "hevc"]
+    if mode.startswith("MJPEG"):
+        return ["mjpeg"]
+    return ["prores"]
+
+def available_sources(mode: str) -> List[str]:
+    """Types de sources du mode dont l'encodeur vidéo est disponible (libx264 souvent absent)."""
+    return [kind for kind in sources_for_mode(mode) if libcaps.has_encoder(SOURCE_ARGS[kind][0][1])]
+
+def source_dir() -> str:
+    path = os.path.join(libpaths.cache_dir(), "bench")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def source_file(kind: str, size: str, duration: int) -> str:
+    return os.path.join(source_dir(), f"testsrc2_{size}_{duration}s_{kind}{SOURCE_ARGS[kind][1]}")
+
+def generate_source(kind: str, size: str, duration: int) -> str:
+    """Génère (ou réutilise) une source synthétique reproductible : mire testsrc2 et sinus 1 kHz.
+
+    Lève subprocess.CalledProcessError ou OSError si FFmpeg échoue (encodeur audio absent,
+    disque plein...).
+    """
+    args, _ = SOURCE_ARGS[kind]
+    path = source_file(kind, size, duration)
+    if os.path.exists(path):
+        return path
+    tmp = libffmpeg.get_partial_file(path)
+    cmd = ["ffmpeg", "-hide_banner", "-y",
+           "-f", "lavfi", "-i", f"testsrc2=size={SIZES[size]}:rate=30000/1001",
+           "-f", "lavfi", "-i", "sine=frequency=1000:sample_rate=48000",
+           "-t", str(duration), "-ac", "2"] + args + [tmp]
+    logging.debug(f"Command FFmpeg : {' '.join(cmd)}")
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        os.replace(tmp, path)
+    except (subprocess.CalledProcessError, OSError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+def _run_one(cmd: List[str], result: dict) -> None:
+    """Exécute une commande FFmpeg et mesure temps CPU et pic mémoire (rusage du processus)."""
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               stdin=subprocess.DEVNULL, text=True)
+    parser = libprogress.ProgressParser()
+    last = {}
+    for line in process.stdout:
+        snapshot = parser.feed(line)
+        if snapshot:
+            # Le dernier bloc (progress=end) peut ne pas répéter fps et speed
+            last.update({k: v for k, v in snapshot.items() if v is not None})
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    result.update(returncode=process.returncode, fps=last.get("fps"), speed=last.get("speed"),
+                  cpu_seconds=usage.ru_utime + usage.ru_stime, max_rss_mb=usage.ru_maxrss / 1024)
+
+def run_case(source: str, mode: str, threads: int, jobs: int, work_dir: str) -> dict:
+    """Lance `jobs` encodages simultanés du même mode et retourne les mesures agrégées."""
+    runs, workers = [], []
+    for i in range(jobs):
+        out_file = os.path.join(work_dir, f"{i}_" + os.path.basename(libffmpeg.get_output_file(source, mode, work_dir)))
+        cmd = libffmpeg.build_ffmpeg_command(source, mode, out_file, threads)
+        cmd = cmd[:1] + libprogress.PROGRESS_ARGS + cmd[1:]
+        result = {"out_file": out_file}
+        runs.append(result)
+        workers.append(threading.Thread(target=_run_one, args=(cmd, result)))
+    started = time.monotonic()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.monotonic() - started
+
+    sizes = [os.path.getsize(r["out_file"]) for r in runs if os.path.exists(r["out_file"])]
+    for r in runs:
+        try:
+            os.unlink(r["out_file"])
+        except OSError:
+            pass
+    speeds = [r["speed"] for r in runs if r.get("speed")]
+    fps = [r["fps"] for r in runs if r.get("fps")]
+    return {
+        "mode": mode, "source": os.path.basename(source), "threads": threads, "jobs": jobs,
+        "ok": all(r.get("returncode") == 0 for r in runs),
+        "wall_seconds": round(wall, 3),
+        # Débit cumulé des jobs simultanés
+        "fps": round(sum(fps), 2) if fps else None,
+        "speed": round(sum(speeds), 3) if speeds else None,
+        "cpu_seconds": round(sum(r.get("cpu_seconds", 0.0) for r in runs), 3),
+        "max_rss_mb": round(max((r.get("max_rss_mb", 0.0) for r in runs), default=0.0), 1),
+        "output_bytes": sizes[0] if sizes else None,
+    }
+
+def failed_case(source: str, mode: str, threads: int, jobs: int, error: str) -> dict:
+    """Mesures d'un cas qui n'a pas pu être lancé (source non générée)."""
+    return {
+        "mode": mode, "source": os.path.basename(source), "threads": threads, "jobs": jobs,
+        "ok": False, "error": error, "wall_seconds": None, "fps": None, "speed": None,
+        "cpu_seconds": None, "max_rss_mb": None, "output_bytes": None,
+    }
+
+def case_key(result: dict) -> str:
+    return f"{result['mode']}|{result['source']}|{result['threads']}|{result['jobs']}"
+
+def run_bench(modes: List[str], sizes=DEFAULT_SIZES, thread_counts=(0,), job_counts=(1,),
+              duration: int = DEFAULT_DURATION, on_result: Optional[Callable] = None) -> dict:
+    """Exécute le banc d'essai complet et retourne le rapport."""
+    caps = libcaps.get_capabilities() or {}
+    report = {
+        "version": BENCH_VERSION,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"platform": platform.platform(), "cpu": platform.processor() or platform.machine(),
+                    "cpu_count": os.cpu_count(), "ffmpeg": caps.get("version")},
+        "duration": duration,
+        "results": [],
+    }
+    work_dir = tempfile.mkdtemp(prefix="dvtool-bench-")
+    try:
+        for size in sizes:
+            for mode in modes:
+                if not libffmpeg.mode_available(mode):
+                    logging.warning(f"Benchmark : mode unavailable, skipped : {mode}")
+                    continue
+                for kind in available_sources(mode):
+                    error = None
+                    try:
+                        source = generate_source(kind, size, duration)
+                    except subprocess.CalledProcessError as e:
+                        error = f"source generation failed (ffmpeg exit code {e.returncode})"
+                    except OSError as e:
+                        error = f"source generation failed ({e})"
+                    if error:
+                        # Les cas de cette source sont notés en échec (rapport, comparaison, code de retour)
+                        logging.error(f"Benchmark : {kind} {size} {error}")
+                        source = source_file(kind, size, duration)
+                    for jobs in job_counts:
+                        for threads in thread_counts:
+                            if error:
+                                result = failed_case(source, mode, threads, jobs, error)
+                            else:
+                                result = run_case(source, mode, threads, jobs, work_dir)
+                            report["results"].append(result)
+                            if on_result:
+                                on_result(result)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+def compare(report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[dict]:
+    """Liste les cas plus lents (vitesse) ou plus gros (taille produite) que la référence."""
+    reference = {case_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        base = reference.get(case_key(result))
+        if not base:
+            continue
+        if base.get("ok") and not result["ok"]:
+            regressions.append({"case": case_key(result), "metric": "ok", "baseline": True, "value": False})
+        if base.get("speed") and result["speed"] and result["speed"] < base["speed"] * (1 - tolerance):
+            regressions.append({"case": case_key(result), "metric": "speed",
+                                "baseline": base["speed"], "value": result["speed"]})
+        if base.get("output_bytes") and result["output_bytes"] \
+                and result["output_bytes"] > base["output_bytes"] * (1 + tolerance):
+            regressions.append({"case": case_key(result), "metric": "output_bytes",
+                                "baseline": base["output_bytes"], "value": result["output_bytes"]})
+    return regressions
+
+def baseline_file() -> str:
+    return os.path.join(libpaths.data_dir(), "bench_baseline.json")
+
+def load_report(filename: str) -> Optional[dict]:
+    try:
+        with open(filename, "r") as f:
+            data = json.load(f)
+        return data if data.get("version") == BENCH_VERSION else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def save_report(report: dict, filename: Optional[str] = None) -> str:
+    """Écrit le rapport (par défaut dans ~/.local/state/dvtool/bench/) et retourne son chemin."""
+    if filename is None:
+        directory = os.path.join(libpaths.state_dir(), "bench")
+        os.makedirs(directory, exist_ok=True)
+        filename = os.path.join(directory, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    libpaths.atomic_write_json(filename, report)
+    return filename
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+import libs.libpaths as libpaths
+
+# Registre des capacités de FFmpeg : encodeurs, accélérations matérielles et version.
+# Construit une seule fois par processus et conservé sur disque, indexé par le chemin
+# du binaire ffmpeg et sa date de modification (une mise à jour de ffmpeg le reconstruit).
+
+CACHE_VERSION = 1
+
+_lock = threading.Lock()
+_caps = None
+
+def cache_file() -> str:
+    return os.path.join(libpaths.cache_dir(), "capabilities.json")
+
+def _run(args: List[str]) -> Optional[str]:
+    try:
+        result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+        return result.stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_encoders(output: str) -> List[str]:
+    """Extrait les noms d'encodeurs de `ffmpeg -encoders` (lignes après " ------")."""
+    encoders = []
+    started = False
+    for line in output.splitlines():
+        if line.strip().startswith("------"):
+            started = True
+            continue
+        parts = line.split()
+        if started and len(parts) >= 2:
+            encoders.append(parts[1])
+    return encoders
+
+def parse_hwaccels(output: str) -> List[str]:
+    """Extrait les méthodes de `ffmpeg -hwaccels` (une par ligne après l'en-tête)."""
+    return [line.strip() for line in output.splitlines()[1:] if line.strip()]
+
+def probe_capabilities(ffmpeg_path: str) -> Optional[dict]:
+    """Interroge le binaire ffmpeg (3 appels) ; None si ffmpeg ne répond pas."""
+    version = _run([ffmpeg_path, "-hide_banner", "-version"])
+    encoders = _run([ffmpeg_path, "-hide_banner", "-encoders"])
+    hwaccels = _run([ffmpeg_path, "-hide_banner", "-hwaccels"])
+    if version is None or encoders is None:
+        return None
+    return {
+        "version": (version.splitlines() or [""])[0].strip(),
+        "encoders": parse_encoders(encoders),
+        "hwaccels": parse_hwaccels(hwaccels or ""),
+    }
+
+def get_capabilities() -> Optional[dict]:
+    """Retourne le registre des capacités (None si ffmpeg est introuvable)."""
+    global _caps
+    with _lock:
+        if _caps is not None:
+            return _caps or None
+
+        _caps = {}
+        ffmpeg_path = shutil.which("ffmpeg")
+        if ffmpeg_path is None:
+            return None
+        ffmpeg_path = os.path.realpath(ffmpeg_path)
+        mtime_ns = os.stat(ffmpeg_path).st_mtime_ns
+
+        entries = {}
+        try:
+            with open(cache_file(), "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        entry = entries.get(ffmpeg_path)
+        if entry and entry.get("mtime_ns") == mtime_ns:
+            _caps = entry["caps"]
+            return _caps
+
+        caps = probe_capabilities(ffmpeg_path)
+        if caps is None:
+            return None
+        caps["ffmpeg"] = ffmpeg_path
+        _caps = caps
+        entries[ffmpeg_path] = {"mtime_ns": mtime_ns, "caps": caps}
+        try:
+            libpaths.atomic_write_json(cache_file(), {"version": CACHE_VERSION, "entries": entries})
+        except OSError as e:
+            logging.debug(f"Unable to write capabilities cache : {e}")
+        logging.debug(f"FFmpeg capabilities : {caps['version']}, {len(caps['encoders'])} encoders, "
+                      f"hwaccels {caps['hwaccels']}")
+        return _caps
+
+def has_encoder(name: str) -> bool:
+    """Vrai si l'encodeur est disponible (ou si les capacités sont inconnues)."""
+    caps = get_capabilities()
+    return caps is None or name in caps["encoders"]
+
+def has_nvenc() -> bool:
+    """NVENC compilé dans ffmpeg et accélération CUDA disponible."""
+    caps = get_capabilities()
+    return caps is not None and "h264_nvenc" in caps["encoders"] and "cuda" in caps["hwaccels"]
@@ -0,0 +1,52 @@
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+# Fréquence de rafraîchissement de l'interface (ms)
+DEFAULT_INTERVAL_MS = 250
+
+class UiChannel:
+    """Canal de messages entre les threads de travail et la boucle principale Tk.
+
+    Les threads appellent post()/post_event() ; la boucle Tk exécute les callbacks
+    toutes les `interval_ms` via root.after(). post() est fusionné par clé : seule la
+    dernière mise à jour d'un job est affichée à chaque rafraîchissement.
+    """
+
+    def __init__(self, interval_ms: int = DEFAULT_INTERVAL_MS):
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._counter = itertools.count()
+        self._root = None
+
+    def post(self, key: Hashable, callback: Callable, *args) -> None:
+        """Planifie un rafraîchissement ; remplace celui déjà en attente pour la même clé."""
+        with self._lock:
+            self._pending[("coalesced", key)] = (callback, args)
+            self._pending.move_to_end(("coalesced", key))
+
+    def post_event(self, callback: Callable, *args) -> None:
+        """Planifie un évènement qui ne doit pas être fusionné (fin de job, fin de lot...)."""
+        with self._lock:
+            self._pending[("event", next(self._counter))] = (callback, args)
+
+    def start(self, root) -> None:
+        """Démarre la vidange périodique depuis la boucle Tk."""
+        self._root = root
+        root.after(self.interval_ms, self._drain)
+
+    def _drain(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+        for callback, args in pending.values():
+            try:
+                callback(*args)
+            except Exception:
+                logging.exception("UI update failed")
+        self._root.after(self.interval_ms, self._drain)
+
+# Canal partagé par toute l'application
+channel = UiChannel()
@@ -0,0 +1,436 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from typing import List, Optional
+import libs.libbench as libbench
+import libs.libcontrol as libcontrol
+import libs.libffmpeg as libffmpeg
+import libs.libhistory as libhistory
+import libs.libjournal as libjournal
+import libs.libscan as libscan
+import libs.libsched as libsched
+import libs.libspace as libspace
+import libs.libtune as libtune
+import libs.libwatch as libwatch
+
+# Codes de retour du mode ligne de commande
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NO_FFMPEG = 3
+EXIT_NO_SPACE = 4
+EXIT_INTERRUPTED = 130
+
+# Mode surveillance : nouvel essai des fichiers non convertis (échec, espace disque), délai
+# doublé à chaque essai ; un fichier est abandonné après WATCH_MAX_ATTEMPTS essais
+WATCH_RETRY_DELAY = 60.0
+WATCH_RETRY_MAX_DELAY = 3600.0
+WATCH_MAX_ATTEMPTS = 5
+
+_print_lock = threading.Lock()
+# Lot en cours, piloté par le socket de contrôle (voir libcontrol)
+current_batch = None
+
+def emit(event: str, **fields) -> None:
+    """Écrit un évènement JSON (une ligne) sur la sortie standard."""
+    fields["event"] = event
+    with _print_lock:
+        try:
+            sys.stdout.write(json.dumps(fields, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Lecteur fermé (ex. `| head`) : le lot continue sans sortie
+            pass
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="dvtool_convert.py",
+        description="Davinci Resolve converter tool - headless batch mode (JSON lines on stdout)."
+    )
+    parser.add_argument("files", nargs="*", help="video files to convert (folders are scanned recursively)")
+    parser.add_argument("--codec", choices=[k for k in libscan.CODEC_FILTERS if k != "all"],
+                        help="only keep files of these video codecs when scanning folders")
+    parser.add_argument("--mode", "-m",
+                        help="conversion mode (alias, see --list-modes); several comma-separated modes "
+                             "produce one output each from a single decode (e.g. prores,youtube-cpu)")
+    parser.add_argument("--out", "-o", help="output directory")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="number of concurrent ffmpeg jobs (default: 1, 0 = auto-tuned, see --tune)")
+    parser.add_argument("--threads", "-t", type=int, default=0, help="total ffmpeg thread budget (0 = auto-tuned if --tune was run, else ffmpeg's choice)")
+    parser.add_argument("--segments", "-s", type=int, default=0,
+                        help="parallel segment workers per file for long libx264/libx265 encodes (0 = off)")
+    parser.add_argument("--force-encode", action="store_true",
+                        help="always re-encode, even when a file already matches the target format")
+    parser.add_argument("--watch", "-w", metavar="DIR",
+                        help="watch an ingest folder and convert new H.264/HEVC files once fully copied (Ctrl+C to stop)")
+    parser.add_argument("--poll", action="store_true", help="with --watch: poll the folder instead of using inotify")
+    parser.add_argument("--scratch", metavar="DIR",
+                        help="encode into a local scratch directory, then copy to --out in the background")
+    parser.add_argument("--ignore-space", action="store_true",
+                        help="start even if the estimated output size exceeds the free disk space")
+    parser.add_argument("--pin", action="store_true",
+                        help="pin each job to its own CPU set on one NUMA node (threads sized to the set)")
+    parser.add_argument("--low-priority", action="store_true",
+                        help="run ffmpeg at the lowest CPU and I/O priority (nice 19, ionice idle)")
+    parser.add_argument("--metrics-textfile", metavar="FILE",
+                        help="Prometheus textfile to rewrite during the batch (e.g. in the node_exporter "
+                             "textfile collector directory); default ~/.local/state/dvtool/metrics/dvtool.prom")
+    parser.add_argument("--control", nargs="+", metavar="COMMAND",
+                        help="control the running instance and exit: status | pause [FILE] | resume [FILE] | "
+                             "priority low|normal | move FILE POSITION | cancel [FILE]")
+    parser.add_argument("--resume", action="store_true",
+                        help="resume the last interrupted batch (files already converted are not re-encoded)")
+    parser.add_argument("--estimate", action="store_true",
+                        help="print the predicted batch duration from the conversion history and exit")
+    parser.add_argument("--tune", action="store_true",
+                        help="run short calibration encodes for the modes (all, or --mode) and store the best "
+                             "threads/jobs combination, used when --threads or --jobs is 0")
+    parser.add_argument("--bench", action="store_true",
+                        help="benchmark the conversion modes (all, or --mode) on synthetic sources and "
+                             "compare with the stored baseline")
+    parser.add_argument("--bench-threads", default="0", metavar="N,N",
+                        help="with --bench: comma-separated thread counts (default: 0 = ffmpeg auto)")
+    parser.add_argument("--bench-jobs", default="1", metavar="N,N",
+                        help="with --bench: comma-separated numbers of concurrent jobs (default: 1)")
+    parser.add_argument("--bench-sizes", default=",".join(libbench.DEFAULT_SIZES), metavar="SIZE,SIZE",
+                        help=f"with --bench: source sizes among {', '.join(libbench.SIZES)} (default: %(default)s)")
+    parser.add_argument("--bench-duration", type=int, default=libbench.DEFAULT_DURATION,
+                        help="with --bench: source duration in seconds (default: %(default)s)")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="with --bench: baseline report to compare with (default: the stored baseline)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="with --bench: store this run as the new baseline")
+    parser.add_argument("--history", action="store_true", help="print the conversion history per mode and exit")
+    parser.add_argument("--list-modes", action="store_true", help="list the conversion modes and exit")
+    parser.add_argument("--verbose", "-v", action="store_true", help="debug logs on stderr")
+    return parser
+
+def run_batch(files: List[str], mode: str, dest_dir: str, max_jobs: int, num_threads: int,
+              segment_workers: int = 0, fast_path: bool = True, extra_modes: Optional[List[str]] = None,
+              scratch_dir: Optional[str] = None, check_space: bool = True, low_priority: bool = False,
+              placement: bool = False, metrics_textfile: Optional[str] = None, resume: bool = False,
+              failed: Optional[list] = None) -> int:
+    """Convertit un lot sans interface graphique et retourne le code de sortie.
+
+    resume : reprise du lot interrompu (--resume), les fichiers déjà convertis sont ignorés.
+    failed : liste complétée avec les fichiers non convertis (échec, lot refusé faute d'espace).
+    """
+    global current_batch
+    last_percent = {}
+
+    def on_progress(job, batch):
+        percent = int(job.percent)
+        if last_percent.get(job.file_path) == percent:
+            return
+        last_percent[job.file_path] = percent
+        eta = batch.batch_eta()
+        emit("progress", file=job.file_path, percent=round(job.percent, 1), out_time=round(job.out_time, 3),
+             fps=job.fps, speed=job.speed, bitrate=job.bitrate,
+             batch_percent=round(batch.batch_percent(), 1), batch_eta=round(eta, 1) if eta is not None else None)
+
+    def on_job_end(job, batch):
+        emit("job_end", file=job.file_path, out=job.out_file, extra_outs=[o for _, o in job.extra_outputs],
+             state=job.state, strategy=job.strategy,
+             resumed=job.resumed, placement=job.placement_info(), error=job.error)
+
+    batch = libsched.BatchScheduler(files, mode, dest_dir, max_jobs=max_jobs, num_threads=num_threads,
+                                    on_progress=on_progress, on_job_end=on_job_end, segment_workers=segment_workers,
+                                    fast_path=fast_path, extra_modes=extra_modes, scratch_dir=scratch_dir,
+                                    low_priority=low_priority, placement=placement,
+                                    metrics_textfile=metrics_textfile, resume=resume)
+    predicted = libsched.estimate_batch(files, mode, dest_dir, max_jobs, fast_path, extra_modes, resume)
+    emit("batch_start", mode=mode, extra_modes=extra_modes or [], out=dest_dir, files=len(files), jobs=batch.max_jobs,
+         threads=batch.num_threads,
+         predicted_seconds=round(predicted, 1) if predicted is not None else None)
+    batch.plan()
+    space = libspace.preflight(batch.jobs, dest_dir, scratch_dir, batch.max_jobs)
+    emit("preflight", **space)
+    if not space["ok"]:
+        logging.error(f"Not enough disk space : {libspace.format_size(space['required'])} required, "
+                      f"{libspace.format_size(space['free'])} free")
+        if check_space:
+            emit("batch_end", interrupted=False, refused="disk_space")
+            if failed is not None:
+                failed.extend(files)
+            return EXIT_NO_SPACE
+    current_batch = batch
+    batch.start()
+    try:
+        batch.wait()
+    except KeyboardInterrupt:
+        batch.cancel()
+        batch.wait()
+        emit("batch_end", interrupted=True)
+        return EXIT_INTERRUPTED
+
+    summary = batch.summary()
+    if failed is not None:
+        failed.extend(j.file_path for j in batch.jobs if j.state == libsched.STATE_FAILED)
+    emit("batch_end", interrupted=False, metrics=batch.metrics.jsonl_file, **summary)
+    ok = summary[libsched.STATE_FAILED] == 0 and summary[libsched.STATE_CANCELED] == 0
+    return EXIT_OK if ok else EXIT_FAILED
+
+def run_watch(directory: str, mode: str, dest_dir: str, max_jobs: int, num_threads: int,
+              segment_workers: int = 0, fast_path: bool = True, use_inotify: bool = True,
+              extra_modes: Optional[List[str]] = None, scratch_dir: Optional[str] = None,
+              check_space: bool = True, low_priority: bool = False, placement: bool = False,
+              metrics_textfile: Optional[str] = None) -> int:
+    """Surveille un dossier et convertit les nouveaux fichiers, un lot à la fois.
+
+    Les fichiers prêts pendant un lot sont mis en file et forment le lot suivant : au plus
+    max_jobs FFmpeg tournent en même temps, quel que soit le nombre de fichiers arrivés.
+    Les fichiers non convertis (échec, espace disque insuffisant) sont remis en file après
+    un délai croissant (évènement file_retry), puis abandonnés (file_abandoned).
+    """
+    ready = queue.Queue()
+    stop = threading.Event()
+    attempts = {}  # chemin -> nombre d'essais sans succès
+    retry_at = {}  # chemin -> instant du prochain essai (time.monotonic)
+
+    def on_sigterm(signum, frame):
+        raise KeyboardInterrupt()
+    # Arrêt propre en service (systemd envoie SIGTERM) : le lot en cours est annulé
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    def on_ready(path):
+        emit("file_detected", file=path)
+        ready.put(path)
+
+    watcher = libwatch.FolderWatcher(directory, on_ready, use_inotify=use_inotify)
+    threading.Thread(target=watcher.run, args=(stop,), daemon=True).start()
+    emit("watch_start", dir=os.path.abspath(directory), mode=mode, out=dest_dir, jobs=max_jobs)
+    try:
+        while True:
+            files = []
+            try:
+                files.append(ready.get(timeout=1.0))
+                while True:
+                    files.append(ready.get_nowait())
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            for path in [p for p, at in retry_at.items() if at <= now]:
+                del retry_at[path]
+                files.append(path)
+            files = [f for f in dict.fromkeys(files) if os.path.isfile(f)]
+            if not files:
+                continue
+
+            failed = []
+            returncode = run_batch(files, mode, dest_dir, max_jobs, num_threads, segment_workers, fast_path,
+                                   extra_modes, scratch_dir, check_space, low_priority, placement,
+                                   metrics_textfile, failed=failed)
+            if returncode == EXIT_INTERRUPTED:
+                break
+            reason = "disk_space" if returncode == EXIT_NO_SPACE else "failed"
+            for path in files:
+                if path not in failed:
+                    attempts.pop(path, None)
+                    retry_at.pop(path, None)
+            for path in dict.fromkeys(failed):
+                attempt = attempts.get(path, 0) + 1
+                if attempt >= WATCH_MAX_ATTEMPTS:
+                    # Plus proposé tant que le fichier n'est pas modifié (voir FolderWatcher)
+                    attempts.pop(path, None)
+                    emit("file_abandoned", file=path, reason=reason, attempts=attempt)
+                    continue
+                delay = min(WATCH_RETRY_MAX_DELAY, WATCH_RETRY_DELAY * 2 ** (attempt - 1))
+                attempts[path] = attempt
+                retry_at[path] = time.monotonic() + delay
+                emit("file_retry", file=path, reason=reason, attempt=attempt, retry_in=delay)
+    except KeyboardInterrupt:
+        pass
+    stop.set()
+    emit("watch_end")
+    return EXIT_INTERRUPTED
+
+def run_control(words: List[str]) -> int:
+    """Envoie une commande à l'instance en cours (socket de contrôle) et affiche sa réponse."""
+    command, args = words[0], words[1:]
+    request = {"command": command}
+    if command == "priority":
+        request["low"] = not args or args[0] != "normal"
+    elif command == "move":
+        if len(args) != 2:
+            emit("control", ok=False, error="usage: move FILE POSITION")
+            return EXIT_USAGE
+        request["file"], request["position"] = args
+    elif args:
+        request["file"] = args[0]
+    try:
+        response = libcontrol.send(request)
+    except (OSError, ValueError) as e:
+        emit("control", ok=False, error=f"control socket {libcontrol.control_socket()} : {e}")
+        return EXIT_FAILED
+    emit("control", **response)
+    return EXIT_OK if response.get("ok") else EXIT_FAILED
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+def run_bench(modes: List[str], args) -> int:
+    """Banc d'essai : un évènement bench_result par cas, puis bench_end avec les régressions."""
+    emit("bench_start", modes=modes, sizes=args.bench_sizes, threads=args.bench_threads, jobs=args.bench_jobs,
+         duration=args.bench_duration)
+    try:
+        report = libbench.run_bench(modes, args.bench_sizes, args.bench_threads, args.bench_jobs,
+                                    args.bench_duration, on_result=lambda result: emit("bench_result", **result))
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    report_file = libbench.save_report(report)
+    baseline_file = args.baseline or libbench.baseline_file()
+    baseline = libbench.load_report(baseline_file)
+    regressions = libbench.compare(report, baseline) if baseline else []
+    if args.save_baseline:
+        libbench.save_report(report, libbench.baseline_file())
+    emit("bench_end", report=report_file, baseline=baseline_file if baseline else None,
+         regressions=regressions, baseline_saved=args.save_baseline)
+    failed = any(not result["ok"] for result in report["results"])
+    return EXIT_FAILED if failed or regressions else EXIT_OK
+
+def run_tune(modes: List[str]) -> int:
+    """Calibration : un évènement tune_result par combinaison essayée, tune_end par mode."""
+    ok = True
+    for mode in modes:
+        if not libffmpeg.mode_available(mode):
+            continue
+        emit("tune_start", mode=mode, candidates=libtune.candidates())
+        try:
+            tuning = libtune.calibrate(mode, on_result=lambda result: emit("tune_result", **result))
+        except KeyboardInterrupt:
+            return EXIT_INTERRUPTED
+        ok = ok and tuning is not None
+        emit("tune_end", mode=mode, tuning=tuning)
+    return EXIT_OK if ok else EXIT_FAILED
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée du mode ligne de commande (n'importe pas tkinter)."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    if args.list_modes:
+        for alias, mode in libffmpeg.MODE_ALIASES.items():
+            status = "" if libffmpeg.mode_available(mode) else "\t(unavailable: missing encoder)"
+            print(f"{alias}\t{mode}{status}")
+        return EXIT_OK
+
+    if args.history:
+        for stats in libhistory.mode_stats():
+            emit("history", **stats)
+        return EXIT_OK
+
+    if args.control:
+        return run_control(args.control)
+
+    if args.tune or args.bench:
+        modes = [libffmpeg.resolve_mode(m.strip()) for m in args.mode.split(",")] if args.mode \
+            else list(libffmpeg.MODE_ALIASES.values())
+        if None in modes:
+            parser.error(f"unknown --mode (choices: {', '.join(libffmpeg.MODE_ALIASES)})")
+        if not libffmpeg.ffmpeg_available():
+            logging.error("FFmpeg or ffprobe is not installed or not in the PATH.")
+            return EXIT_NO_FFMPEG
+        if args.tune:
+            return run_tune(modes)
+
+    if args.bench:
+        try:
+            args.bench_threads = _int_list(args.bench_threads)
+            args.bench_jobs = _int_list(args.bench_jobs)
+        except ValueError:
+            parser.error("--bench-threads and --bench-jobs take comma-separated integers")
+        args.bench_sizes = [s.strip() for s in args.bench_sizes.split(",") if s.strip()]
+        if not args.bench_threads or not args.bench_jobs or min(args.bench_jobs) < 1 or min(args.bench_threads) < 0:
+            parser.error("--bench-jobs must be >= 1 and --bench-threads >= 0")
+        if not args.bench_sizes or any(s not in libbench.SIZES for s in args.bench_sizes):
+            parser.error(f"--bench-sizes choices: {', '.join(libbench.SIZES)}")
+        if args.bench_duration < 1:
+            parser.error("--bench-duration must be >= 1")
+        return run_bench(modes, args)
+
+    if args.resume:
+        batch = libjournal.unfinished_batch()
+        if batch is None:
+            parser.error("no interrupted batch to resume")
+        args.mode = args.mode or ",".join([batch["mode"]] + batch.get("extra_modes", []))
+        args.out = args.out or batch["dest_dir"]
+        args.files = args.files or [f for f in batch["files"] if os.path.isfile(f)]
+
+    modes = [libffmpeg.resolve_mode(m.strip()) for m in args.mode.split(",")] if args.mode else [None]
+    if None in modes:
+        parser.error(f"unknown or missing --mode (choices: {', '.join(libffmpeg.MODE_ALIASES)})")
+    mode, extra_modes = modes[0], modes[1:]
+    out_names = [libffmpeg.get_output_file("x", m, "") for m in modes]
+    if len(set(out_names)) != len(out_names):
+        parser.error("several --mode values produce the same output file name")
+    if not args.out:
+        parser.error("missing --out")
+    if not args.files and not args.watch:
+        parser.error("no input files")
+    if args.watch and not os.path.isdir(args.watch):
+        parser.error(f"watch folder not found : {args.watch}")
+    if args.watch and os.path.realpath(args.watch) == os.path.realpath(args.out):
+        parser.error("--out must differ from the watched folder")
+    if args.jobs < 0 or args.threads < 0 or args.segments < 0:
+        parser.error("--jobs, --threads and --segments must be >= 0")
+
+    # Dossiers : parcours récursif (extensions vidéo, sorties de l'outil exclues)
+    files = []
+    for f in args.files:
+        if os.path.isdir(f):
+            found = libscan.scan_files(f, codecs=libscan.CODEC_FILTERS.get(args.codec))
+            emit("scan", dir=os.path.abspath(f), files=len(found))
+            files.extend(found)
+        else:
+            files.append(f)
+    args.files = list(dict.fromkeys(files))
+    if not args.files and not args.watch:
+        parser.error("no video files found")
+
+    missing = [f for f in args.files if not os.path.isfile(f)]
+    if missing:
+        parser.error("file not found : " + ", ".join(missing))
+
+    if args.estimate:
+        predicted = libsched.estimate_batch(args.files, mode, args.out, args.jobs, not args.force_encode, extra_modes,
+                                            args.resume)
+        emit("estimate", mode=mode, files=len(args.files), jobs=args.jobs,
+             predicted_seconds=round(predicted, 1) if predicted is not None else None)
+        return EXIT_OK
+
+    if not libffmpeg.ffmpeg_available():
+        logging.error("FFmpeg or ffprobe is not installed or not in the PATH.")
+        return EXIT_NO_FFMPEG
+
+    for output_mode in modes:
+        if not libffmpeg.mode_available(output_mode):
+            logging.error(f"Mode unavailable, missing encoder ({', '.join(libffmpeg.get_mode_encoders(output_mode))}) : {output_mode}")
+            return EXIT_NO_FFMPEG
+
+    os.makedirs(args.out, exist_ok=True)
+    control = libcontrol.ControlServer(lambda: current_batch)
+    try:
+        control.start()
+    except OSError as e:
+        logging.warning(f"Control socket unavailable : {e}")
+    try:
+        if args.watch:
+            return run_watch(args.watch, mode, args.out, args.jobs, args.threads, args.segments,
+                             not args.force_encode, not args.poll, extra_modes, args.scratch, not args.ignore_space,
+                             args.low_priority, args.pin, args.metrics_textfile)
+        return run_batch(args.files, mode, args.out, args.jobs, args.threads, args.segments, not args.force_encode,
+                         extra_modes, args.scratch, not args.ignore_space, args.low_priority, args.pin,
+                         args.metrics_textfile, args.resume)
+    finally:
+        control.stop()
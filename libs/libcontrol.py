@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Optional
+import libs.libpaths as libpaths
+
+# Interface de pilotage pour les scripts : socket Unix local, une requête JSON par ligne,
+# une réponse JSON par ligne. Exemples de requêtes :
+#   {"command": "status"}
+#   {"command": "pause"}                  {"command": "pause", "file": "/chemin/clip.mp4"}
+#   {"command": "resume"}                 {"command": "cancel", "file": "/chemin/clip.mp4"}
+#   {"command": "priority", "low": true}  {"command": "move", "file": "/chemin/clip.mp4", "position": 0}
+
+COMMANDS = ("status", "pause", "resume", "priority", "move", "cancel")
+# Délai de réponse côté client (secondes)
+CLIENT_TIMEOUT = 5.0
+
+def control_socket() -> str:
+    return os.path.join(libpaths.runtime_dir(), "control.sock")
+
+def status(batch) -> dict:
+    return {
+        "ok": True, "running": batch.is_running(), "paused": batch.paused, "low_priority": batch.low_priority,
+        "jobs": [{"file": j.file_path, "state": j.state, "percent": round(j.percent, 1), "paused": j.paused}
+                 for j in batch.jobs],
+    }
+
+def handle(batch, request: dict) -> dict:
+    """Exécute une requête sur le lot en cours et retourne la réponse."""
+    command = request.get("command")
+    if command not in COMMANDS:
+        return {"ok": False, "error": f"unknown command (choices: {', '.join(COMMANDS)})"}
+    if batch is None:
+        return {"ok": False, "error": "no batch in progress"}
+    file_path = request.get("file")
+    if file_path is not None:
+        file_path = os.path.abspath(file_path)
+        job = next((j for j in batch.jobs if os.path.abspath(j.file_path) == file_path), None)
+        if job is None:
+            return {"ok": False, "error": f"file not in batch : {file_path}"}
+        file_path = job.file_path
+
+    if command == "status":
+        return status(batch)
+    ok = True
+    if command == "pause":
+        if file_path:
+            ok = batch.pause_job(file_path)
+        else:
+            batch.pause()
+    elif command == "resume":
+        if file_path:
+            ok = batch.resume_job(file_path)
+        else:
+            batch.resume()
+    elif command == "cancel":
+        if file_path:
+            ok = batch.cancel_job(file_path)
+        else:
+            batch.cancel()
+    elif command == "priority":
+        batch.set_low_priority(bool(request.get("low", True)))
+    else:
+        try:
+            position = int(request.get("position", 0))
+        except (TypeError, ValueError):
+            return {"ok": False, "error": "position must be an integer"}
+        if file_path is None:
+            return {"ok": False, "error": "move needs a file"}
+        ok = batch.move_job(file_path, position)
+    return {"ok": ok} if ok else {"ok": False, "error": "job not in a compatible state"}
+
+class ControlServer:
+    """Serveur de pilotage ; get_batch() retourne le lot en cours (ou None)."""
+
+    def __init__(self, get_batch: Callable, path: Optional[str] = None):
+        self.get_batch = get_batch
+        self.path = path or control_socket()
+        self._socket = None
+
+    def start(self) -> bool:
+        """Ouvre le socket ; retourne False si une autre instance le tient déjà."""
+        if os.path.exists(self.path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(self.path)
+                logging.warning(f"Control socket already in use by another instance : {self.path}")
+                return False
+            except OSError:
+                os.unlink(self.path)  # Socket d'une instance terminée
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self._socket.listen(4)
+        threading.Thread(target=self._accept, daemon=True).start()
+        logging.debug(f"Control socket : {self.path}")
+        return True
+
+    def stop(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _accept(self) -> None:
+        while self._socket is not None:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rw") as stream:
+            for line in stream:
+                try:
+                    request = json.loads(line)
+                    response = handle(self.get_batch(), request if isinstance(request, dict) else {})
+                except ValueError:
+                    response = {"ok": False, "error": "invalid JSON"}
+                except Exception as e:
+                    logging.exception("Control request failed")
+                    response = {"ok": False, "error": str(e)}
+                stream.write(json.dumps(response, ensure_ascii=False) + "\n")
+                stream.flush()
+
+def send(request: dict, path: Optional[str] = None) -> dict:
+    """Envoie une requête à l'instance en cours et retourne sa réponse."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CLIENT_TIMEOUT)
+        client.connect(path or control_socket())
+        with client.makefile("rw") as stream:
+            stream.write(json.dumps(request) + "\n")
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("connection closed before the reply (instance ended)")
+    return json.loads(line)
@@ -0,0 +1,444 @@
+import shutil
+import subprocess
+from typing import List, Optional, Tuple
+import logging
+import os
+import config.lang as customlang
+import libs.libcaps as libcaps
+import libs.libprobe as libprobe
+import libs.libprogress as libprogress
+
+# Alias courts des modes de conversion (utilisés par la ligne de commande)
+MODE_ALIASES = {
+    "prores": "H.264/H.265 → ProRes 422 HQ (Davinci Resolve)",
+    "dnxhr": "H.264/H.265 → DNxHR HQX (Davinci Resolve)",
+    "mjpeg": "H.264/H.265 → MJPEG (Davinci Resolve)",
+    "proxy-prores": "H.264/H.265 → ProRes Proxy (Proxy Davinci Resolve)",
+    "proxy-lt": "H.264/H.265 → ProRes LT (Proxy Davinci Resolve)",
+    "proxy-dnxhr": "H.264/H.265 → DNxHR LB (Proxy Davinci Resolve)",
+    "web": "ProRes/DNxHR → H.264 (Web)",
+    "youtube": "ProRes/DNxHR → H.264 (YouTube)",
+    "h265": "ProRes/DNxHR → H.265 (Web/YouTube)",
+    "mjpeg-h264": "MJPEG → H.264 (libx264 CPU)",
+    "mjpeg-h265": "MJPEG → H.265 (libx265 CPU)",
+    "youtube-cpu": "Optimisé YouTube (H.264 CPU libx264)",
+}
+
+# Proxys pour Davinci Resolve : demi-résolution, mise à l'échelle rapide, rangés dans un
+# sous-dossier "Proxy" sous le nom du média d'origine (liaison automatique dans Resolve)
+PROXY_DIR = "Proxy"
+PROXY_SCALE = "scale=trunc(iw/4)*2:trunc(ih/4)*2:flags=fast_bilinear"
+
+def is_proxy_mode(mode: str) -> bool:
+    return "(Proxy Davinci Resolve)" in mode
+
+def resolve_mode(name: str) -> Optional[str]:
+    """Retourne le mode complet à partir d'un alias ou du libellé exact."""
+    if name in MODE_ALIASES:
+        return MODE_ALIASES[name]
+    if name in MODE_ALIASES.values():
+        return name
+    return None
+
+# Options FFmpeg séparées de la commande complète (toutes prennent une valeur)
+AUDIO_OPTIONS = {"-c:a", "-acodec", "-codec:a", "-b:a", "-ar", "-ac", "-q:a"}
+MUX_OPTIONS = {"-movflags", "-tag:v", "-f"}
+SKIPPED_OPTIONS = {"-y", "-hide_banner"}
+
+# Stratégies de conversion d'un fichier
+STRATEGY_ENCODE = "encode"          # ré-encodage complet
+STRATEGY_COPY_VIDEO = "copy_video"  # vidéo copiée, audio ré-encodé
+STRATEGY_REMUX = "remux"            # changement de conteneur uniquement (-c copy)
+STRATEGY_SKIP = "skip"              # fichier déjà au format cible
+
+# Codec produit par chaque encodeur FFmpeg
+ENCODER_CODECS = {
+    "prores_ks": "prores", "dnxhd": "dnxhd", "mjpeg": "mjpeg",
+    "libx264": "h264", "h264_nvenc": "h264", "libx265": "hevc", "hevc_nvenc": "hevc",
+}
+# Codecs intermédiaires pour Davinci Resolve : tout format de pixel est accepté
+INTERMEDIATE_CODECS = {"prores", "dnxhd", "mjpeg"}
+
+def ffmpeg_available() -> bool:
+    """Vérifie si ffmpeg et ffprobe sont installés (sans interface graphique)."""
+    try:
+        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        subprocess.run(["ffprobe", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        return True
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return False
+
+def ffmpeg_installed() -> bool:
+    """Vérification rapide, sans lancer de processus : ffmpeg et ffprobe sont dans le PATH."""
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+def get_video_codec(filename: str) -> Optional[str]:
+    """Récupère le codec vidéo d'un fichier (via le cache ffprobe)."""
+    info = libprobe.probe(filename)
+    return info["codec"] if info else None
+
+# def check_cuda() -> bool:
+#     """Vérifie si CUDA et NVENC sont disponibles et fonctionnels."""
+#     try:
+#         result = subprocess.run(
+#             ["ffmpeg", "-hide_banner", "-f", "lavfi", "-i", "testsrc=size=160x160:rate=1", "-c:v", "h264_nvenc",
+#              "-f", "null", "-"],
+#             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10
+#         )
+#         # return True
+#         return result.returncode == 0
+#     except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
+#         return False
+
+# Modes NVENC désactivés pour le moment : check_cuda() retourne toujours False
+NVENC_ENABLED = False
+
+def check_cuda() -> bool:
+    """Vérifie si CUDA et NVENC sont disponibles (registre des capacités, sans processus)."""
+    return NVENC_ENABLED and libcaps.has_nvenc()
+
+def get_duration(filename: str) -> Optional[float]:
+    """Récupère la durée de la vidéo en secondes (via le cache ffprobe)."""
+    info = libprobe.probe(filename)
+    return info["duration"] if info else None
+
+# Suffixes des noms produits par get_output_file (fichiers exclus des imports de dossier)
+OUTPUT_SUFFIXES = ("_ProRes_DV", "_DNxHR_DV", "_MJPEG_DV", "_mjpeg", "_h265", "_Web", "_YT", "_h264")
+
+def get_output_file(file_path: str, mode: str, dest_dir: str) -> str:
+    """Détermine le nom du fichier de sortie en fonction du mode."""
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+
+    if is_proxy_mode(mode):
+        return get_proxy_file(base_name, dest_dir)
+    elif "ProRes" in mode and "Davinci Resolve" in mode:
+        return os.path.join(dest_dir, f"{base_name}_ProRes_DV.mov")
+    elif "DNxHR" in mode and "Davinci Resolve" in mode:
+        return os.path.join(dest_dir, f"{base_name}_DNxHR_DV.mov")
+    elif "MJPEG (Davinci Resolve)" in mode:
+        return os.path.join(dest_dir, f"{base_name}_MJPEG_DV.mov")
+    elif mode == "H.264 → MJPEG":
+        return os.path.join(dest_dir, f"{base_name}_mjpeg.mov")
+    elif "H.265" in mode:
+        return os.path.join(dest_dir, f"{base_name}_h265.mp4")
+    elif "Web" in mode:
+        return os.path.join(dest_dir, f"{base_name}_Web.mp4")
+    elif "YouTube" in mode:
+        return os.path.join(dest_dir, f"{base_name}_YT.mp4")
+    else:
+        return os.path.join(dest_dir, f"{base_name}_h264.mp4")
+
+def get_proxy_file(media_name: str, dest_dir: str) -> str:
+    """Proxy d'un média : même nom que le clip dans Resolve, dans le sous-dossier Proxy."""
+    return os.path.join(dest_dir, PROXY_DIR, f"{media_name}.mov")
+
+def get_partial_file(out_file: str) -> str:
+    """Nom temporaire (caché, même répertoire et même extension) sous lequel la sortie est écrite
+    avant d'être renommée sur son nom final en cas de succès."""
+    directory, name = os.path.split(out_file)
+    base_name, ext = os.path.splitext(name)
+    return os.path.join(directory, f".{base_name}.part{ext}")
+
+def x265_pools(num_threads: int) -> List[str]:
+    """Taille du pool de threads x265 (par défaut, x265 crée un pool par nœud NUMA sur tous les cœurs)."""
+    return ["-x265-params", f"pools={num_threads}"] if num_threads > 0 else []
+
+def build_ffmpeg_command(file_path: str, mode: str, out_file: str, num_threads: int = 0, cuda_available: Optional[bool] = None) -> List[str]:
+    """Construit la commande FFmpeg avec support multi-cœurs et options pour Davinci Resolve."""
+    base_cmd = ["ffmpeg", "-i", file_path, "-y"]
+    if cuda_available is None:
+        cuda_available = check_cuda()
+
+    # Tous les encodeurs CPU (x264, x265, prores_ks, dnxhd, mjpeg) ; les commandes NVENC n'utilisent pas base_cmd
+    if num_threads > 0:
+        base_cmd.extend(["-threads", str(num_threads)])
+
+    # --- OPTIONS POUR DAVINCI RESOLVE (ENTRÉE) ---
+    if mode == "H.264/H.265 → ProRes 422 HQ (Davinci Resolve)":
+        return base_cmd + [
+            "-c:v", "prores_ks", "-profile:v", "3", "-qscale:v", "11",
+            "-vendor", "ap10", "-pix_fmt", "yuv422p10le",
+            "-acodec", "pcm_s16le", out_file
+        ]
+    elif mode == "H.264/H.265 → DNxHR HQX (Davinci Resolve)":
+        return base_cmd + [
+            "-c:v", "dnxhd", "-vf", "scale=3840:2160,fps=60,format=yuv422p10le",
+            "-b:v", "440M", "-profile:v", "dnxhr_hqx",
+            "-pix_fmt", "yuv422p10le", "-acodec", "pcm_s16le", out_file
+        ]
+    elif mode == "H.264/H.265 → MJPEG (Davinci Resolve)":
+        return base_cmd + [
+            "-c:v", "mjpeg", "-q:v", "2", "-pix_fmt", "yuvj422p",
+            "-acodec", "pcm_s16le", out_file
+        ]
+
+    # --- PROXYS POUR DAVINCI RESOLVE (DEMI-RÉSOLUTION) ---
+    elif mode == "H.264/H.265 → ProRes Proxy (Proxy Davinci Resolve)":
+        return base_cmd + [
+            "-vf", PROXY_SCALE, "-c:v", "prores_ks", "-profile:v", "0",
+            "-vendor", "ap10", "-pix_fmt", "yuv422p10le",
+            "-acodec", "pcm_s16le", out_file
+        ]
+    elif mode == "H.264/H.265 → ProRes LT (Proxy Davinci Resolve)":
+        return base_cmd + [
+            "-vf", PROXY_SCALE, "-c:v", "prores_ks", "-profile:v", "1",
+            "-vendor", "ap10", "-pix_fmt", "yuv422p10le",
+            "-acodec", "pcm_s16le", out_file
+        ]
+    elif mode == "H.264/H.265 → DNxHR LB (Proxy Davinci Resolve)":
+        return base_cmd + [
+            "-vf", PROXY_SCALE, "-c:v", "dnxhd", "-profile:v", "dnxhr_lb",
+            "-pix_fmt", "yuv422p", "-acodec", "pcm_s16le", out_file
+        ]
+
+    # --- OPTIONS POUR SORTIE DE DAVINCI RESOLVE (ProRes/DNxHD → H.264/H.265) ---
+    elif mode == "ProRes/DNxHR → H.264 (Web)":
+        if cuda_available:
+            return [
+                "ffmpeg", "-hide_banner", "-y",
+                "-hwaccel", "cuda", "-hwaccel_device", "0",
+                "-i", file_path,
+                "-vf", "format=yuv420p",  # conversion 10-bit → 8-bit
+                "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "5.1",
+                "-rc", "vbr", "-cq", "18",
+                "-c:a", "aac", "-b:a", "192k", "-ar", "48000",
+                "-movflags", "+faststart", out_file
+            ]
+        else:
+            return base_cmd + [
+                "-c:v", "libx264", "-preset", "slow", "-crf", "18",
+                "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
+                "-c:a", "aac", "-b:a", "192k", "-ar", "48000",
+                "-movflags", "+faststart", out_file
+            ]
+    elif mode == "ProRes/DNxHR → H.264 (YouTube)":
+        if cuda_available:
+            return [
+            "ffmpeg", "-hide_banner", "-y",
+            "-hwaccel", "cuda", "-hwaccel_device", "0",
+            "-i", file_path,
+            "-vf", "format=yuv420p",  # conversion 10-bit → 8-bit
+            "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "5.1",
+            "-rc", "vbr", "-cq", "18",
+            "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
+            "-movflags", "+faststart", out_file
+        ]
+        else:
+            return base_cmd + [
+                "-c:v", "libx264", "-preset", "slow", "-crf", "18",
+                "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
+                "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
+                "-movflags", "+faststart", out_file
+            ]
+ 
+    elif mode == "ProRes/DNxHR → H.265 (Web/YouTube)":
+        return base_cmd + [
+            "-c:v", "libx265", "-preset", "slow", "-crf", "22", *x265_pools(num_threads),
+            "-pix_fmt", "yuv420p", "-tag:v", "hvc1",
+            "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
+            "-movflags", "+faststart", out_file
+        ]
+    
+    # --- AUTRES OPTIONS ---
+#     elif mode == "H.264 → MJPEG":
+#         return base_cmd + [
+#             "-hwaccel", "cuda" if cuda_available else "none", "-hwaccel_device", "0" if cuda_available else "none",
+#             "-vcodec", "mjpeg", "-q:v", "2",
+#             "-acodec", "pcm_s16be", "-q:a", "0", "-f", "mov", out_file
+#         ]
+#     elif mode == "MJPEG → H.264 (NVIDIA QP)" and cuda_available:
+#         return base_cmd + [
+#             "-hwaccel", "cuda", "-hwaccel_device", "0",
+#             "-vf", "yadif", "-codec:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
+#             "-pix_fmt", "yuv420p", "-rc", "vbr", "-cq", "18",
+#             "-codec:a", "aac", "-b:a", "384k", "-ar", "48000",
+#             "-movflags", "faststart", out_file
+#         ]
+#     elif mode == "MJPEG → H.264 (NVIDIA Bitrate)" and cuda_available:
+#         return base_cmd + [
+#             "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
+#             "-c:a", "copy", "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
+#             "-pix_fmt", "yuv420p", "-b:v", "10M", "-rc", "vbr",
+#             "-movflags", "faststart", out_file
+#         ]
+    elif mode == "MJPEG → H.264 (libx264 CPU)":
+        return base_cmd + [
+            "-vf", "yadif", "-codec:v", "libx264", "-preset", "slow", "-crf", "18",
+            "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
+            "-codec:a", "aac", "-b:a", "384k", "-ar", "48000",
+            "-movflags", "faststart", out_file
+        ]
+    elif mode == "MJPEG → H.265 (libx265 CPU)":
+        return base_cmd + [
+            "-vf", "yadif", "-c:v", "libx265", "-preset", "slow", "-crf", "22", *x265_pools(num_threads),
+            "-pix_fmt", "yuv420p", "-tag:v", "hvc1",
+            "-c:a", "aac", "-b:a", "384k", "-ar", "48000",
+            "-movflags", "faststart", out_file
+        ]
+    elif mode == "Optimisé YouTube (H.264 CPU libx264)":
+        return base_cmd + [
+            "-c:v", "libx264", "-preset", "slow", "-crf", "18",
+            "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
+            "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
+            "-movflags", "+faststart", out_file
+        ]
+#     elif mode == "Optimisé YouTube (H.264 NVIDIA QP)" and cuda_available:
+#         return base_cmd + [
+#             "-hwaccel", "cuda", "-hwaccel_device", "0",
+#             "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
+#             "-pix_fmt", "yuv420p", "-rc", "vbr", "-cq", "18",
+#             "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
+#             "-movflags", "+faststart", out_file
+#         ]
+#     elif mode == "Optimisé YouTube (H.264 NVIDIA Bitrate)" and cuda_available:
+#         return base_cmd + [
+#             "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
+#             "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
+#             "-pix_fmt", "yuv420p", "-b:v", "20M", "-rc", "vbr",
+#             "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
+#             "-movflags", "+faststart", out_file
+#         ]
+    else:
+        raise ValueError(f"{customlang.get('cuda_unknown')} : {mode}")
+
+def split_encode_args(cmd: List[str]):
+    """Sépare une commande complète de build_ffmpeg_command() en options vidéo, audio et de conteneur."""
+    video, audio, mux = [], [], []
+    args = cmd[1:-1]  # sans "ffmpeg" ni le fichier de sortie
+    i = 0
+    while i < len(args):
+        token = args[i]
+        if token == "-i":
+            i += 2
+        elif token in SKIPPED_OPTIONS:
+            i += 1
+        elif token in AUDIO_OPTIONS:
+            audio += args[i:i + 2]
+            i += 2
+        elif token in MUX_OPTIONS:
+            mux += args[i:i + 2]
+            i += 2
+        else:
+            video.append(token)
+            i += 1
+    return video, audio, mux
+
+def option_value(args: List[str], names) -> Optional[str]:
+    for i, token in enumerate(args[:-1]):
+        if token in names:
+            return args[i + 1]
+    return None
+
+def get_mode_encoders(mode: str) -> List[str]:
+    """Encodeurs FFmpeg (vidéo et audio) utilisés par un mode."""
+    video, audio, _ = split_encode_args(build_ffmpeg_command("in", mode, "out", cuda_available=False))
+    encoders = [option_value(video, ("-c:v", "-codec:v", "-vcodec")), option_value(audio, ("-c:a", "-acodec", "-codec:a"))]
+    return [e for e in encoders if e]
+
+def mode_available(mode: str) -> bool:
+    """Vrai si le ffmpeg installé dispose des encodeurs nécessaires au mode."""
+    try:
+        return all(libcaps.has_encoder(e) for e in get_mode_encoders(mode))
+    except ValueError:
+        return False
+
+def get_mode_target(mode: str) -> Optional[dict]:
+    """Décrit le flux produit par un mode (codec, format de pixel, filtres, codec audio)."""
+    try:
+        video, audio, _ = split_encode_args(build_ffmpeg_command("in", mode, "out"))
+    except ValueError:
+        return None
+    encoder = option_value(video, ("-c:v", "-codec:v", "-vcodec"))
+    audio_encoder = option_value(audio, ("-c:a", "-acodec", "-codec:a"))
+    filters = option_value(video, ("-vf",)) or ""
+    target = {
+        "codec": ENCODER_CODECS.get(encoder),
+        "pix_fmt": option_value(video, ("-pix_fmt",)),
+        "audio_codec": audio_encoder,
+        "deinterlace": "yadif" in filters,
+        "width": None, "height": None, "fps": None, "rescale": False,
+    }
+    for part in filters.split(","):
+        if part.startswith("scale="):
+            width, _, height = part[len("scale="):].partition(":")
+            height = height.partition(":")[0]
+            if width.isdigit() and height.isdigit():
+                target["width"], target["height"] = int(width), int(height)
+            else:
+                target["rescale"] = True  # Taille relative à la source (proxys)
+        elif part.startswith("fps="):
+            target["fps"] = float(part[len("fps="):])
+    return target if target["codec"] else None
+
+def plan_conversion(file_path: str, mode: str, out_file: str) -> str:
+    """Compare les propriétés sondées du fichier au mode choisi et retourne la stratégie à appliquer."""
+    info = libprobe.probe(file_path)
+    target = get_mode_target(mode)
+    if not info or not target or info["codec"] != target["codec"]:
+        return STRATEGY_ENCODE
+    if target["codec"] not in INTERMEDIATE_CODECS and info["pix_fmt"] != target["pix_fmt"]:
+        return STRATEGY_ENCODE
+    if target["width"] and (info["width"], info["height"]) != (target["width"], target["height"]):
+        return STRATEGY_ENCODE
+    if target["rescale"]:
+        return STRATEGY_ENCODE
+    if target["fps"] and (not info["fps"] or abs(info["fps"] - target["fps"]) > 0.01):
+        return STRATEGY_ENCODE
+    if target["deinterlace"] and info.get("field_order") not in (None, "progressive"):
+        return STRATEGY_ENCODE
+
+    audio_ok = info["audio_codec"] is None or info["audio_codec"] == target["audio_codec"]
+    same_container = os.path.splitext(file_path)[1].lower() == os.path.splitext(out_file)[1].lower()
+    if audio_ok and same_container:
+        return STRATEGY_SKIP
+    return STRATEGY_REMUX if audio_ok else STRATEGY_COPY_VIDEO
+
+def build_fast_path_command(file_path: str, mode: str, out_file: str, strategy: str) -> List[str]:
+    """Commande de remux (-c copy) ou de copie vidéo avec ré-encodage de l'audio seul."""
+    _, audio, mux = split_encode_args(build_ffmpeg_command(file_path, mode, out_file))
+    cmd = ["ffmpeg", "-i", file_path, "-y", "-map", "0:v:0", "-map", "0:a?"]
+    if strategy == STRATEGY_REMUX:
+        cmd += ["-c", "copy"]
+    else:
+        cmd += ["-c:v", "copy"] + audio
+    return cmd + mux + [out_file]
+
+def build_multi_output_command(file_path: str, outputs: List[Tuple[str, str]], num_threads: int = 0) -> List[str]:
+    """Commande à une seule lecture et un seul décodage de la source pour plusieurs modes.
+
+    outputs : liste de (mode, fichier de sortie). Chaque sortie reçoit les options d'encodage
+    de son mode (FFmpeg duplique le flux décodé vers chaque encodeur et ses filtres).
+    Le décodage étant partagé, l'accélération CUDA propre à un mode n'est pas utilisée.
+    """
+    cmd = ["ffmpeg", "-i", file_path, "-y"]
+    threads = max(1, num_threads // len(outputs)) if num_threads > 0 else 0
+    for mode, out_file in outputs:
+        video, audio, mux = split_encode_args(build_ffmpeg_command(file_path, mode, out_file, threads,
+                                                                   cuda_available=False))
+        cmd += video + audio + mux + [out_file]
+    return cmd
+
+def run_ffmpeg(file_path: str, mode: str, out_file: str, num_threads: int = 0,
+               strategy: str = STRATEGY_ENCODE,
+               extra_outputs: Optional[List[Tuple[str, str]]] = None) -> subprocess.Popen:
+    """Lance FFmpeg pour un fichier et retourne le processus.
+
+    extra_outputs : sorties supplémentaires (mode, fichier) produites par le même décodage.
+    La progression structurée (-progress) est lue sur stdout, les messages FFmpeg sur stderr.
+    """
+    for output_mode in [mode] + [m for m, _ in extra_outputs or []]:
+        if not mode_available(output_mode):
+            raise ValueError(f"{customlang.get('mode_unavailable')} : {output_mode}")
+    if extra_outputs:
+        cmd = build_multi_output_command(file_path, [(mode, out_file)] + list(extra_outputs), num_threads)
+    elif strategy in (STRATEGY_REMUX, STRATEGY_COPY_VIDEO):
+        cmd = build_fast_path_command(file_path, mode, out_file, strategy)
+    else:
+        cmd = build_ffmpeg_command(file_path, mode, out_file, num_threads)
+    cmd = cmd[:1] + libprogress.PROGRESS_ARGS + cmd[1:]
+
+    logging.debug(f"Command FFmpeg : {' '.join(cmd)}")  # Log de la commande FFmpeg
+
+    # Groupe de processus propre : pause et priorité du job (voir libproc)
+    return subprocess.Popen(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, stdin=subprocess.DEVNULL, text=True,
+                            start_new_session=True)
@@ -0,0 +1,146 @@
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+import libs.libpaths as libpaths
+
+# Historique local des conversions terminées (SQLite) et prédiction de durée par mode.
+# La vitesse retenue est le rapport durée du média / temps réel (x temps réel).
+
+_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    finished_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    fps REAL,
+    duration REAL NOT NULL,
+    wall_time REAL NOT NULL,
+    threads INTEGER NOT NULL,
+    concurrent_jobs INTEGER NOT NULL,
+    speed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_mode ON jobs (mode, strategy);
+"""
+
+# Nombre de conversions récentes prises en compte pour une prédiction
+HISTORY_WINDOW = 50
+
+def db_file() -> str:
+    return os.path.join(libpaths.state_dir(), "history.sqlite3")
+
+@contextlib.contextmanager
+def _connect(filename: Optional[str] = None):
+    """Connexion courte (une par appel, sûre entre threads), validée puis fermée."""
+    with _lock:
+        conn = sqlite3.connect(filename or db_file(), timeout=10)
+        try:
+            conn.executescript(SCHEMA)
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+def record_job(mode: str, strategy: str, width: Optional[int], height: Optional[int], fps: Optional[float],
+               duration: float, wall_time: float, threads: int, concurrent_jobs: int,
+               filename: Optional[str] = None) -> None:
+    """Enregistre une conversion terminée."""
+    if not duration or wall_time <= 0:
+        return
+    try:
+        with _connect(filename) as conn:
+            conn.execute(
+                "INSERT INTO jobs (finished_at, mode, strategy, width, height, fps, duration, wall_time, threads,"
+                " concurrent_jobs, speed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), mode, strategy, width, height, fps, duration, wall_time, threads,
+                 concurrent_jobs, duration / wall_time))
+    except sqlite3.Error as e:
+        logging.debug(f"Unable to record job history : {e}")
+
+def _rows(conn: sqlite3.Connection, mode: str, strategy: str) -> list:
+    """Conversions récentes d'un mode et d'un chemin de traitement : (width, height, fps, speed)."""
+    return conn.execute(
+        "SELECT width, height, fps, speed FROM jobs WHERE mode = ? AND strategy = ?"
+        " ORDER BY finished_at DESC LIMIT ?", (mode, strategy, HISTORY_WINDOW)).fetchall()
+
+def weighted_speed(rows: list, width: Optional[int] = None, height: Optional[int] = None,
+                   fps: Optional[float] = None) -> Optional[float]:
+    """Vitesse attendue d'après des conversions (width, height, fps, speed), ou None sans conversion.
+
+    Les conversions sont pondérées par la proximité du nombre de pixels par seconde
+    (résolution x images/s) : une vidéo 4K est comparée en priorité à des vidéos 4K.
+    """
+    if not rows:
+        return None
+    target = (width or 0) * (height or 0) * (fps or 0)
+    total_weight = weighted = 0.0
+    for row_width, row_height, row_fps, speed in rows:
+        rate = (row_width or 0) * (row_height or 0) * (row_fps or 0)
+        if target and rate:
+            # Vitesse ramenée au débit de pixels de la vidéo cible, poids décroissant avec l'écart
+            ratio = rate / target
+            speed = speed * ratio
+            weight = 1.0 / (1.0 + abs(ratio - 1.0))
+        else:
+            weight = 0.5
+        weighted += speed * weight
+        total_weight += weight
+    return weighted / total_weight if total_weight else None
+
+def predict_speed(mode: str, strategy: str = "encode", width: Optional[int] = None,
+                  height: Optional[int] = None, fps: Optional[float] = None,
+                  filename: Optional[str] = None) -> Optional[float]:
+    """Vitesse attendue (x temps réel) d'après l'historique, ou None si aucun historique."""
+    try:
+        with _connect(filename) as conn:
+            rows = _rows(conn, mode, strategy)
+    except sqlite3.Error as e:
+        logging.debug(f"Unable to read job history : {e}")
+        return None
+    return weighted_speed(rows, width, height, fps)
+
+def predict_batch(items: List[dict], mode: str, concurrent_jobs: int = 1,
+                  filename: Optional[str] = None) -> Optional[float]:
+    """Durée prévue (secondes) d'un lot avant son démarrage.
+
+    items : une entrée par fichier avec duration, width, height, fps et strategy (facultatif).
+    Le temps cumulé est divisé par le nombre de jobs simultanés ; retourne None si un fichier
+    n'a pas d'historique comparable. L'historique est lu une fois par chemin de traitement.
+    """
+    items = [item for item in items if item.get("strategy") != "skip"]
+    strategies = {item.get("strategy") or "encode" for item in items}
+    try:
+        with _connect(filename) as conn:
+            rows = {strategy: _rows(conn, mode, strategy) for strategy in strategies}
+    except sqlite3.Error as e:
+        logging.debug(f"Unable to read job history : {e}")
+        return None
+
+    total = 0.0
+    for item in items:
+        speed = weighted_speed(rows[item.get("strategy") or "encode"], item.get("width"),
+                               item.get("height"), item.get("fps"))
+        if not speed or not item.get("duration"):
+            return None
+        total += item["duration"] / speed
+    return total / max(1, concurrent_jobs)
+
+def mode_stats(filename: Optional[str] = None) -> List[dict]:
+    """Statistiques par mode : nombre de conversions et vitesse moyenne."""
+    try:
+        with _connect(filename) as conn:
+            rows = conn.execute(
+                "SELECT mode, strategy, COUNT(*), AVG(speed), SUM(duration), SUM(wall_time) FROM jobs"
+                " GROUP BY mode, strategy ORDER BY mode").fetchall()
+    except sqlite3.Error:
+        return []
+    return [{"mode": mode, "strategy": strategy, "jobs": count, "avg_speed": avg_speed,
+             "media_seconds": media, "wall_seconds": wall}
+            for mode, strategy, count, avg_speed, media, wall in rows]
@@ -0,0 +1,134 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+import libs.libpaths as libpaths
+
+# Journal persistant du lot en cours : un lot interrompu (fermeture, plantage) peut être
+# repris, les fichiers déjà convertis sont reconnus sans nouveau sondage ni encodage.
+# Les jobs sont indexés par fichier de sortie ; un job terminé n'est reconnu que si la
+# source n'a pas changé (taille, mtime_ns) et que la sortie a toujours la taille notée.
+
+JOURNAL_VERSION = 1
+# Nombre maximum de jobs conservés (les plus anciens sont évincés)
+JOURNAL_MAX_ENTRIES = 5000
+# Délai de regroupement des écritures de l'état des jobs (secondes)
+DEBOUNCE_SECONDS = 0.5
+
+_lock = threading.Lock()
+# Écritures sur disque une à la fois, dans l'ordre des modifications
+_write_lock = threading.Lock()
+_journal = None
+_timer = None
+
+def journal_file() -> str:
+    return os.path.join(libpaths.state_dir(), "journal.json")
+
+def _load() -> dict:
+    """Charge le journal depuis le disque (une seule fois)."""
+    global _journal
+    if _journal is None:
+        _journal = {"batch": None, "jobs": {}}
+        try:
+            with open(journal_file(), "r") as f:
+                data = json.load(f)
+            if data.get("version") == JOURNAL_VERSION:
+                _journal = {"batch": data.get("batch"), "jobs": data.get("jobs", {})}
+        except (OSError, ValueError, AttributeError):
+            pass
+    return _journal
+
+def _schedule_save() -> None:
+    """Planifie l'écriture du journal (appelé avec le verrou tenu)."""
+    global _timer
+    if _timer is None:
+        _timer = threading.Timer(DEBOUNCE_SECONDS, flush)
+        _timer.daemon = True
+        _timer.start()
+
+def flush() -> None:
+    """Écrit le journal immédiatement (si une écriture est en attente)."""
+    global _timer
+    with _write_lock:
+        with _lock:
+            if _timer is None:
+                return
+            _timer.cancel()
+            _timer = None
+            jobs = _journal["jobs"]
+            excess = len(jobs) - JOURNAL_MAX_ENTRIES
+            if excess > 0:
+                for key in sorted(jobs, key=lambda k: jobs[k].get("updated", 0))[:excess]:
+                    del jobs[key]
+            data = {"version": JOURNAL_VERSION, **copy.deepcopy(_journal)}
+        try:
+            libpaths.atomic_write_json(journal_file(), data)
+        except OSError as e:
+            logging.debug(f"Unable to write batch journal : {e}")
+
+atexit.register(flush)
+
+def _stat(path: str):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None, None
+
+def start_batch(files: List[str], mode: str, dest_dir: str, extra_modes: Optional[List[str]] = None) -> None:
+    """Enregistre un nouveau lot ; tous ses fichiers sont notés en attente."""
+    with _lock:
+        journal = _load()
+        journal["batch"] = {"files": [os.path.abspath(f) for f in files], "mode": mode,
+                            "extra_modes": list(extra_modes or []), "dest_dir": dest_dir,
+                            "started_at": time.time(), "finished": False}
+        _schedule_save()
+    flush()
+
+def finish_batch() -> None:
+    """Marque le lot comme terminé (il ne sera plus proposé à la reprise)."""
+    with _lock:
+        journal = _load()
+        if journal["batch"]:
+            journal["batch"]["finished"] = True
+            _schedule_save()
+    flush()
+
+def unfinished_batch() -> Optional[dict]:
+    """Retourne le dernier lot interrompu (files, mode, extra_modes, dest_dir), ou None."""
+    with _lock:
+        batch = _load()["batch"]
+    if not batch or batch.get("finished"):
+        return None
+    return dict(batch)
+
+def set_job(file_path: str, out_file: str, mode: str, state: str, strategy: Optional[str] = None,
+            duration: Optional[float] = None) -> None:
+    """Note l'état d'un job (queued, running, done, failed...) ; écrit sur disque en différé."""
+    size, mtime_ns = _stat(file_path)
+    entry = {"source": os.path.abspath(file_path), "size": size, "mtime_ns": mtime_ns, "mode": mode,
+             "state": state, "strategy": strategy, "duration": duration, "updated": time.time()}
+    if state == "done":
+        entry["out_size"] = _stat(out_file)[0]
+    with _lock:
+        _load()["jobs"][os.path.abspath(out_file)] = entry
+        _schedule_save()
+
+def completed(file_path: str, out_file: str, mode: str) -> Optional[dict]:
+    """Retourne l'entrée du journal si ce fichier a déjà été converti et que la sortie est intacte."""
+    with _lock:
+        entry = _load()["jobs"].get(os.path.abspath(out_file))
+        entry = dict(entry) if entry else None
+    if not entry or entry.get("state") != "done" or entry.get("mode") != mode:
+        return None
+    if entry.get("source") != os.path.abspath(file_path):
+        return None
+    if (entry.get("size"), entry.get("mtime_ns")) != _stat(file_path):
+        return None
+    if entry.get("out_size") is None or entry["out_size"] != _stat(out_file)[0]:
+        return None
+    return entry
@@ -0,0 +1,93 @@
+import collections
+import logging
+import logging.handlers
+import os
+from typing import Callable, List, Optional
+import libs.libpaths as libpaths
+
+# Journalisation de l'interface graphique : fichier tournant dans le répertoire d'état
+# (~/.local/state/dvtool/dvtool.log) et tampon circulaire alimentant l'onglet Debug.
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_FILE_NAME = "dvtool.log"
+# Rotation : 5 fichiers de 5 Mo au plus
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+# Nombre de lignes conservées par défaut dans le tampon (et affichées dans l'onglet Debug)
+DEFAULT_MAX_LINES = 5000
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+# Tampon de l'onglet Debug, créé par setup_logging()
+log_buffer = None
+
+def log_file() -> str:
+    return os.path.join(libpaths.state_dir(), LOG_FILE_NAME)
+
+class LogBuffer(logging.Handler):
+    """Garde les derniers enregistrements (niveau, ligne) dans un tampon circulaire.
+
+    Les nouvelles lignes sont aussi accumulées jusqu'à ce que l'affichage les récupère
+    par lots (take_pending) ; on_new est appelé à chaque enregistrement, depuis n'importe
+    quel thread, pour planifier cet affichage.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        super().__init__()
+        self.records = collections.deque(maxlen=max_lines)
+        self._pending = collections.deque(maxlen=max_lines)
+        self.on_new: Optional[Callable] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = (record.levelno, self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        with self.lock:
+            self.records.append(entry)
+            self._pending.append(entry)
+            callback = self.on_new
+        if callback is not None:
+            callback()
+
+    def take_pending(self) -> List[tuple]:
+        with self.lock:
+            entries = list(self._pending)
+            self._pending.clear()
+        return entries
+
+    def snapshot(self) -> List[tuple]:
+        with self.lock:
+            self._pending.clear()
+            return list(self.records)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.records.clear()
+            self._pending.clear()
+
+    def set_max_lines(self, max_lines: int) -> None:
+        with self.lock:
+            self.records = collections.deque(self.records, maxlen=max_lines)
+            self._pending = collections.deque(self._pending, maxlen=max_lines)
+
+def matches(entry: tuple, min_level: int, text: str = "") -> bool:
+    """Filtre de l'onglet Debug : niveau minimal et texte (nom de fichier d'un job par ex.)."""
+    levelno, line = entry
+    return levelno >= min_level and (not text or text.lower() in line.lower())
+
+def setup_logging(max_lines: int = DEFAULT_MAX_LINES) -> None:
+    """Configure le logging de l'interface : fichier tournant, console et tampon de l'onglet Debug."""
+    global log_buffer
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    try:
+        handlers.append(logging.handlers.RotatingFileHandler(log_file(), maxBytes=MAX_BYTES,
+                                                             backupCount=BACKUP_COUNT, encoding="utf-8"))
+    except OSError as e:
+        print(f"Unable to open log file : {e}")
+    log_buffer = LogBuffer(max_lines)
+    handlers.append(log_buffer)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    logging.basicConfig(level=logging.DEBUG, handlers=handlers)
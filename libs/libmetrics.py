@@ -0,0 +1,249 @@
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+import libs.libpaths as libpaths
+
+# Mesures de ressources par job : temps CPU, mémoire (RSS) et octets lus/écrits de chaque
+# FFmpeg, relevés dans /proc/<pid> pendant l'encodage, avec la progression (fps, vitesse)
+# et la durée de chaque phase (sondage, attente, encodage, finalisation).
+# Sorties : un fichier JSONL par lot et un fichier texte Prometheus (collecteur textfile
+# de node_exporter), réécrit à chaque relevé.
+
+# Intervalle entre deux relevés (secondes)
+SAMPLE_INTERVAL = 2.0
+# Nombre de fichiers JSONL de lots conservés
+MAX_BATCH_FILES = 50
+PROM_FILE_NAME = "dvtool.prom"
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Numéro des lots du processus (plusieurs lots peuvent démarrer dans la même seconde)
+_batch_counter = itertools.count()
+
+def metrics_dir() -> str:
+    path = os.path.join(libpaths.state_dir(), "metrics")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def default_textfile() -> str:
+    return os.path.join(metrics_dir(), PROM_FILE_NAME)
+
+def read_proc(pid: int) -> Optional[dict]:
+    """Temps CPU (s), RSS (octets) et E/S disque (octets) d'un processus, ou None s'il a disparu."""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # Le nom du programme (2e champ) peut contenir des espaces : on repart après ")"
+            fields = f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    sample = {
+        "cpu_seconds": (int(fields[11]) + int(fields[12])) / _CLK_TCK,
+        "rss_bytes": int(fields[21]) * _PAGE_SIZE,
+        "read_bytes": None,
+        "write_bytes": None,
+    }
+    try:
+        with open(f"/proc/{pid}/io", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("read_bytes", "write_bytes"):
+                    sample[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return sample
+
+class JobResources:
+    """Cumul des relevés des FFmpeg d'un job (un seul, ou un par segment)."""
+
+    def __init__(self):
+        self._last = {}  # pid -> dernier relevé (conservé après la fin du processus)
+        self.peak_rss_bytes = 0
+
+    def sample(self, processes) -> None:
+        rss = 0
+        for process in processes:
+            sample = read_proc(process.pid)
+            if sample is None:
+                continue
+            self._last[process.pid] = sample
+            rss += sample["rss_bytes"]
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+
+    def totals(self) -> dict:
+        samples = self._last.values()
+        return {
+            "cpu_seconds": round(sum(s["cpu_seconds"] for s in samples), 2),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "read_bytes": sum(s["read_bytes"] or 0 for s in samples),
+            "write_bytes": sum(s["write_bytes"] or 0 for s in samples),
+        }
+
+def job_phases(job) -> dict:
+    """Durée (s) des phases d'un job : sondage, attente dans la file, encodage, finalisation."""
+    def span(start, end):
+        return round(end - start, 3) if start is not None and end is not None else None
+    return {
+        "probe": round(job.probe_seconds, 3) if job.probe_seconds is not None else None,
+        "queue": span(job.queued_at, job.started_at),
+        "encode": span(job.started_at, job.encoded_at),
+        "finalize": span(job.encoded_at, job.finished_at),
+    }
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+class BatchMetrics:
+    """Relève les ressources des jobs en cours d'un lot (BatchScheduler) et écrit les exports."""
+
+    def __init__(self, batch, textfile: Optional[str] = None, interval: float = SAMPLE_INTERVAL):
+        self.batch = batch
+        self.textfile = textfile or default_textfile()
+        self.interval = interval
+        self.jsonl_file = os.path.join(metrics_dir(), time.strftime("batch-%Y%m%d-%H%M%S")
+                                       + f"-{os.getpid()}-{next(_batch_counter)}.jsonl")
+        self._resources = {}  # file_path -> JobResources
+        self._lock = threading.Lock()
+        self._textfile_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._phase_totals = {}  # phase -> (somme, nombre)
+
+    def resources(self, job) -> JobResources:
+        with self._lock:
+            return self._resources.setdefault(job.file_path, JobResources())
+
+    def start(self) -> None:
+        self._prune()
+        self._write_line({"event": "batch_start", "time": time.time(), "mode": self.batch.mode,
+                          "files": len(self.batch.jobs), "jobs": self.batch.max_jobs,
+                          "threads": self.batch.num_threads})
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._write_line({"event": "batch_end", "time": time.time(), **self.batch.summary()})
+        self._write_textfile()
+
+    def sample_job(self, job) -> None:
+        """Relevé immédiat d'un job (ex. juste avant de récupérer le code de retour de FFmpeg)."""
+        self.resources(job).sample(job.processes())
+
+    def job_end(self, job) -> None:
+        """Écrit la ligne de fin d'un job : ressources cumulées, progression et phases."""
+        phases = job_phases(job)
+        with self._lock:
+            for phase, seconds in phases.items():
+                if seconds is not None:
+                    total, count = self._phase_totals.get(phase, (0.0, 0))
+                    self._phase_totals[phase] = (total + seconds, count + 1)
+        self._write_line({"event": "job", "time": time.time(), "file": job.file_path, "mode": job.history_mode,
+                          "state": job.state, "strategy": job.strategy, "duration": job.duration,
+                          "fps": job.fps, "speed": job.speed, "threads": job.threads,
+                          "placement": job.placement_info(), "phases": phases,
+                          **self.resources(job).totals()})
+        self._write_textfile()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            for job in self.batch.running_jobs():
+                resources = self.resources(job)
+                resources.sample(job.processes())
+                self._write_line({"event": "sample", "time": time.time(), "file": job.file_path,
+                                  "percent": round(job.percent, 1), "fps": job.fps, "speed": job.speed,
+                                  "bitrate": job.bitrate, "paused": job.paused, **resources.totals()})
+            self._write_textfile()
+
+    def _write_line(self, record: dict) -> None:
+        try:
+            with self._lock, open(self.jsonl_file, "a") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.debug(f"Unable to write metrics : {e}")
+
+    def _prune(self) -> None:
+        """Ne garde que les MAX_BATCH_FILES derniers fichiers de lots."""
+        directory = os.path.dirname(self.jsonl_file)
+        files = sorted(f for f in os.listdir(directory) if f.startswith("batch-") and f.endswith(".jsonl"))
+        for name in files[:max(0, len(files) - (MAX_BATCH_FILES - 1))]:
+            try:
+                os.unlink(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def prometheus_text(self) -> str:
+        """Exposition au format texte Prometheus de l'état du lot et des jobs en cours."""
+        batch = self.batch
+        lines = []
+
+        def metric(name, help_text, kind, samples):
+            """samples : (labels, valeur), ou (suffixe, labels, valeur) pour un summary (_sum, _count)."""
+            lines.append(f"# HELP dvtool_{name} {help_text}")
+            lines.append(f"# TYPE dvtool_{name} {kind}")
+            for sample in samples:
+                suffix, labels, value = sample if len(sample) == 3 else ("",) + sample
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                series = f"dvtool_{name}{suffix}"
+                lines.append(f"{series}{{{label_text}}} {value}" if label_text else f"{series} {value}")
+
+        states = {}
+        for job in batch.jobs:
+            states[job.state] = states.get(job.state, 0) + 1
+        metric("batch_jobs", "Jobs of the current batch by state.", "gauge",
+               [({"state": state}, count) for state, count in sorted(states.items())])
+        metric("batch_percent", "Progress of the current batch (percent of media duration).", "gauge",
+               [({}, round(batch.batch_percent(), 2))])
+        metric("batch_speed", "Combined speed of the running jobs (x realtime).", "gauge",
+               [({}, batch.batch_speed() or 0)])
+        metric("batch_paused", "1 if the batch is paused.", "gauge", [({}, int(batch.paused))])
+        metric("last_update_timestamp_seconds", "Time of the last metrics update.", "gauge",
+               [({}, round(time.time(), 3))])
+
+        running = batch.running_jobs()
+        job_samples = {"fps": [], "speed": [], "cpu": [], "rss": [], "read": [], "write": []}
+        for job in running:
+            labels = {"file": os.path.basename(job.file_path), "mode": job.mode}
+            totals = self.resources(job).totals()
+            job_samples["fps"].append((labels, job.fps or 0))
+            job_samples["speed"].append((labels, job.speed or 0))
+            job_samples["cpu"].append((labels, totals["cpu_seconds"]))
+            job_samples["rss"].append((labels, totals["peak_rss_bytes"]))
+            job_samples["read"].append((labels, totals["read_bytes"]))
+            job_samples["write"].append((labels, totals["write_bytes"]))
+        metric("job_fps", "Encoding frame rate of a running job.", "gauge", job_samples["fps"])
+        metric("job_speed", "Encoding speed of a running job (x realtime).", "gauge", job_samples["speed"])
+        metric("job_cpu_seconds_total", "CPU time used by the ffmpeg processes of a running job.", "counter",
+               job_samples["cpu"])
+        metric("job_peak_rss_bytes", "Peak resident memory of a running job.", "gauge", job_samples["rss"])
+        metric("job_read_bytes_total", "Bytes read from storage by a running job.", "counter", job_samples["read"])
+        metric("job_write_bytes_total", "Bytes written to storage by a running job.", "counter", job_samples["write"])
+
+        with self._lock:
+            totals = dict(self._phase_totals)
+        phase_samples = []
+        for phase, (seconds, count) in sorted(totals.items()):
+            phase_samples.append(("_sum", {"phase": phase}, round(seconds, 3)))
+            phase_samples.append(("_count", {"phase": phase}, count))
+        metric("phase_seconds", "Time spent per job phase by the finished jobs of the current batch.", "summary",
+               phase_samples)
+        return "\n".join(lines) + "\n"
+
+    def _write_textfile(self) -> None:
+        """Réécrit le fichier Prometheus de façon atomique (le collecteur ne lit jamais un fichier partiel)."""
+        directory = os.path.dirname(self.textfile) or "."
+        tmp = os.path.join(directory, f".{os.path.basename(self.textfile)}.{os.getpid()}.tmp")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            text = self.prometheus_text()
+            with self._textfile_lock:
+                with open(tmp, "w") as f:
+                    f.write(text)
+                os.replace(tmp, self.textfile)
+        except OSError as e:
+            logging.debug(f"Unable to write Prometheus textfile : {e}")
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+
+APP_NAME = "dvtool"
+
+def _xdg_dir(env: str, fallback: str) -> str:
+    """Retourne le répertoire XDG de l'application (créé si besoin)."""
+    base = os.environ.get(env) or os.path.expanduser(fallback)
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_dir() -> str:
+    """Répertoire de cache (~/.cache/dvtool)."""
+    return _xdg_dir("XDG_CACHE_HOME", "~/.cache")
+
+def config_dir() -> str:
+    """Répertoire de configuration (~/.config/dvtool)."""
+    return _xdg_dir("XDG_CONFIG_HOME", "~/.config")
+
+def data_dir() -> str:
+    """Répertoire de données (~/.local/share/dvtool)."""
+    return _xdg_dir("XDG_DATA_HOME", "~/.local/share")
+
+def state_dir() -> str:
+    """Répertoire d'état : journaux, historique (~/.local/state/dvtool)."""
+    return _xdg_dir("XDG_STATE_HOME", "~/.local/state")
+
+def runtime_dir() -> str:
+    """Répertoire d'exécution : sockets ($XDG_RUNTIME_DIR/dvtool, sinon le répertoire d'état)."""
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return _xdg_dir("XDG_RUNTIME_DIR", "/tmp")
+    return state_dir()
+
+def atomic_write_json(filename: str, data) -> None:
+    """Écrit un fichier JSON de façon atomique (fichier temporaire puis renommage)."""
+    directory = os.path.dirname(filename) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,210 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from typing import List, Optional
+import libs.libpaths as libpaths
+
+# Nombre maximum d'entrées conservées dans le cache (les plus anciennes sont évincées)
+CACHE_MAX_ENTRIES = 5000
+# Délai minimum entre deux écritures du cache sur disque (secondes)
+CACHE_SAVE_DELAY = 2.0
+CACHE_VERSION = 3
+
+_lock = threading.Lock()
+_cache = None
+_dirty = False
+_last_save = 0.0
+
+def cache_file() -> str:
+    return os.path.join(libpaths.cache_dir(), "probe_cache.json")
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Convertit un débit d'images ffprobe ("30000/1001") en float."""
+    if not rate:
+        return None
+    try:
+        num, _, den = rate.partition("/")
+        value = float(num) / float(den or 1)
+        return value if value > 0 else None
+    except (ValueError, ZeroDivisionError):
+        return None
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_ffprobe(data: dict) -> dict:
+    """Extrait les propriétés utiles de la sortie JSON de ffprobe."""
+    streams = data.get("streams", [])
+    fmt = data.get("format", {})
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+
+    duration = _to_float(fmt.get("duration")) or _to_float(video.get("duration"))
+    return {
+        "codec": (video.get("codec_name") or "").lower() or None,
+        "profile": video.get("profile"),
+        "duration": duration,
+        "width": _to_int(video.get("width")),
+        "height": _to_int(video.get("height")),
+        "fps": _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate")),
+        "pix_fmt": video.get("pix_fmt"),
+        "field_order": video.get("field_order"),
+        "bit_rate": _to_int(video.get("bit_rate")) or _to_int(fmt.get("bit_rate")),
+        "format": fmt.get("format_name"),
+        "audio_codec": audio.get("codec_name"),
+        "audio_channels": _to_int(audio.get("channels")),
+        "audio_layout": audio.get("channel_layout"),
+        "audio_sample_rate": _to_int(audio.get("sample_rate")),
+    }
+
+def run_ffprobe(filename: str) -> Optional[dict]:
+    """Un seul appel ffprobe (JSON) pour toutes les propriétés du fichier."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-print_format", "json", "-show_format", "-show_streams", filename],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        if result.returncode != 0:
+            logging.debug(f"ffprobe failed ({filename}) : {result.stderr.strip()}")
+            return None
+        return parse_ffprobe(json.loads(result.stdout or "{}"))
+    except (OSError, ValueError):
+        return None
+
+def _load() -> dict:
+    """Charge le cache depuis le disque (une seule fois)."""
+    global _cache
+    if _cache is None:
+        _cache = {}
+        try:
+            with open(cache_file(), "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                _cache = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+    return _cache
+
+def _evict(cache: dict) -> None:
+    """Supprime les entrées les moins récemment utilisées au-delà de CACHE_MAX_ENTRIES."""
+    excess = len(cache) - CACHE_MAX_ENTRIES
+    if excess > 0:
+        for key in sorted(cache, key=lambda k: cache[k].get("used", 0))[:excess]:
+            del cache[key]
+
+def flush() -> None:
+    """Écrit le cache sur disque s'il a été modifié."""
+    global _dirty, _last_save
+    with _lock:
+        if not _dirty or _cache is None:
+            return
+        _evict(_cache)
+        # Copie profonde : les entrées peuvent être modifiées pendant l'écriture
+        data = {"version": CACHE_VERSION, "entries": copy.deepcopy(_cache)}
+        _dirty = False
+        _last_save = time.monotonic()
+    try:
+        libpaths.atomic_write_json(cache_file(), data)
+    except OSError as e:
+        logging.debug(f"Unable to write probe cache : {e}")
+
+atexit.register(flush)
+
+def probe(filename: str) -> Optional[dict]:
+    """Retourne les propriétés du fichier depuis le cache, en lançant ffprobe si besoin.
+
+    Les entrées sont indexées par (chemin, taille, mtime_ns) : un fichier modifié est sondé à nouveau.
+    """
+    global _dirty
+    path = os.path.abspath(filename)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    with _lock:
+        entry = _load().get(path)
+        if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            entry["used"] = time.time()
+            return dict(entry["info"])
+
+    info = run_ffprobe(path)
+    if info is None:
+        return None
+
+    with _lock:
+        _load()[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "used": time.time(), "info": info}
+        _dirty = True
+        save_now = time.monotonic() - _last_save >= CACHE_SAVE_DELAY
+    if save_now:
+        flush()
+    return dict(info)
+
+def run_keyframes_probe(filename: str) -> Optional[List[float]]:
+    """Liste les instants (s) des images clés de la première piste vidéo (lecture des paquets, sans décodage)."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "packet=pts_time,flags",
+             "-of", "csv=p=0", filename],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                keyframes.append(float(pts))
+            except ValueError:
+                continue
+    return sorted(set(keyframes))
+
+def get_keyframes(filename: str) -> Optional[List[float]]:
+    """Retourne les images clés du fichier (non conservées : plusieurs centaines de milliers
+    pour un master intra-image ; voir get_value/set_value pour mémoriser le résultat d'un calcul)."""
+    return run_keyframes_probe(os.path.abspath(filename))
+
+def get_value(filename: str, key: str):
+    """Valeur calculée conservée dans l'entrée de cache du fichier (ex. points de coupe), ou None."""
+    path = os.path.abspath(filename)
+    if probe(path) is None:
+        return None
+    with _lock:
+        entry = _load().get(path)
+        value = entry.get("values", {}).get(key) if entry else None
+    return copy.deepcopy(value)
+
+def set_value(filename: str, key: str, value) -> None:
+    """Conserve une valeur calculée dans l'entrée de cache du fichier (oubliée s'il change)."""
+    global _dirty
+    with _lock:
+        entry = _load().get(os.path.abspath(filename))
+        if entry is None:
+            return
+        entry.setdefault("values", {})[key] = copy.deepcopy(value)
+        _dirty = True
+    flush()
+
+def invalidate(filename: str) -> None:
+    """Retire un fichier du cache."""
+    global _dirty
+    with _lock:
+        if _load().pop(os.path.abspath(filename), None) is not None:
+            _dirty = True
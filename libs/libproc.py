@@ -0,0 +1,145 @@
+import contextlib
+import logging
+import os
+import shutil
+import signal
+import subprocess
+from typing import List, Optional, Tuple
+
+# Contrôle des processus FFmpeg. Chaque FFmpeg est lancé dans son propre groupe de
+# processus (start_new_session) : les signaux et priorités s'appliquent au groupe.
+
+# Priorité basse : nice maximal et classe d'E/S "idle" (n'utilise le disque que s'il est libre)
+LOW_NICE = 19
+NORMAL_NICE = 0
+IONICE_IDLE = ["-c", "3"]
+IONICE_NORMAL = ["-c", "2", "-n", "4"]
+
+def _signal_group(process: subprocess.Popen, sig: int) -> bool:
+    if process.poll() is not None:
+        return False
+    try:
+        os.killpg(process.pid, sig)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+def suspend(process: subprocess.Popen) -> bool:
+    """Met en pause le groupe de processus (SIGSTOP) ; le travail en cours est conservé."""
+    return _signal_group(process, signal.SIGSTOP)
+
+def resume(process: subprocess.Popen) -> bool:
+    """Reprend un groupe de processus mis en pause (SIGCONT)."""
+    return _signal_group(process, signal.SIGCONT)
+
+def set_low_priority(process: subprocess.Popen, low: bool) -> None:
+    """Baisse (ou rétablit) la priorité CPU et E/S d'un groupe de processus.
+
+    Sans privilèges, une priorité baissée ne peut pas être relevée : le processus reste
+    en priorité basse jusqu'à sa fin, seuls les jobs suivants repartent en priorité normale.
+    """
+    if process.poll() is not None:
+        return
+    try:
+        os.setpriority(os.PRIO_PGRP, process.pid, LOW_NICE if low else NORMAL_NICE)
+    except PermissionError:
+        logging.debug(f"Unable to restore normal priority of {process.pid} (not permitted)")
+    except (ProcessLookupError, OSError):
+        return
+    ionice = shutil.which("ionice")
+    if ionice:
+        subprocess.run([ionice] + (IONICE_IDLE if low else IONICE_NORMAL) + ["-P", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+# --- Placement des jobs : affinité CPU et nœuds NUMA ---
+
+NODE_DIR = "/sys/devices/system/node"
+CPU_DIR = "/sys/devices/system/cpu"
+
+def parse_cpulist(text: str) -> List[int]:
+    """Convertit une liste de CPU du noyau ("0-3,8-11") en liste d'entiers."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+def format_cpulist(cpus: List[int]) -> str:
+    """Inverse de parse_cpulist : [0, 1, 2, 3, 8] -> "0-3,8"."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{a}-{b}" if a != b else str(a) for a, b in ranges)
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _core_key(cpu: int) -> Tuple[int, int, int]:
+    """Clé de tri regroupant les threads SMT d'un même cœur physique."""
+    package = _read(os.path.join(CPU_DIR, f"cpu{cpu}", "topology", "physical_package_id"))
+    core = _read(os.path.join(CPU_DIR, f"cpu{cpu}", "topology", "core_id"))
+    try:
+        return int(package or 0), int(core if core is not None else cpu), cpu
+    except ValueError:
+        return 0, cpu, cpu
+
+def numa_nodes() -> List[Tuple[int, List[int]]]:
+    """Nœuds NUMA et leurs CPU utilisables par ce processus ; un seul nœud si inconnu."""
+    allowed = os.sched_getaffinity(0)
+    nodes = []
+    try:
+        names = sorted((n for n in os.listdir(NODE_DIR) if n.startswith("node") and n[4:].isdigit()),
+                       key=lambda n: int(n[4:]))
+    except OSError:
+        names = []
+    for name in names:
+        cpulist = _read(os.path.join(NODE_DIR, name, "cpulist"))
+        cpus = [c for c in parse_cpulist(cpulist or "") if c in allowed]
+        if cpus:
+            nodes.append((int(name[4:]), sorted(cpus, key=_core_key)))
+    return nodes or [(0, sorted(allowed, key=_core_key))]
+
+def plan_slots(max_jobs: int) -> List[Tuple[int, List[int]]]:
+    """Découpe les CPU en max_jobs emplacements (nœud, CPU) sans chevauchement.
+
+    Les jobs sont répartis à tour de rôle sur les nœuds NUMA ; dans un nœud, chaque
+    emplacement reçoit des cœurs physiques entiers (threads SMT voisins ensemble).
+    """
+    nodes = numa_nodes()
+    counts = [max_jobs // len(nodes) + (1 if i < max_jobs % len(nodes) else 0) for i in range(len(nodes))]
+    per_node = []
+    for (node, cpus), count in zip(nodes, counts):
+        count = min(count, len(cpus))
+        slots = []
+        for i in range(count):
+            start, end = len(cpus) * i // count, len(cpus) * (i + 1) // count
+            slots.append((node, cpus[start:end]))
+        per_node.append(slots)
+    # Ordre de lancement : un emplacement de chaque nœud à tour de rôle
+    ordered = []
+    for i in range(max((len(s) for s in per_node), default=0)):
+        ordered.extend(slots[i] for slots in per_node if i < len(slots))
+    return ordered
+
+@contextlib.contextmanager
+def pinned(cpus: Optional[List[int]]):
+    """Restreint le thread appelant à ces CPU le temps du bloc : les processus et threads
+    lancés dedans héritent de l'affinité (la mémoire est ensuite allouée sur le nœud local)."""
+    if not cpus:
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
@@ -0,0 +1,60 @@
+from typing import Optional
+
+# Options à ajouter à FFmpeg pour obtenir une progression structurée sur stdout
+PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats"]
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    """Convertit une valeur de -progress ("1.25x", "2345.6kbits/s", "N/A") en float."""
+    if not value:
+        return None
+    value = value.strip().rstrip("x")
+    if value.endswith("kbits/s"):
+        value = value[:-len("kbits/s")]
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+class ProgressParser:
+    """Analyse la sortie clé=valeur de `ffmpeg -progress`.
+
+    feed() retourne un instantané (dict) à chaque bloc complet (ligne progress=continue/end),
+    sinon None. L'instantané contient out_time (s), fps, speed, bitrate (kbit/s), frame,
+    total_size (octets) et end (bool).
+    """
+
+    def __init__(self):
+        self._block = {}
+
+    def feed(self, line: str) -> Optional[dict]:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        if key != "progress":
+            self._block[key] = value
+            return None
+
+        block, self._block = self._block, {}
+        out_time = None
+        # out_time_us (µs) ; out_time_ms est aussi en µs sur les anciennes versions
+        for name in ("out_time_us", "out_time_ms"):
+            raw = _to_float(block.get(name))
+            if raw is not None:
+                out_time = max(0.0, raw / 1000000)
+                break
+        return {
+            "out_time": out_time,
+            "fps": _to_float(block.get("fps")),
+            "speed": _to_float(block.get("speed")),
+            "bitrate": _to_float(block.get("bitrate")),
+            "frame": int(_to_float(block.get("frame")) or 0),
+            "total_size": int(_to_float(block.get("total_size")) or 0),
+            "end": value.strip() == "end",
+        }
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Formate une durée restante en H:MM:SS (ou "--:--:--" si inconnue)."""
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
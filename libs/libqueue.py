@@ -0,0 +1,172 @@
+import collections
+import itertools
+import tkinter as tk
+from tkinter import ttk
+from typing import Iterable, List, Optional
+import config.lang as customlang
+import config.style as customstyle
+import libs.libprogress as libprogress
+import libs.libspace as libspace
+
+# File d'attente des fichiers à convertir (onglet Fichiers) : modèle indexé par chemin
+# (doublons et retraits en O(1), ordre d'ajout conservé) et vue ttk.Treeview remplie par
+# lots depuis la boucle Tk, pour rester fluide avec des milliers de clips.
+
+COLUMNS = ("file", "codec", "duration", "resolution", "size", "status")
+COLUMN_WIDTHS = {"file": 420, "codec": 70, "duration": 80, "resolution": 90, "size": 80, "status": 110}
+# Lignes ajoutées à la vue par passage de la boucle Tk
+INSERT_CHUNK = 300
+# Codecs à convertir avant import dans Davinci Resolve (lignes en rouge)
+RED_CODECS = ("h264", "hevc")
+
+STATUS_PROBING = "probing"
+STATUS_READY = "ready"
+STATUS_UNREADABLE = "unreadable"
+
+class FileQueue:
+    """Fichiers de la file sans doublon, dans l'ordre d'ajout, avec leurs informations."""
+
+    def __init__(self):
+        self._entries = {}  # chemin -> infos (l'ordre d'insertion du dict est l'ordre de la file)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def paths(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, path: str) -> Optional[dict]:
+        return self._entries.get(path)
+
+    def add(self, paths: Iterable[str]) -> List[str]:
+        """Ajoute les fichiers absents de la file et retourne ceux qui ont été ajoutés."""
+        added = []
+        for path in paths:
+            if path not in self._entries:
+                self._entries[path] = {"info": None, "size": None, "status": STATUS_PROBING}
+                added.append(path)
+        return added
+
+    def remove(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            self._entries.pop(path, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def update(self, path: str, **fields) -> bool:
+        """Met à jour les informations d'un fichier ; False s'il a été retiré entre-temps."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return False
+        entry.update(fields)
+        return True
+
+def format_row(path: str, entry: dict) -> tuple:
+    info = entry["info"] or {}
+    width, height = info.get("width"), info.get("height")
+    status = entry["status"]
+    if status in (STATUS_PROBING, STATUS_READY, STATUS_UNREADABLE):
+        status = customlang.get("queue_status_" + status)
+    return (
+        path,
+        info.get("codec") or "",
+        libprogress.format_eta(info["duration"]) if info.get("duration") else "",
+        f"{width}x{height}" if width and height else "",
+        libspace.format_size(entry["size"]) if entry["size"] is not None else "",
+        status,
+    )
+
+class QueueView:
+    """ttk.Treeview de la file : insertion incrémentale et sélection multiple."""
+
+    def __init__(self, parent, height: int = 10):
+        self.queue = FileQueue()
+        self._iids = {}   # chemin -> identifiant de ligne
+        self._paths = {}  # identifiant de ligne -> chemin
+        self._counter = itertools.count()
+        self._pending = collections.deque()  # chemins pas encore affichés
+        self._scheduled = False
+
+        frame = tk.Frame(parent, bg=customstyle.bg_global)
+        frame.pack(fill="both", expand=True, pady=5)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(frame, columns=COLUMNS, show="headings", selectmode="extended",
+                                 height=height, yscrollcommand=scrollbar.set)
+        for column in COLUMNS:
+            self.tree.heading(column, text=customlang.get("queue_column_" + column))
+            self.tree.column(column, width=COLUMN_WIDTHS[column], stretch=column == "file", anchor="w")
+        self.tree.tag_configure("red", foreground="red")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.tree.yview)
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def paths(self) -> List[str]:
+        return self.queue.paths()
+
+    def add(self, paths: Iterable[str]) -> List[str]:
+        """Ajoute des fichiers ; les lignes sont insérées par lots de INSERT_CHUNK."""
+        added = self.queue.add(paths)
+        self._pending.extend(added)
+        if added and not self._scheduled:
+            self._scheduled = True
+            self.tree.after_idle(self._insert_pending)
+        return added
+
+    def _insert_pending(self) -> None:
+        for _ in range(min(INSERT_CHUNK, len(self._pending))):
+            path = self._pending.popleft()
+            entry = self.queue.get(path)
+            if entry is None or path in self._iids:
+                continue  # Retiré avant son affichage
+            iid = str(next(self._counter))
+            self._iids[path] = iid
+            self._paths[iid] = path
+            self.tree.insert("", "end", iid=iid, values=format_row(path, entry), tags=self._tags(entry))
+        if self._pending:
+            self.tree.after(1, self._insert_pending)
+        else:
+            self._scheduled = False
+
+    def _tags(self, entry: dict) -> tuple:
+        return ("red",) if entry["info"] and entry["info"].get("codec") in RED_CODECS else ()
+
+    def _refresh(self, path: str) -> None:
+        iid = self._iids.get(path)
+        if iid is not None:
+            entry = self.queue.get(path)
+            self.tree.item(iid, values=format_row(path, entry), tags=self._tags(entry))
+
+    def set_info(self, path: str, info: Optional[dict], size: Optional[int]) -> None:
+        """Résultat du sondage d'un fichier (thread Tk)."""
+        status = STATUS_READY if info else STATUS_UNREADABLE
+        if self.queue.update(path, info=info, size=size, status=status):
+            self._refresh(path)
+
+    def set_status(self, path: str, status: str) -> None:
+        if self.queue.update(path, status=status):
+            self._refresh(path)
+
+    def remove_selected(self) -> List[str]:
+        """Retire les lignes sélectionnées et retourne leurs chemins."""
+        selection = self.tree.selection()
+        paths = [self._paths.pop(iid) for iid in selection]
+        for path in paths:
+            del self._iids[path]
+        self.queue.remove(paths)
+        if selection:
+            self.tree.delete(*selection)
+        return paths
+
+    def clear(self) -> None:
+        self.queue.clear()
+        self._pending.clear()
+        self._iids.clear()
+        self._paths.clear()
+        self.tree.delete(*self.tree.get_children())
@@ -0,0 +1,163 @@
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterator, Optional, Sequence
+import libs.libffmpeg as libffmpeg
+import libs.libprobe as libprobe
+import libs.libwatch as libwatch
+
+# Import récursif d'un dossier (carte mémoire, projet) : parcours os.scandir en arrière-plan,
+# filtre par extension et par codec vidéo (sondage ffprobe en parallèle, via le cache) et
+# exclusion des fichiers déjà produits par l'outil (_ProRes_DV, _YT, dossier Proxy...).
+
+# Filtres de codec proposés (clé -> codecs ffprobe acceptés ; None = tous)
+CODEC_FILTERS = {
+    "all": None,
+    "h264_hevc": ("h264", "hevc"),
+    "prores_dnxhr": ("prores", "dnxhd"),
+    "mjpeg": ("mjpeg",),
+}
+DEFAULT_WORKERS = 4
+# Intervalle minimal entre deux comptes rendus de progression (secondes)
+PROGRESS_INTERVAL = 0.2
+
+def parse_extensions(text: str) -> tuple:
+    """"mp4, MOV .mts" -> (".mp4", ".mov", ".mts") ; extensions vidéo par défaut si vide."""
+    extensions = tuple("." + e.strip().lstrip(".").lower() for e in text.replace(",", " ").split() if e.strip("."))
+    return extensions or libwatch.VIDEO_EXTENSIONS
+
+def is_tool_output(path: str) -> bool:
+    """Vrai pour les fichiers produits par l'outil : suffixes de sortie, proxys et fichiers partiels."""
+    directory, name = os.path.split(path)
+    if name.startswith("."):
+        return True
+    if os.path.basename(directory) == libffmpeg.PROXY_DIR:
+        return True
+    return os.path.splitext(name)[0].endswith(libffmpeg.OUTPUT_SUFFIXES)
+
+def walk(root: str, stop: Optional[threading.Event] = None) -> Iterator[str]:
+    """Fichiers du dossier et de ses sous-dossiers (liens symboliques de dossiers non suivis)."""
+    stack = [root]
+    while stack:
+        if stop is not None and stop.is_set():
+            return
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith("."):
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            logging.debug(f"Scan : unable to list {directory} : {e}")
+            continue
+        # Ordre alphabétique des sous-dossiers (la pile les dépile à l'envers)
+        stack.extend(sorted(subdirs, reverse=True))
+
+class FolderScan:
+    """Parcours d'un dossier en arrière-plan.
+
+    on_found(chemin) est appelé pour chaque fichier retenu (depuis le thread de parcours ou
+    un thread de sondage), on_progress(compteurs) au plus toutes les PROGRESS_INTERVAL s, et
+    on_done(compteurs) à la fin. Compteurs : "seen" (fichiers parcourus), "candidates"
+    (bonne extension), "excluded" (sorties de l'outil), "rejected" (autre codec), "added".
+    """
+
+    def __init__(self, root: str, extensions: Sequence[str] = libwatch.VIDEO_EXTENSIONS,
+                 codecs: Optional[Sequence[str]] = None, workers: int = DEFAULT_WORKERS,
+                 on_found: Optional[Callable] = None, on_progress: Optional[Callable] = None,
+                 on_done: Optional[Callable] = None):
+        self.root = os.path.abspath(root)
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.codecs = tuple(codecs) if codecs else None
+        self.workers = max(1, workers)
+        self.on_found = on_found
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.counts = {"seen": 0, "candidates": 0, "excluded": 0, "rejected": 0, "added": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_progress = 0.0
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+            now = time.monotonic()
+            report = now - self._last_progress >= PROGRESS_INTERVAL
+            if report:
+                self._last_progress = now
+            counts = dict(self.counts)
+        if report and self.on_progress:
+            self.on_progress(counts)
+
+    def _accept(self, path: str) -> None:
+        self._count("added")
+        if self.on_found:
+            self.on_found(path)
+
+    def _check_codec(self, path: str) -> None:
+        if self._stop.is_set():
+            return
+        info = libprobe.probe(path)
+        if info and info["codec"] in self.codecs:
+            self._accept(path)
+        else:
+            self._count("rejected")
+
+    def run(self) -> dict:
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan") \
+            if self.codecs else None
+        try:
+            for path in walk(self.root, self._stop):
+                self._count("seen")
+                if not path.lower().endswith(self.extensions):
+                    continue
+                if is_tool_output(path):
+                    self._count("excluded")
+                    continue
+                self._count("candidates")
+                if pool is None:
+                    self._accept(path)
+                else:
+                    pool.submit(self._check_codec, path)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+            libprobe.flush()
+        logging.debug(f"Scan {self.root} : {self.counts}")
+        if self.on_progress:
+            self.on_progress(dict(self.counts))
+        if self.on_done:
+            self.on_done(dict(self.counts))
+        return self.counts
+
+def scan_files(root: str, extensions: Sequence[str] = libwatch.VIDEO_EXTENSIONS,
+               codecs: Optional[Sequence[str]] = None, workers: int = DEFAULT_WORKERS) -> list:
+    """Parcours synchrone (ligne de commande) : fichiers retenus, triés par chemin."""
+    found = []
+    lock = threading.Lock()
+    def on_found(path):
+        with lock:
+            found.append(path)
+    FolderScan(root, extensions, codecs, workers, on_found=on_found).run()
+    return sorted(found)
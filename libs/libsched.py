@@ -0,0 +1,781 @@
+import concurrent.futures
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+import libs.libffmpeg as libffmpeg
+import libs.libhistory as libhistory
+import libs.libjournal as libjournal
+import libs.libmetrics as libmetrics
+import libs.libprobe as libprobe
+import libs.libproc as libproc
+import libs.libprogress as libprogress
+import libs.libsegment as libsegment
+import libs.libtune as libtune
+
+# États possibles d'un job
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_CANCELED = "canceled"
+STATE_SKIPPED = "skipped"
+STATE_COPYING = "copying"  # encodé dans le dossier de travail, copie vers la destination en cours
+
+# Jobs reconnus comme déjà convertis par le journal d'un lot interrompu
+RESUMED = "resumed"
+
+# Nombre de lignes de stderr FFmpeg conservées par job
+STDERR_TAIL_LINES = 200
+
+def get_mem_available_mb() -> Optional[int]:
+    """Retourne la mémoire disponible (MemAvailable) en Mo, ou None si inconnue."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def get_load_average() -> Optional[float]:
+    """Retourne la charge moyenne sur 1 minute, ou None si inconnue."""
+    try:
+        return os.getloadavg()[0]
+    except (OSError, AttributeError):
+        return None
+
+def split_threads(num_threads: int, max_jobs: int) -> int:
+    """Répartit le budget de threads entre les jobs simultanés (0 = auto)."""
+    if max_jobs <= 1:
+        return num_threads
+    budget = num_threads if num_threads > 0 else (os.cpu_count() or 1)
+    return max(1, budget // max_jobs)
+
+def resolve_concurrency(mode: str, max_jobs: int, num_threads: int) -> Tuple[int, int]:
+    """Applique le réglage automatique (libtune) aux champs laissés sur auto (0).
+
+    Retourne (jobs simultanés, budget total de threads). Sans réglage enregistré,
+    auto vaut 1 job et le choix de FFmpeg pour les threads.
+    """
+    tuning = libtune.get_tuning(mode) if max_jobs <= 0 or num_threads <= 0 else None
+    if max_jobs <= 0:
+        max_jobs = tuning["jobs"] if tuning else 1
+    if num_threads <= 0 and tuning and tuning["threads"] > 0:
+        num_threads = tuning["threads"] * tuning["jobs"]
+    return max(1, max_jobs), max(0, num_threads)
+
+def estimate_batch(files: List[str], mode: str, dest_dir: str, max_jobs: int = 1,
+                   fast_path: bool = True, extra_modes: Optional[List[str]] = None,
+                   resume: bool = False) -> Optional[float]:
+    """Durée prévue (secondes) d'un lot avant son démarrage, d'après l'historique des conversions.
+
+    Retourne None si l'historique ne contient rien de comparable pour ce mode.
+    """
+    items = []
+    history_mode = mode
+    for file_path in files:
+        job = Job(file_path, mode, dest_dir, extra_modes)
+        history_mode = job.history_mode
+        if resume and fast_path and job.is_completed():
+            continue
+        info = libprobe.probe(file_path)
+        if not info:
+            continue
+        strategy = libffmpeg.STRATEGY_ENCODE
+        if fast_path and not job.extra_outputs:
+            strategy = libffmpeg.plan_conversion(file_path, mode, job.out_file)
+        items.append(dict(info, strategy=strategy))
+    if not items:
+        return None
+    return libhistory.predict_batch(items, history_mode, resolve_concurrency(mode, max_jobs, 0)[0])
+
+class Job:
+    """Un fichier à convertir dans un lot.
+
+    extra_modes : modes supplémentaires produits par le même décodage de la source
+    (une sortie par mode ; un mode dont le fichier de sortie serait déjà produit est ignoré).
+    """
+
+    def __init__(self, file_path: str, mode: str, dest_dir: str, extra_modes: Optional[List[str]] = None,
+                 scratch_dir: Optional[str] = None):
+        self.file_path = file_path
+        self.mode = mode
+        self.dest_dir = dest_dir
+        self.scratch_dir = scratch_dir
+        self.out_file = libffmpeg.get_output_file(file_path, mode, dest_dir)
+        self.extra_outputs = []
+        for extra_mode in extra_modes or []:
+            out_file = libffmpeg.get_output_file(file_path, extra_mode, dest_dir)
+            if libffmpeg.is_proxy_mode(extra_mode) and not libffmpeg.is_proxy_mode(mode):
+                # Proxy lié à l'intermédiaire produit dans la même passe : même nom de clip
+                media_name = os.path.splitext(os.path.basename(self.out_file))[0]
+                out_file = libffmpeg.get_proxy_file(media_name, dest_dir)
+            if out_file not in [o for _, o in self.outputs]:
+                self.extra_outputs.append((extra_mode, out_file))
+        self.duration = None
+        self.info = None
+        self.threads = 0
+        self.state = STATE_QUEUED
+        self.percent = 0.0
+        self.out_time = 0.0
+        self.fps = None
+        self.speed = None
+        self.bitrate = None
+        self.process = None
+        # FFmpeg en cours d'un encodage segmenté (voir libsegment)
+        self.segment_processes = []
+        self.paused = False
+        # Emplacement CPU du job (placement activé) : (nœud NUMA, liste des CPU)
+        self.placement = None
+        self.slot_held = False
+        self.cuts = []
+        self.strategy = libffmpeg.STRATEGY_ENCODE
+        self.resumed = False
+        self.cancel_event = threading.Event()
+        self.returncode = None
+        self.error = None
+        self.started_at = None
+        self.wall_time = None
+        # Instants des phases (time.monotonic) pour les mesures, voir libmetrics
+        self.probe_seconds = None
+        self.queued_at = None
+        self.encoded_at = None
+        self.finished_at = None
+        self.stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.file_path)
+
+    @property
+    def outputs(self) -> List[Tuple[str, str]]:
+        """Toutes les sorties du job : [(mode, fichier de sortie)], sortie principale en tête."""
+        return [(self.mode, self.out_file)] + self.extra_outputs
+
+    @property
+    def part_file(self) -> str:
+        return self.part_path(self.out_file)
+
+    def part_path(self, out_file: str) -> str:
+        """Fichier écrit par FFmpeg pour une sortie : nom temporaire à côté de la sortie, ou
+        dans le dossier de travail local (préfixé par le rang de la sortie, les noms pouvant se répéter)."""
+        if not self.scratch_dir:
+            return libffmpeg.get_partial_file(out_file)
+        index = [o for _, o in self.outputs].index(out_file)
+        return libffmpeg.get_partial_file(os.path.join(self.scratch_dir, f"{index}_{os.path.basename(out_file)}"))
+
+    @property
+    def history_mode(self) -> str:
+        """Libellé du job dans l'historique (les sorties multiples ont leur propre vitesse)."""
+        return " + ".join(mode for mode, _ in self.outputs)
+
+    def is_completed(self) -> bool:
+        """Vrai si le journal indique toutes les sorties comme déjà converties et intactes."""
+        return all(libjournal.completed(self.file_path, out_file, mode) for mode, out_file in self.outputs)
+
+    def placement_info(self) -> Optional[dict]:
+        """Placement choisi pour le job (nœud NUMA, CPU), ou None."""
+        if self.placement is None:
+            return None
+        node, cpus = self.placement
+        return {"node": node, "cpus": libproc.format_cpulist(cpus)}
+
+    def processes(self) -> list:
+        """Processus FFmpeg en cours du job."""
+        if self.cuts:
+            return list(self.segment_processes)
+        return [self.process] if self.process is not None else []
+
+    def journal(self, state: str) -> None:
+        for mode, out_file in self.outputs:
+            libjournal.set_job(self.file_path, out_file, mode, state, self.strategy, self.duration)
+
+    def is_finished(self) -> bool:
+        return self.state in (STATE_DONE, STATE_FAILED, STATE_CANCELED, STATE_SKIPPED)
+
+class BatchScheduler:
+    """Ordonnanceur de lot : plusieurs FFmpeg en parallèle, le plus long d'abord.
+
+    Les callbacks sont appelés depuis les threads de l'ordonnanceur :
+    on_progress(job, scheduler), on_job_end(job, scheduler) et on_batch_end(scheduler).
+    resume : reprise d'un lot interrompu, les fichiers notés convertis dans le journal sont
+    ignorés (jamais avec fast_path=False, qui force le ré-encodage).
+    """
+
+    def __init__(self, files: List[str], mode: str, dest_dir: str, max_jobs: int = 1, num_threads: int = 0,
+                 on_progress: Optional[Callable] = None, on_job_end: Optional[Callable] = None,
+                 on_batch_end: Optional[Callable] = None, min_free_mem_mb: int = 1024,
+                 max_load: Optional[float] = None, segment_workers: int = 0, fast_path: bool = True,
+                 extra_modes: Optional[List[str]] = None, scratch_dir: Optional[str] = None,
+                 low_priority: bool = False, placement: bool = False, metrics_textfile: Optional[str] = None,
+                 resume: bool = False):
+        self.jobs = [Job(f, mode, dest_dir, extra_modes, scratch_dir) for f in files]
+        self.mode = mode
+        self.extra_modes = list(extra_modes or [])
+        self.scratch_dir = scratch_dir
+        self.dest_dir = dest_dir
+        # 0 = auto : réglage enregistré par libtune pour ce mode
+        self.max_jobs, self.num_threads = resolve_concurrency(mode, max_jobs, num_threads)
+        self.on_progress = on_progress
+        self.on_job_end = on_job_end
+        self.on_batch_end = on_batch_end
+        self.min_free_mem_mb = min_free_mem_mb
+        self.max_load = max_load if max_load is not None else float(os.cpu_count() or 1)
+        self.segment_workers = segment_workers
+        self.fast_path = fast_path
+        self.resume = resume and fast_path
+        self.canceled = False
+        # Lot en pause : les jobs en cours sont suspendus et aucun job n'est lancé
+        self.paused = False
+        # Priorité CPU/E-S basse pour les FFmpeg du lot (voir libproc)
+        self.low_priority = low_priority
+        # Placement : chaque job est épinglé sur un emplacement CPU d'un nœud NUMA (voir libproc)
+        self.placement = placement
+        self._free_slots = []
+        self.metrics_textfile = metrics_textfile
+        self.metrics = None
+        self.started_at = None
+        self._cond = threading.Condition()
+        self._thread = None
+        # Jobs terminés dont l'historique et on_job_end sont en cours (le lot attend leur fin)
+        self._finalizing = 0
+        self._planned = False
+        # File de copie du dossier de travail vers la destination (une copie à la fois)
+        self._copy_pool = None
+
+    # --- Consultation ---
+
+    def running_jobs(self) -> List[Job]:
+        return [j for j in self.jobs if j.state == STATE_RUNNING]
+
+    def copying_jobs(self) -> List[Job]:
+        return [j for j in self.jobs if j.state == STATE_COPYING]
+
+    def queued_jobs(self) -> List[Job]:
+        """Jobs en attente, dans l'ordre où ils seront lancés."""
+        return [j for j in self.jobs if j.state == STATE_QUEUED]
+
+    def find_job(self, file_path: str) -> Optional[Job]:
+        for job in self.jobs:
+            if job.file_path == file_path:
+                return job
+        return None
+
+    def _media_seconds(self):
+        """Retourne (durée totale, durée déjà traitée) des jobs du lot, en secondes de média."""
+        total = processed = 0.0
+        for job in self.jobs:
+            if not job.duration or job.state in (STATE_FAILED, STATE_CANCELED, STATE_SKIPPED):
+                continue
+            total += job.duration
+            processed += job.duration if job.state in (STATE_DONE, STATE_COPYING) else min(job.out_time, job.duration)
+        return total, processed
+
+    def batch_percent(self) -> float:
+        """Progression globale du lot, pondérée par la durée des fichiers."""
+        total, processed = self._media_seconds()
+        if total <= 0:
+            return 100.0 if all(j.is_finished() for j in self.jobs) else 0.0
+        return processed / total * 100
+
+    def batch_eta(self) -> Optional[float]:
+        """Temps restant estimé (secondes) pour tout le lot, d'après le débit observé."""
+        if self.started_at is None:
+            return None
+        total, processed = self._media_seconds()
+        elapsed = time.monotonic() - self.started_at
+        if processed <= 0 or elapsed <= 0:
+            return None
+        return max(0.0, (total - processed) / (processed / elapsed))
+
+    def batch_speed(self) -> Optional[float]:
+        """Vitesse cumulée des jobs en cours (x temps réel)."""
+        speeds = [j.speed for j in self.running_jobs() if j.speed]
+        return sum(speeds) if speeds else None
+
+    def summary(self) -> dict:
+        """Nombre de fichiers par chemin de traitement (encode, copy_video, remux, skip), repris et par échec."""
+        counts = {libffmpeg.STRATEGY_ENCODE: 0, libffmpeg.STRATEGY_COPY_VIDEO: 0, libffmpeg.STRATEGY_REMUX: 0,
+                  libffmpeg.STRATEGY_SKIP: 0, RESUMED: 0, STATE_FAILED: 0, STATE_CANCELED: 0}
+        for job in self.jobs:
+            if job.resumed:
+                counts[RESUMED] += 1
+            elif job.state in (STATE_DONE, STATE_SKIPPED):
+                counts[job.strategy] += 1
+            elif job.state in counts:
+                counts[job.state] += 1
+        return counts
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # --- Contrôle ---
+
+    def start(self) -> None:
+        """Démarre le lot dans un thread d'arrière-plan."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        if self._thread:
+            self._thread.join()
+
+    def cancel(self) -> None:
+        """Annule tout le lot : les jobs en attente et ceux en cours."""
+        with self._cond:
+            self.canceled = True
+            jobs = list(self.jobs)
+            self._cond.notify_all()
+        for job in jobs:
+            self._cancel_job(job)
+
+    def cancel_job(self, file_path: str) -> bool:
+        """Annule un seul job du lot. Retourne False si le job est introuvable ou terminé."""
+        job = self.find_job(file_path)
+        if job is None or job.is_finished():
+            return False
+        self._cancel_job(job)
+        return True
+
+    def _cancel_job(self, job: Job) -> None:
+        with self._cond:
+            if job.is_finished() or job.state == STATE_COPYING:
+                return
+            previous = job.state
+            job.state = STATE_CANCELED
+            job.cancel_event.set()
+            process = job.process
+            self._cond.notify_all()
+        if previous == STATE_RUNNING and process:
+            logging.debug(f"Command FFmpeg : {process.pid} canceled")
+            process.terminate()
+        elif previous == STATE_QUEUED and self.on_job_end:
+            self.on_job_end(job, self)
+        if job.paused:
+            # Un processus suspendu ne traite SIGTERM qu'une fois repris
+            job.paused = False
+            for paused_process in job.processes():
+                libproc.resume(paused_process)
+
+    def pause(self) -> None:
+        """Suspend les jobs en cours (SIGSTOP) et n'en lance plus jusqu'à resume()."""
+        with self._cond:
+            self.paused = True
+            jobs = self.running_jobs()
+        for job in jobs:
+            self.pause_job(job.file_path)
+
+    def resume(self) -> None:
+        """Reprend les jobs suspendus et le lancement des jobs en attente."""
+        with self._cond:
+            self.paused = False
+            jobs = [j for j in self.jobs if j.paused]
+            self._cond.notify_all()
+        for job in jobs:
+            self.resume_job(job.file_path)
+
+    def pause_job(self, file_path: str) -> bool:
+        """Suspend un job en cours sans perdre son travail. Retourne False s'il ne tourne pas."""
+        job = self.find_job(file_path)
+        if job is None or job.state != STATE_RUNNING:
+            return False
+        job.paused = True
+        for process in job.processes():
+            libproc.suspend(process)
+        logging.debug(f"Job paused : {job.file_path}")
+        if self.on_progress:
+            self.on_progress(job, self)
+        return True
+
+    def resume_job(self, file_path: str) -> bool:
+        """Reprend un job suspendu."""
+        job = self.find_job(file_path)
+        if job is None or not job.paused:
+            return False
+        job.paused = False
+        for process in job.processes():
+            libproc.resume(process)
+        logging.debug(f"Job resumed : {job.file_path}")
+        if self.on_progress:
+            self.on_progress(job, self)
+        return True
+
+    def set_low_priority(self, low: bool) -> None:
+        """Baisse (ou rétablit) la priorité CPU et E/S des FFmpeg en cours et à venir."""
+        self.low_priority = low
+        for job in self.running_jobs():
+            for process in job.processes():
+                libproc.set_low_priority(process, low)
+        logging.debug(f"Batch priority : {'low' if low else 'normal'}")
+
+    def move_job(self, file_path: str, position: int) -> bool:
+        """Déplace un job en attente à la position donnée de la file (0 = le prochain lancé)."""
+        with self._cond:
+            job = self.find_job(file_path)
+            if job is None or job.state != STATE_QUEUED:
+                return False
+            queued = self.queued_jobs()
+            queued.remove(job)
+            queued.insert(max(0, min(position, len(queued))), job)
+            # Les jobs en attente gardent leurs places dans la liste, dans le nouvel ordre
+            slots = [i for i, j in enumerate(self.jobs) if j.state == STATE_QUEUED]
+            first, last = slots[0], slots[-1]
+            for i, queued_job in zip(slots, queued):
+                self.jobs[i] = queued_job
+            self._cond.notify_all()
+        if self.on_progress:
+            for moved in self.jobs[first:last + 1]:
+                self.on_progress(moved, self)
+        return True
+
+    def _apply_control(self, job: Job, process) -> None:
+        """Applique la priorité du lot et la pause du job à un FFmpeg qui vient d'être lancé."""
+        if self.low_priority:
+            libproc.set_low_priority(process, True)
+        if job.paused:
+            libproc.suspend(process)
+
+    # --- Ordonnancement ---
+
+    def _can_admit(self, running: int) -> bool:
+        """Contrôle d'admission : limite de jobs, mémoire disponible et charge."""
+        if self.paused or running >= self.max_jobs:
+            return False
+        if self.placement and not self._free_slots:
+            return False
+        if len(self.copying_jobs()) >= self.max_jobs:
+            return False  # Copies en retard : le dossier de travail ne doit pas se remplir
+        if running == 0:
+            return True
+        mem = get_mem_available_mb()
+        if mem is not None and mem < self.min_free_mem_mb:
+            return False
+        load = get_load_average()
+        if load is not None and load >= self.max_load:
+            return False
+        return True
+
+    def plan(self) -> None:
+        """Prépare le lot sans rien lancer (appelé par start() si besoin).
+
+        Permet de contrôler le lot avant son démarrage (espace disque, voir libspace).
+        """
+        if self._planned:
+            return
+        self._planned = True
+        threads = split_threads(self.num_threads, self.max_jobs)
+        segmented = self.segment_workers >= 2 and libsegment.is_segmentable(self.mode)
+
+        # Reprend les fichiers déjà convertis d'après le journal (reprise seulement), sonde les
+        # durées, choisit le chemin de traitement (skip/remux/copie/encodage) puis trie du plus
+        # long au plus court. Les jobs déjà terminés ne sont signalés qu'après le tri : les index
+        # de self.jobs sont alors définitifs (lignes de la liste des jobs de l'interface)
+        ended = []
+        for job in self.jobs:
+            if self.canceled or job.is_finished():
+                continue
+            entry = libjournal.completed(job.file_path, job.out_file, job.mode) if self.resume else None
+            if entry and job.is_completed():
+                job.state = STATE_DONE
+                job.resumed = True
+                job.strategy = entry.get("strategy") or libffmpeg.STRATEGY_ENCODE
+                job.duration = entry.get("duration")
+                job.percent = 100.0
+                job.out_time = job.duration or 0.0
+                logging.debug(f"Already converted in a previous batch, resumed : {job.file_path}")
+                ended.append(job)
+                continue
+            probe_started = time.monotonic()
+            job.info = libprobe.probe(job.file_path)
+            job.probe_seconds = time.monotonic() - probe_started
+            job.duration = job.info["duration"] if job.info else None
+            job.threads = threads
+            if not job.duration:
+                job.state = STATE_FAILED
+                job.error = "duration"
+                logging.error(f"Unable to read duration : {job.file_path}")
+                ended.append(job)
+                continue
+            if self.fast_path and not job.extra_outputs:
+                job.strategy = libffmpeg.plan_conversion(job.file_path, job.mode, job.out_file)
+                if job.strategy == libffmpeg.STRATEGY_SKIP:
+                    job.state = STATE_SKIPPED
+                    job.percent = 100.0
+                    logging.debug(f"Already in target format, skipped : {job.file_path}")
+                    ended.append(job)
+                    continue
+            if segmented and job.strategy == libffmpeg.STRATEGY_ENCODE and not job.extra_outputs:
+                job.cuts = libsegment.plan_segments(job.file_path, self.segment_workers)
+
+        # File d'attente : du plus long au plus court (réordonnable ensuite, voir move_job)
+        self.jobs.sort(key=lambda j: j.duration or 0, reverse=True)
+        queued_at = time.monotonic()
+        for job in self.jobs:
+            job.queued_at = queued_at
+        if self.on_job_end:
+            for job in ended:
+                self.on_job_end(job, self)
+
+    def _run(self) -> None:
+        self.plan()
+        libjournal.start_batch([j.file_path for j in self.jobs], self.mode, self.dest_dir, self.extra_modes)
+        if self.placement:
+            self._free_slots = libproc.plan_slots(self.max_jobs)
+        self.metrics = libmetrics.BatchMetrics(self, self.metrics_textfile)
+        self.metrics.start()
+        if self.scratch_dir:
+            os.makedirs(self.scratch_dir, exist_ok=True)
+            self._copy_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="copy")
+
+        with self._cond:
+            while True:
+                queue = self.queued_jobs()
+                running = len(self.running_jobs())
+                if (self.canceled or not queue) and running == 0 and self._finalizing == 0 \
+                        and not self.copying_jobs():
+                    break
+                if queue and not self.canceled and self._can_admit(running):
+                    self._launch(queue[0])
+                    continue
+                self._cond.wait(timeout=1.0)
+
+        if self._copy_pool is not None:
+            self._copy_pool.shutdown(wait=True)
+        self.metrics.stop()
+        if not self.canceled:
+            # Un lot annulé ou interrompu reste proposé à la reprise
+            libjournal.finish_batch()
+        if self.on_batch_end:
+            self.on_batch_end(self)
+
+    def _launch(self, job: Job) -> None:
+        """Démarre FFmpeg pour un job (appelé avec le verrou tenu)."""
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        job.started_at = time.monotonic()
+        for _, out_file in job.outputs:
+            os.makedirs(os.path.dirname(out_file) or ".", exist_ok=True)
+        cpus = None
+        if self.placement and self._free_slots:
+            job.placement = self._free_slots.pop(0)
+            job.slot_held = True
+            cpus = job.placement[1]
+            # -threads (et pools x265) à la taille de l'emplacement
+            job.threads = len(cpus)
+            logging.debug(f"Placement {job.file_path} : node {job.placement[0]}, CPU {libproc.format_cpulist(cpus)}")
+        if job.cuts:
+            job.state = STATE_RUNNING
+            # Le thread et les FFmpeg qu'il lance héritent de l'affinité
+            with libproc.pinned(cpus):
+                threading.Thread(target=self._run_segmented, args=(job,), daemon=True).start()
+            return
+        try:
+            with libproc.pinned(cpus):
+                job.process = libffmpeg.run_ffmpeg(job.file_path, job.mode, job.part_file, job.threads, job.strategy,
+                                                   [(m, job.part_path(o)) for m, o in job.extra_outputs])
+        except (OSError, ValueError) as e:
+            self._release_slot(job)
+            job.state = STATE_FAILED
+            job.error = str(e)
+            logging.error(f"FFmpeg launch failed ({job.file_path}) : {e}")
+            job.journal(job.state)
+            if self.on_job_end:
+                self.on_job_end(job, self)
+            return
+        self._apply_control(job, job.process)
+        job.state = STATE_RUNNING
+        threading.Thread(target=self._read_stderr, args=(job,), daemon=True).start()
+        threading.Thread(target=self._watch, args=(job,), daemon=True).start()
+
+    def _read_stderr(self, job: Job) -> None:
+        """Conserve les dernières lignes de stderr (tampon borné)."""
+        for line in job.process.stderr:
+            job.stderr_tail.append(line.rstrip())
+
+    def _watch(self, job: Job) -> None:
+        """Lit la progression structurée de FFmpeg pour un job."""
+        job.journal(STATE_RUNNING)
+        parser = libprogress.ProgressParser()
+        for line in job.process.stdout:
+            snapshot = parser.feed(line)
+            if snapshot is None:
+                continue
+            if snapshot["out_time"] is not None:
+                self._set_out_time(job, snapshot["out_time"])
+            for key in ("fps", "speed", "bitrate"):
+                if snapshot[key] is not None:
+                    setattr(job, key, snapshot[key])
+            if self.on_progress:
+                self.on_progress(job, self)
+
+        # Dernier relevé de ressources : le processus terminé reste lisible dans /proc jusqu'au wait()
+        if self.metrics is not None:
+            self.metrics.sample_job(job)
+        returncode = job.process.wait()
+        self._finish(job, returncode, f"ffmpeg exit code {returncode}")
+
+    def _run_segmented(self, job: Job) -> None:
+        """Encode un job en segments parallèles (voir libsegment)."""
+        logging.debug(f"Segmented encode ({len(job.cuts) + 1} segments) : {job.file_path}")
+        job.journal(STATE_RUNNING)
+        started = time.monotonic()
+
+        def on_segment_progress(out_time):
+            self._set_out_time(job, out_time)
+            elapsed = time.monotonic() - started
+            job.speed = job.out_time / elapsed if elapsed > 0 else None
+            if self.on_progress:
+                self.on_progress(job, self)
+
+        try:
+            libsegment.encode_segmented(job.file_path, job.mode, job.part_file, job.cuts, self.segment_workers,
+                                        job.threads, job.cancel_event, on_segment_progress,
+                                        job.segment_processes, lambda process: self._apply_control(job, process))
+            self._finish(job, 0)
+        except libsegment.SegmentCanceled:
+            self._finish(job, -1)
+        except (OSError, RuntimeError, ValueError) as e:
+            job.stderr_tail.append(str(e))
+            self._finish(job, 1, str(e))
+
+    def _record(self, job: Job) -> None:
+        """Ajoute le job terminé à l'historique des vitesses."""
+        info = job.info or {}
+        strategy = "segmented" if job.cuts else job.strategy
+        libhistory.record_job(job.history_mode, strategy, info.get("width"), info.get("height"), info.get("fps"),
+                              job.duration, job.wall_time, job.threads, self.max_jobs)
+
+    def _set_out_time(self, job: Job, out_time: float) -> None:
+        job.out_time = out_time
+        if job.duration:
+            job.percent = min(100.0, job.out_time / job.duration * 100)
+
+    def _copy_outputs(self, job: Job) -> None:
+        """Copie les sorties du dossier de travail vers la destination (thread de copie).
+
+        Chaque sortie est copiée sous son nom temporaire puis renommée, comme un encodage direct.
+        Si la copie échoue, les sorties non copiées restent dans le dossier de travail (voir
+        _keep_scratch) : l'encodage n'est pas perdu.
+        """
+        returncode, error = 0, None
+        out_files = [o for _, o in job.outputs]
+        for i, out_file in enumerate(out_files):
+            dest_part = libffmpeg.get_partial_file(out_file)
+            try:
+                shutil.copyfile(job.part_path(out_file), dest_part)
+                os.replace(dest_part, out_file)
+                os.unlink(job.part_path(out_file))
+            except (OSError, shutil.Error) as e:
+                try:
+                    os.unlink(dest_part)
+                except OSError:
+                    pass
+                kept = self._keep_scratch(job, out_files[i:])
+                returncode = 1
+                error = f"copy to destination failed : {e} ; encoded output kept in {', '.join(kept)}"
+                logging.error(f"{error} ({out_file})")
+                break
+        self._finish(job, returncode, error)
+
+    def _keep_scratch(self, job: Job, out_files: List[str]) -> List[str]:
+        """Conserve les sorties encodées non copiées, renommées sous leur nom final dans le dossier
+        de travail (laissées sous leur nom temporaire si ce nom est déjà pris), et retourne leurs chemins."""
+        kept = []
+        for out_file in out_files:
+            part = job.part_path(out_file)
+            kept_file = os.path.join(self.scratch_dir, os.path.basename(out_file))
+            if os.path.exists(kept_file):
+                kept_file = part
+            else:
+                try:
+                    os.replace(part, kept_file)
+                except OSError:
+                    kept_file = part
+            kept.append(kept_file)
+        return kept
+
+    def _release_slot(self, job: Job) -> None:
+        """Rend l'emplacement CPU du job (FFmpeg terminé)."""
+        with self._cond:
+            if job.slot_held:
+                job.slot_held = False
+                self._free_slots.append(job.placement)
+                self._cond.notify_all()
+
+    def _finish(self, job: Job, returncode: int, error: Optional[str] = None) -> None:
+        """Fixe l'état final d'un job et prévient l'ordonnanceur.
+
+        La sortie, écrite sous un nom temporaire, n'est renommée sur son nom final qu'en cas
+        de succès : un fichier final présent est toujours complet. Avec un dossier de travail,
+        le job passe d'abord par l'état copying le temps de la copie vers la destination.
+        """
+        self._release_slot(job)
+        if job.encoded_at is None and job.started_at is not None:
+            job.encoded_at = time.monotonic()
+        if returncode == 0 and job.state == STATE_RUNNING:
+            missing = [o for _, o in job.outputs if not os.path.exists(job.part_path(o))]
+            if missing:
+                returncode, error = 1, "missing output : " + ", ".join(missing)
+            elif self.scratch_dir:
+                with self._cond:
+                    job.state = STATE_COPYING
+                    job.percent = 100.0
+                    job.out_time = job.duration or job.out_time
+                    job.wall_time = time.monotonic() - job.started_at
+                    self._cond.notify_all()
+                if self.on_progress:
+                    self.on_progress(job, self)
+                self._copy_pool.submit(self._copy_outputs, job)
+                return
+            else:
+                for _, out_file in job.outputs:
+                    try:
+                        os.replace(job.part_path(out_file), out_file)
+                    except OSError as e:
+                        returncode, error = 1, str(e)
+        if (returncode != 0 or job.state != STATE_RUNNING) and job.state != STATE_COPYING:
+            # Après la copie (réussie ou non), _copy_outputs a déjà traité les fichiers de travail
+            for _, out_file in job.outputs:
+                try:
+                    os.unlink(job.part_path(out_file))
+                except OSError:
+                    pass
+        job.returncode = returncode
+        with self._cond:
+            if job.state in (STATE_RUNNING, STATE_COPYING):
+                if returncode == 0:
+                    job.state = STATE_DONE
+                    job.percent = 100.0
+                    job.out_time = job.duration or job.out_time
+                    if job.wall_time is None:
+                        job.wall_time = time.monotonic() - job.started_at
+                else:
+                    job.state = STATE_FAILED
+                    job.error = error
+            job.finished_at = time.monotonic()
+            self._finalizing += 1
+            self._cond.notify_all()
+
+        try:
+            job.journal(job.state)
+            if job.state == STATE_DONE:
+                self._record(job)
+            if self.metrics is not None:
+                self.metrics.job_end(job)
+
+            errors = [line for line in job.stderr_tail if "error" in line.lower()]
+            if job.state == STATE_FAILED and not errors:
+                errors = list(job.stderr_tail)[-10:]
+            if errors:
+                logging.error("Errors FFmpeg :\n" + "\n".join(errors))
+            if self.on_job_end:
+                self.on_job_end(job, self)
+        finally:
+            with self._cond:
+                self._finalizing -= 1
+                self._cond.notify_all()
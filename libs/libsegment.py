@@ -0,0 +1,201 @@
+import concurrent.futures
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import deque
+from typing import Callable, List, Optional
+import libs.libffmpeg as libffmpeg
+import libs.libprobe as libprobe
+import libs.libprogress as libprogress
+
+# Encodage segmenté : le fichier source est découpé sans ré-encodage aux images clés,
+# chaque segment vidéo est encodé par un FFmpeg séparé, puis les segments sont
+# concaténés sans perte. L'audio est encodé une seule fois sur toute la durée, ce qui
+# évite les décalages A/V dus aux silences d'amorce AAC en début de chaque segment.
+
+# Durée minimale d'un fichier pour activer l'encodage segmenté (secondes)
+MIN_SEGMENTED_DURATION = 300
+# Durée minimale d'un segment (secondes)
+MIN_SEGMENT_SECONDS = 30
+# Segments par worker : plus de segments que de workers équilibre la charge
+SEGMENTS_PER_WORKER = 2
+
+class SegmentCanceled(Exception):
+    pass
+
+def is_segmentable(mode: str) -> bool:
+    """Seuls les modes encodés par libx264/libx265 (CPU, preset lent) bénéficient du découpage."""
+    try:
+        cmd = libffmpeg.build_ffmpeg_command("in", mode, "out")
+    except ValueError:
+        return False
+    return "libx264" in cmd or "libx265" in cmd
+
+def choose_boundaries(keyframes: List[float], duration: float, segments: int,
+                      min_len: float = MIN_SEGMENT_SECONDS) -> List[float]:
+    """Choisit les points de coupe parmi les images clés, au plus près d'un découpage régulier."""
+    cuts = []
+    previous = 0.0
+    for i in range(1, segments):
+        target = duration * i / segments
+        candidates = [k for k in keyframes if k >= previous + min_len and k <= duration - min_len]
+        if not candidates:
+            break
+        best = min(candidates, key=lambda k: abs(k - target))
+        if best <= previous:
+            continue
+        cuts.append(best)
+        previous = best
+    return cuts
+
+def plan_segments(file_path: str, workers: int) -> List[float]:
+    """Retourne les points de coupe pour un fichier, ou [] si le découpage n'est pas utile."""
+    if workers < 2:
+        return []
+    duration = libffmpeg.get_duration(file_path)
+    if not duration or duration < MIN_SEGMENTED_DURATION:
+        return []
+    segments = min(workers * SEGMENTS_PER_WORKER, int(duration // MIN_SEGMENT_SECONDS))
+    if segments < 2:
+        return []
+    # Seuls les points de coupe sont conservés dans le cache de sondage, pas les images clés
+    key = f"cuts:{segments}:{MIN_SEGMENT_SECONDS}"
+    cuts = libprobe.get_value(file_path, key)
+    if cuts is not None:
+        return cuts
+    keyframes = libprobe.get_keyframes(file_path)
+    if not keyframes:
+        return []
+    cuts = choose_boundaries(keyframes, duration, segments)
+    libprobe.set_value(file_path, key, cuts)
+    return cuts
+
+def _run(cmd: List[str], stop: threading.Event, processes: list, lock: threading.Lock,
+         on_out_time: Optional[Callable] = None, on_start: Optional[Callable] = None) -> None:
+    """Exécute une commande FFmpeg ; lève une erreur en cas d'échec ou d'arrêt."""
+    if stop.is_set():
+        raise SegmentCanceled()
+    logging.debug(f"Command FFmpeg : {' '.join(cmd)}")
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL, text=True,
+                               start_new_session=True)
+    with lock:
+        processes.append(process)
+        if stop.is_set():
+            process.terminate()
+    if on_start:
+        on_start(process)
+    tail = deque(maxlen=20)
+    reader = threading.Thread(target=lambda: tail.extend(line.rstrip() for line in process.stderr), daemon=True)
+    reader.start()
+
+    parser = libprogress.ProgressParser()
+    for line in process.stdout:
+        snapshot = parser.feed(line)
+        if snapshot and snapshot["out_time"] is not None and on_out_time:
+            on_out_time(snapshot["out_time"])
+    returncode = process.wait()
+    reader.join()
+    with lock:
+        processes.remove(process)
+    if stop.is_set():
+        raise SegmentCanceled()
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg exit code {returncode} : " + " | ".join(tail))
+
+def encode_segmented(file_path: str, mode: str, out_file: str, cuts: List[float], workers: int,
+                     num_threads: int, cancel_event: threading.Event,
+                     on_progress: Optional[Callable] = None, processes: Optional[list] = None,
+                     on_start: Optional[Callable] = None) -> None:
+    """Encode un fichier en segments parallèles.
+
+    on_progress(out_time) reçoit la durée vidéo déjà encodée (somme des segments).
+    processes : liste tenue à jour des FFmpeg en cours ; on_start(process) est appelé à
+    chaque lancement (pause et priorité du job, voir libsched).
+    Lève SegmentCanceled si cancel_event est positionné, RuntimeError en cas d'échec.
+    Les fichiers temporaires sont toujours supprimés.
+    """
+    info = libprobe.probe(file_path) or {}
+    chunk_threads = max(1, (num_threads or os.cpu_count() or 1) // workers)
+    video_args, audio_args, mux_args = libffmpeg.split_encode_args(
+        libffmpeg.build_ffmpeg_command(file_path, mode, out_file, chunk_threads))
+
+    processes = processes if processes is not None else []
+    lock = threading.Lock()
+    stop = threading.Event()
+    finished = threading.Event()
+
+    def abort():
+        stop.set()
+        with lock:
+            for process in processes:
+                process.terminate()
+
+    def watch_cancel():
+        while not finished.is_set():
+            if cancel_event.wait(0.2):
+                abort()
+                return
+    threading.Thread(target=watch_cancel, daemon=True).start()
+
+    tmp_dir = tempfile.mkdtemp(prefix=".dvtool-seg-", dir=os.path.dirname(os.path.abspath(out_file)))
+    try:
+        # 1. Découpage sans ré-encodage aux images clés choisies (le muxer segment coupe
+        #    à la première image clé après chaque instant : on vise juste avant)
+        _run(["ffmpeg", "-hide_banner", "-y", "-i", file_path, "-map", "0:v:0", "-c", "copy",
+              "-f", "segment", "-segment_times", ",".join(f"{max(0.0, c - 0.001):.6f}" for c in cuts),
+              "-reset_timestamps", "1", os.path.join(tmp_dir, "src%04d.mkv")],
+             stop, processes, lock, on_start=on_start)
+        sources = sorted(f for f in os.listdir(tmp_dir) if f.startswith("src"))
+
+        # 2. Encodage des segments vidéo et de l'audio en parallèle
+        done = {}
+        def chunk_progress(index):
+            def update(out_time):
+                with lock:
+                    done[index] = out_time
+                    total = sum(done.values())
+                if on_progress:
+                    on_progress(total)
+            return update
+
+        encoded = [os.path.join(tmp_dir, f"enc{i:04d}.mkv") for i in range(len(sources))]
+        audio_file = os.path.join(tmp_dir, "audio.mka") if info.get("audio_codec") else None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            if audio_file:
+                futures.append(pool.submit(_run, ["ffmpeg", "-hide_banner", "-y", "-i", file_path, "-map", "0:a:0",
+                                                  "-vn"] + audio_args + [audio_file], stop, processes, lock,
+                                           None, on_start))
+            for i, source in enumerate(sources):
+                cmd = (["ffmpeg", "-hide_banner"] + libprogress.PROGRESS_ARGS + ["-y", "-i", os.path.join(tmp_dir, source)]
+                       + video_args + ["-an", encoded[i]])
+                futures.append(pool.submit(_run, cmd, stop, processes, lock, chunk_progress(i), on_start))
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except BaseException:
+                abort()
+                raise
+
+        # 3. Concaténation sans perte et multiplexage avec l'audio
+        list_file = os.path.join(tmp_dir, "concat.txt")
+        with open(list_file, "w") as f:
+            for path in encoded:
+                escaped = path.replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        cmd = ["ffmpeg", "-hide_banner", "-y", "-f", "concat", "-safe", "0", "-i", list_file]
+        if audio_file:
+            cmd += ["-i", audio_file, "-map", "0:v:0", "-map", "1:a:0"]
+        cmd += ["-c", "copy"] + mux_args + [out_file]
+        _run(cmd, stop, processes, lock, on_start=on_start)
+    except RuntimeError:
+        if cancel_event.is_set():
+            raise SegmentCanceled()
+        raise
+    finally:
+        finished.set()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,91 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from typing import Any, Optional
+import libs.libpaths as libpaths
+
+# Paramètres de l'interface (derniers dossiers, mode, threads, jobs...) : chargés une fois
+# en mémoire, réécrits de façon atomique (fichier temporaire puis renommage) dans
+# ~/.config/dvtool/settings.json, au plus une fois par DEBOUNCE_SECONDS.
+
+SETTINGS_FILE_NAME = "settings.json"
+# Délai de regroupement des écritures (secondes)
+DEBOUNCE_SECONDS = 0.5
+# Ancien fichier partagé, repris une fois s'il appartient à l'utilisateur
+LEGACY_FILE = "/tmp/dvtool.json"
+
+_lock = threading.RLock()
+_settings: Optional[dict] = None
+_timer: Optional[threading.Timer] = None
+
+def settings_file() -> str:
+    return os.path.join(libpaths.config_dir(), SETTINGS_FILE_NAME)
+
+def _read(filename: str) -> dict:
+    try:
+        with open(filename, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _load() -> dict:
+    """Charge les paramètres au premier accès (appelé avec _lock)."""
+    global _settings
+    if _settings is None:
+        filename = settings_file()
+        if os.path.exists(filename):
+            _settings = _read(filename)
+        else:
+            _settings = _migrate_legacy()
+            if _settings:
+                _schedule_flush()
+    return _settings
+
+def _migrate_legacy() -> dict:
+    """Reprend /tmp/dvtool.json s'il a été écrit par cet utilisateur (fichier partagé sinon)."""
+    try:
+        if os.stat(LEGACY_FILE).st_uid != os.getuid():
+            return {}
+    except OSError:
+        return {}
+    logging.debug(f"Settings migrated from {LEGACY_FILE}")
+    return _read(LEGACY_FILE)
+
+def load(key: str, default: Any = None) -> Any:
+    with _lock:
+        return _load().get(key, default)
+
+def save(key: str, value: Any) -> None:
+    """Modifie un paramètre ; l'écriture sur disque est regroupée avec les suivantes."""
+    with _lock:
+        settings = _load()
+        if key in settings and settings[key] == value:
+            return
+        settings[key] = value
+        _schedule_flush()
+
+def _schedule_flush() -> None:
+    global _timer
+    with _lock:
+        if _timer is None:
+            _timer = threading.Timer(DEBOUNCE_SECONDS, flush)
+            _timer.daemon = True
+            _timer.start()
+
+def flush() -> None:
+    """Écrit les paramètres immédiatement (si une écriture est en attente)."""
+    global _timer
+    with _lock:
+        if _timer is None:
+            return
+        _timer.cancel()
+        _timer = None
+        try:
+            libpaths.atomic_write_json(settings_file(), _settings)
+        except OSError as e:
+            logging.warning(f"Unable to write settings : {e}")
+
+atexit.register(flush)
@@ -0,0 +1,125 @@
+import os
+import shutil
+from typing import List, Optional
+import libs.libffmpeg as libffmpeg
+import libs.libprobe as libprobe
+
+# Estimation de la taille des fichiers produits et contrôle de l'espace disque avant un lot.
+
+# Débit vidéo par pixel et par image (bits) pour les encodeurs à qualité constante,
+# d'après les débits cibles publiés (ProRes 1080p29.97 : Proxy 45, LT 102, 422 147, HQ 220 Mbit/s)
+PRORES_BITS_PER_PIXEL = {"0": 0.72, "1": 1.64, "2": 2.36, "3": 3.54}
+DNXHR_BITS_PER_PIXEL = {"dnxhr_lb": 0.72, "dnxhr_sq": 2.3, "dnxhr_hq": 3.5, "dnxhr_hqx": 3.5, "dnxhr_444": 7.0}
+CODEC_BITS_PER_PIXEL = {"mjpeg": 3.0, "h264": 0.12, "hevc": 0.07}
+# Marge appliquée à l'estimation (débits variables, conteneur)
+SIZE_MARGIN = 1.15
+# Espace à laisser libre sur la destination (octets)
+MIN_FREE_BYTES = 1024 ** 3
+
+def _parse_rate(value: Optional[str]) -> Optional[float]:
+    """Convertit un débit FFmpeg ("440M", "192k") en bits/s."""
+    if not value:
+        return None
+    factors = {"k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9}
+    try:
+        if value[-1] in factors:
+            return float(value[:-1]) * factors[value[-1]]
+        return float(value)
+    except ValueError:
+        return None
+
+def estimate_output_size(file_path: str, mode: str, strategy: str = libffmpeg.STRATEGY_ENCODE) -> Optional[int]:
+    """Taille estimée (octets) de la sortie d'un mode pour un fichier, ou None si la durée est inconnue."""
+    info = libprobe.probe(file_path)
+    if not info or not info["duration"]:
+        return None
+    if strategy == libffmpeg.STRATEGY_SKIP:
+        return 0
+    if strategy in (libffmpeg.STRATEGY_REMUX, libffmpeg.STRATEGY_COPY_VIDEO):
+        try:
+            return int(os.path.getsize(file_path) * SIZE_MARGIN)
+        except OSError:
+            return None
+
+    video, audio, _ = libffmpeg.split_encode_args(libffmpeg.build_ffmpeg_command(file_path, mode, "out"))
+    target = libffmpeg.get_mode_target(mode) or {}
+    width = target.get("width") or info["width"] or 1920
+    height = target.get("height") or info["height"] or 1080
+    if target.get("rescale"):
+        width, height = width // 2, height // 2
+    fps = target.get("fps") or info["fps"] or 30.0
+
+    video_rate = _parse_rate(libffmpeg.option_value(video, ("-b:v",)))
+    if video_rate is None:
+        codec = target.get("codec")
+        profile = libffmpeg.option_value(video, ("-profile:v",))
+        if codec == "prores":
+            bpp = PRORES_BITS_PER_PIXEL.get(profile, PRORES_BITS_PER_PIXEL["3"])
+        elif codec == "dnxhd":
+            bpp = DNXHR_BITS_PER_PIXEL.get(profile, DNXHR_BITS_PER_PIXEL["dnxhr_hq"])
+        else:
+            bpp = CODEC_BITS_PER_PIXEL.get(codec, 1.0)
+        video_rate = bpp * width * height * fps
+
+    audio_codec = libffmpeg.option_value(audio, ("-c:a", "-acodec", "-codec:a"))
+    audio_rate = 0.0
+    if info["audio_codec"]:
+        if audio_codec and audio_codec.startswith("pcm_s16"):
+            audio_rate = 16 * (info["audio_sample_rate"] or 48000) * (info["audio_channels"] or 2)
+        else:
+            audio_rate = _parse_rate(libffmpeg.option_value(audio, ("-b:a",))) or 320e3
+    return int((video_rate + audio_rate) / 8 * info["duration"] * SIZE_MARGIN)
+
+def free_space(path: str) -> Optional[int]:
+    """Espace libre (octets) du système de fichiers contenant path (ou son premier parent existant)."""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return None
+
+def preflight(jobs: List, dest_dir: str, scratch_dir: Optional[str] = None, max_jobs: int = 1) -> dict:
+    """Compare l'espace nécessaire au lot à l'espace libre de la destination (et du dossier de travail).
+
+    jobs : objets Job de l'ordonnanceur (sorties et stratégie déjà choisies).
+    Retourne required, free, unknown (fichiers non estimés) et ok pour la destination,
+    ainsi que scratch_required/scratch_free : le dossier de travail doit contenir les
+    2 x max_jobs plus grosses sorties (jobs en cours et copies en attente).
+    """
+    sizes, unknown = [], 0
+    for job in jobs:
+        if job.is_finished():
+            continue
+        size = 0
+        for mode, _ in job.outputs:
+            estimate = estimate_output_size(job.file_path, mode, job.strategy)
+            if estimate is None:
+                unknown += 1
+                estimate = 0
+            size += estimate
+        sizes.append(size)
+    required = sum(sizes)
+    free = free_space(dest_dir)
+    result = {"required": required, "free": free, "unknown": unknown,
+              "ok": free is None or required + MIN_FREE_BYTES <= free,
+              "scratch_required": None, "scratch_free": None}
+    if scratch_dir:
+        scratch_required = sum(sorted(sizes, reverse=True)[:2 * max(1, max_jobs)])
+        scratch_free = free_space(scratch_dir)
+        result.update(scratch_required=scratch_required, scratch_free=scratch_free)
+        if scratch_free is not None and scratch_required + MIN_FREE_BYTES > scratch_free:
+            result["ok"] = False
+    return result
+
+def format_size(size: Optional[float]) -> str:
+    """Affiche une taille en Gio (ou Mio)."""
+    if size is None:
+        return "?"
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:.1f} GiB"
+    return f"{size / 1024 ** 2:.0f} MiB"
@@ -0,0 +1,30 @@
+import time
+from typing import List, Tuple
+
+# Mesure du démarrage de l'interface graphique (--profile-startup) : durée de chaque étape
+# jusqu'au premier affichage de la fenêtre, comparée à un objectif de démarrage à froid.
+
+# Objectif de démarrage (ms), du lancement de main() au premier affichage
+TARGET_MS = 500
+
+_started = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+
+def start() -> None:
+    """Remet le chronomètre à zéro (début de main())."""
+    global _started
+    _started = time.perf_counter()
+    _marks.clear()
+
+def mark(step: str) -> None:
+    """Enregistre la fin d'une étape du démarrage."""
+    _marks.append((step, time.perf_counter()))
+
+def report(target_ms: int = TARGET_MS) -> dict:
+    """Durée de chaque étape et durée totale (ms)."""
+    steps, previous = [], _started
+    for step, at in _marks:
+        steps.append({"step": step, "ms": round((at - previous) * 1000, 1)})
+        previous = at
+    total = round((previous - _started) * 1000, 1)
+    return {"steps": steps, "total_ms": total, "target_ms": target_ms, "ok": total <= target_ms}
@@ -1,110 +1,94 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import subprocess
 from typing import List, Optional
 import logging
 import os
-import json
-import re
+import concurrent.futures
 import threading
+import atexit
 import config.lang as customlang
-
-current_process = None
-
-def save_param(key, value, filename="/tmp/dvtool.json"):
-    """Sauvegarde un paramètre dans un fichier JSON sous /tmp"""
-    params = {}
-
-    # Charger le fichier existant si présent
-    if os.path.exists(filename):
-        with open(filename, "r") as f:
-            try:
-                params = json.load(f)
-            except json.JSONDecodeError:
-                params = {}
-
-    # Mettre à jour le paramètre
-    params[key] = value
-
-    # Sauvegarder
-    with open(filename, "w") as f:
-        json.dump(params, f, indent=2)
-
-def load_param(key, filename="/tmp/dvtool.json", default=None):
-    """Charge un paramètre depuis le fichier JSON sous /tmp"""
-    if not os.path.exists(filename):
-        return default
-    
-    with open(filename, "r") as f:
-        try:
-            params = json.load(f)
-        except json.JSONDecodeError:
-            return default
-
-    return params.get(key, default)       
+import libs.libsched as libsched
+import libs.libsettings as libsettings
+import libs.libffmpeg as libffmpeg
+import libs.libprogress as libprogress
+import libs.libcaps as libcaps
+import libs.libchannel as libchannel
+import libs.libcontrol as libcontrol
+import libs.libjournal as libjournal
+import libs.libprobe as libprobe
+import libs.libqueue as libqueue
+import libs.libscan as libscan
+import libs.liblog as liblog
+import libs.libspace as libspace
+import libs.libtune as libtune
+
+current_batch = None
+# Fichier affiché à chaque ligne de la liste des jobs : les actions visent le fichier affiché
+job_rows = []
+# Import de dossier en cours (un seul à la fois)
+current_scan = None
+# Priorité basse des FFmpeg (case de l'onglet Traitement), appliquée aussi aux lots suivants
+low_priority = False
+# Reprise acceptée au démarrage : le prochain lot ignore les fichiers déjà convertis (journal)
+resume_requested = False
+
+# Sondage ffprobe en arrière-plan lors de l'ajout de fichiers
+DEFAULT_PROBE_WORKERS = 4
+probe_pool = None
+probe_pool_size = 0
+
+def save_param(key, value):
+    """Sauvegarde un paramètre (en mémoire, écrit sur disque en différé, voir libsettings)."""
+    libsettings.save(key, value)
+
+def load_param(key, default=None):
+    """Charge un paramètre depuis les paramètres en mémoire."""
+    return libsettings.load(key, default)
 
 def setup_logging():
-    """Configure le logging pour l'application."""
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler("debug.log"),  # Écrit les logs dans un fichier
-            logging.StreamHandler()           # Affiche les logs dans la console
-        ]
-    )
+    """Configure le logging pour l'application (fichier tournant, console, onglet Debug)."""
+    liblog.setup_logging(get_log_max_lines())
+
+def get_log_max_lines() -> int:
+    """Nombre de lignes conservées dans l'onglet Debug (paramètre enregistré)."""
+    try:
+        return max(100, int(load_param("log_max_lines", default=liblog.DEFAULT_MAX_LINES)))
+    except (TypeError, ValueError):
+        return liblog.DEFAULT_MAX_LINES
 
 setup_logging()
 
 def check_ffmpeg() -> bool:
-    """Vérifie si ffmpeg et ffprobe sont installés."""
-    try:
-        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        subprocess.run(["ffprobe", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    """Vérifie si ffmpeg et ffprobe sont installés (PATH seulement ; voir start_background_checks)."""
+    if libffmpeg.ffmpeg_installed():
         return True
-    except FileNotFoundError:
-        messagebox.showerror(customlang.get("error_label"), customlang.get("error_ffmpeg"))
-        return False
+    messagebox.showerror(customlang.get("error_label"), customlang.get("error_ffmpeg"))
+    return False
+
+def start_background_checks(conversion_option: tk.StringVar) -> threading.Thread:
+    """Vérifie ffmpeg/ffprobe et relève les encodeurs disponibles sans retarder l'affichage.
+
+    Les binaires sont lancés en arrière-plan ; une erreur est affichée depuis la boucle Tk,
+    et le mode sélectionné est remplacé s'il n'est pas disponible.
+    """
+    def run():
+        if not libffmpeg.ffmpeg_available():
+            libchannel.channel.post_event(messagebox.showerror, customlang.get("error_label"), customlang.get("error_ffmpeg"))
+            return
+        libcaps.get_capabilities()
+        libchannel.channel.post_event(ensure_mode_available, conversion_option)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+def ensure_mode_available(conversion_option: tk.StringVar) -> None:
+    """Remplace le mode sélectionné par le premier mode disponible si son encodeur manque."""
+    if libffmpeg.mode_available(conversion_option.get()):
+        return
+    available = [mode for mode in libffmpeg.MODE_ALIASES.values() if libffmpeg.mode_available(mode)]
+    if available:
+        conversion_option.set(available[0])
 
-def get_video_codec(filename: str) -> Optional[str]:
-    """Récupère le codec vidéo d'un fichier."""
-    try:
-        result = subprocess.run(
-            ["ffprobe", "-v", "error", "-select_streams", "v:0",
-             "-show_entries", "stream=codec_name", "-of", "default=noprint_wrappers=1:nokey=1", filename],
-            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
-        )
-        return result.stdout.strip().lower()
-    except Exception:
-        return None
-    
-# def check_cuda() -> bool:
-#     """Vérifie si CUDA et NVENC sont disponibles et fonctionnels."""
-#     try:
-#         result = subprocess.run(
-#             ["ffmpeg", "-hide_banner", "-f", "lavfi", "-i", "testsrc=size=160x160:rate=1", "-c:v", "h264_nvenc",
-#              "-f", "null", "-"],
-#             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10
-#         )
-#         # return True
-#         return result.returncode == 0
-#     except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-#         return False
-
-def check_cuda() -> bool:
-    """Vérifie si CUDA et NVENC sont disponibles et fonctionnels."""
-    try:
-        result = subprocess.run(
-            ["nvcc", "--version"],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-            text=True, check=True
-        )
-        # return "cuda" in result.stdout.lower()
-        # Fonction désactivée pour le moment. Elle retourne toujours False
-        return False
-    except (FileNotFoundError, subprocess.CalledProcessError):
-        return False
-  
 # def detect_and_convert_h264_h265(input_files: tk.Variable, files_list: tk.Listbox, conversion_option: tk.StringVar) -> None:
 #     """Détecte les fichiers H.264/H.265 et propose une conversion automatique."""
 #     files = input_files.get()
@@ -137,7 +121,7 @@ def check_cuda() -> bool:
 #                 index = files_list.size() - 1
 #                 files_list.itemconfig(index, {'fg': 'red'})
 
-def select_files(input_files: tk.Variable, files_list: tk.Listbox) -> None:
+def select_files(file_queue: libqueue.QueueView) -> None:
     """Ouvre une boîte de dialogue pour sélectionner des fichiers vidéo et les ajoute à la liste existante."""
     file_paths = filedialog.askopenfilenames(
         title=customlang.get("title_selection_file"),
@@ -146,21 +130,105 @@ def select_files(input_files: tk.Variable, files_list: tk.Listbox) -> None:
     )
     if file_paths:
         save_param("last_dir", os.path.dirname(file_paths[0]))
-        
-        # Récupère les fichiers déjà présents
-        current_files = list(input_files.get())
-        
-        # Ajoute seulement les nouveaux fichiers (évite doublons)
-        for f in file_paths:
-            if f not in current_files:
-                current_files.append(f)
-                files_list.insert(tk.END, f)
-                codec = get_video_codec(f)
-                if codec in ["h264", "hevc"]:
-                    index = files_list.size() - 1
-                    files_list.itemconfig(index, {'fg': 'red'})
-        
-        input_files.set(current_files)
+
+        # Ajoute seulement les nouveaux fichiers (la file évite les doublons)
+        for f in file_queue.add(file_paths):
+            probe_async(f, file_queue)
+
+def select_folder(file_queue: libqueue.QueueView, scan_extensions: tk.StringVar, scan_label: tk.Label) -> None:
+    """Ajoute récursivement les vidéos d'un dossier (parcours et sondage en arrière-plan).
+
+    Les fichiers retenus arrivent dans la file au fil du parcours ; les compteurs sont
+    affichés à côté des filtres.
+    """
+    global current_scan
+    dir_path = filedialog.askdirectory(
+        title=customlang.get("title_select_folder"),
+        initialdir=os.path.expanduser(load_param("last_dir", default="~"))
+    )
+    if not dir_path:
+        return
+    save_param("last_dir", dir_path)
+    if current_scan is not None:
+        current_scan.stop()
+
+    found = []
+    lock = threading.Lock()
+
+    def add_found():
+        with lock:
+            paths = found[:]
+            found.clear()
+        for f in file_queue.add(paths):
+            probe_async(f, file_queue)
+
+    def show_counts(counts, done=False):
+        if current_scan is not scan:
+            return  # Parcours remplacé par un autre
+        text = customlang.get("label_scan_progress").format(**counts)
+        scan_label.config(text=text if done else f"{text}...")
+
+    # Appelés depuis les threads de parcours : tout passe par le canal UI
+    def on_found(path):
+        with lock:
+            found.append(path)
+        libchannel.channel.post("scan_found", add_found)
+
+    def on_done(counts):
+        libchannel.channel.post_event(add_found)
+        libchannel.channel.post_event(show_counts, counts, True)
+
+    codec_key = load_param("scan_codecs", default="all")
+    scan = libscan.FolderScan(
+        dir_path, libscan.parse_extensions(scan_extensions.get()), libscan.CODEC_FILTERS.get(codec_key),
+        workers=max(1, int(load_param("probe_workers", default=DEFAULT_PROBE_WORKERS))),
+        on_found=on_found, on_progress=lambda counts: libchannel.channel.post("scan_progress", show_counts, counts),
+        on_done=on_done)
+    current_scan = scan
+    scan.start()
+
+def get_probe_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Retourne le pool de sondage ffprobe (recréé si le nombre de workers a changé)."""
+    global probe_pool, probe_pool_size
+    workers = max(1, int(load_param("probe_workers", default=DEFAULT_PROBE_WORKERS)))
+    if probe_pool is None or workers != probe_pool_size:
+        if probe_pool is not None:
+            probe_pool.shutdown(wait=False)
+        probe_pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe")
+        probe_pool_size = workers
+    return probe_pool
+
+def probe_async(file_path: str, file_queue: libqueue.QueueView) -> None:
+    """Sonde un fichier en arrière-plan ; le résultat est appliqué à la file par le thread Tk
+    (codec, durée, résolution, taille ; les fichiers H.264/H.265 sont marqués en rouge)."""
+    def job():
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = None
+        libchannel.channel.post_event(file_queue.set_info, file_path, libprobe.probe(file_path), size)
+    get_probe_pool().submit(job)
+
+def offer_resume(file_queue: libqueue.QueueView, output_dir: tk.StringVar,
+                 conversion_option: tk.StringVar) -> None:
+    """Propose de recharger le dernier lot interrompu (les fichiers déjà convertis seront ignorés)."""
+    global resume_requested
+    batch = libjournal.unfinished_batch()
+    if batch is None:
+        return
+    files = [f for f in batch["files"] if os.path.isfile(f)]
+    if not files:
+        return
+    if not messagebox.askyesno(customlang.get("resume_title"), f"{customlang.get('resume_question')} ({len(files)})"):
+        libjournal.finish_batch()
+        return
+    file_queue.clear()
+    for f in file_queue.add(files):
+        probe_async(f, file_queue)
+    resume_requested = True
+    output_dir.set(batch["dest_dir"])
+    if libffmpeg.mode_available(batch["mode"]):
+        conversion_option.set(batch["mode"])
 
 def select_output_dir(output_dir: tk.StringVar) -> None:
     """Ouvre une boîte de dialogue pour sélectionner le répertoire de destination."""
@@ -176,37 +244,18 @@ def select_output_dir(output_dir: tk.StringVar) -> None:
         output_dir.set(dir_path)
         save_param("dest_dir",dir_path)
 
-def remove_selected(input_files: tk.Variable, files_list: tk.Listbox) -> None:
-    """Supprime le fichier sélectionné de la liste."""
-    sel = files_list.curselection()
-    if not sel:
-        return
-    idx = sel[0]
-    current = list(input_files.get())
-    if 0 <= idx < len(current):
-        del current[idx]
-        input_files.set(current)
-    files_list.delete(idx)
-
-def clear_all(input_files: tk.Variable, files_list: tk.Listbox) -> None:
+def remove_selected(file_queue: libqueue.QueueView) -> None:
+    """Supprime les fichiers sélectionnés de la liste."""
+    file_queue.remove_selected()
+
+def clear_all(file_queue: libqueue.QueueView) -> None:
     """Efface tous les fichiers de la liste."""
-    if not files_list.size():
+    global resume_requested
+    if not len(file_queue):
         return
     if messagebox.askyesno("Confirmation", customlang.get("confirmation_remove_label")):
-        input_files.set([])
-        files_list.delete(0, tk.END)
-
-def get_duration(filename: str) -> Optional[float]:
-    """Récupère la durée de la vidéo en secondes avec ffprobe."""
-    try:
-        result = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-             "-of", "default=noprint_wrappers=1:nokey=1", filename],
-            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
-        )
-        return float(result.stdout.strip())
-    except Exception:
-        return None
+        file_queue.clear()
+        resume_requested = False
 
 def set_ui_state(state: str, convert_button: tk.Button, cancel_button: tk.Button,
                  select_button: tk.Button, remove_button: tk.Button,
@@ -229,161 +278,175 @@ def set_ui_state(state: str, convert_button: tk.Button, cancel_button: tk.Button
         output_button.config(state=tk.NORMAL)
         close_button.config(state=tk.NORMAL)
 
-def build_ffmpeg_command(file_path: str, mode: str, out_file: str, num_threads: int = 0, cuda_available: bool = False) -> List[str]:
-    """Construit la commande FFmpeg avec support multi-cœurs et options pour Davinci Resolve."""
-    base_cmd = ["ffmpeg", "-i", file_path, "-y"]
-    cuda_available = check_cuda()
-
-    if any(codec in mode for codec in ["libx264", "libx265", "prores_ks"]):
-        if num_threads > 0:
-            base_cmd.extend(["-threads", str(num_threads)])
-
-    # --- OPTIONS POUR DAVINCI RESOLVE (ENTRÉE) ---
-    if mode == "H.264/H.265 → ProRes 422 HQ (Davinci Resolve)":
-        return base_cmd + [
-            "-c:v", "prores_ks", "-profile:v", "3", "-qscale:v", "11",
-            "-vendor", "ap10", "-pix_fmt", "yuv422p10le",
-            "-acodec", "pcm_s16le", out_file
-        ]
-    elif mode == "H.264/H.265 → DNxHR HQX (Davinci Resolve)":
-        return base_cmd + [
-            "-c:v", "dnxhd", "-vf", "scale=3840:2160,fps=60,format=yuv422p10le",
-            "-b:v", "440M", "-profile:v", "dnxhr_hqx",
-            "-pix_fmt", "yuv422p10le", "-acodec", "pcm_s16le", out_file
-        ]
-    elif mode == "H.264/H.265 → MJPEG (Davinci Resolve)":
-        return base_cmd + [
-            "-c:v", "mjpeg", "-q:v", "2", "-pix_fmt", "yuvj422p",
-            "-acodec", "pcm_s16le", out_file
-        ]
-
-    # --- OPTIONS POUR SORTIE DE DAVINCI RESOLVE (ProRes/DNxHD → H.264/H.265) ---
-    elif mode == "ProRes/DNxHR → H.264 (Web)":
-        if cuda_available:
-            return [
-                "ffmpeg", "-hide_banner", "-y",
-                "-hwaccel", "cuda", "-hwaccel_device", "0",
-                "-i", file_path,
-                "-vf", "format=yuv420p",  # conversion 10-bit → 8-bit
-                "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "5.1",
-                "-rc", "vbr", "-cq", "18",
-                "-c:a", "aac", "-b:a", "192k", "-ar", "48000",
-                "-movflags", "+faststart", out_file
-            ]
-        else:
-            return base_cmd + [
-                "-c:v", "libx264", "-preset", "slow", "-crf", "18",
-                "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
-                "-c:a", "aac", "-b:a", "192k", "-ar", "48000",
-                "-movflags", "+faststart", out_file
-            ]
-    elif mode == "ProRes/DNxHR → H.264 (YouTube)":
-        if cuda_available:
-            return [
-            "ffmpeg", "-hide_banner", "-y",
-            "-hwaccel", "cuda", "-hwaccel_device", "0",
-            "-i", file_path,
-            "-vf", "format=yuv420p",  # conversion 10-bit → 8-bit
-            "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "5.1",
-            "-rc", "vbr", "-cq", "18",
-            "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
-            "-movflags", "+faststart", out_file
-        ]
-        else:
-            return base_cmd + [
-                "-c:v", "libx264", "-preset", "slow", "-crf", "18",
-                "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
-                "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
-                "-movflags", "+faststart", out_file
-            ]
- 
-    elif mode == "ProRes/DNxHR → H.265 (Web/YouTube)":
-        return base_cmd + [
-            "-c:v", "libx265", "-preset", "slow", "-crf", "22",
-            "-pix_fmt", "yuv420p", "-tag:v", "hvc1",
-            "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
-            "-movflags", "+faststart", out_file
-        ]
-    
-    # --- AUTRES OPTIONS ---
-#     elif mode == "H.264 → MJPEG":
-#         return base_cmd + [
-#             "-hwaccel", "cuda" if cuda_available else "none", "-hwaccel_device", "0" if cuda_available else "none",
-#             "-vcodec", "mjpeg", "-q:v", "2",
-#             "-acodec", "pcm_s16be", "-q:a", "0", "-f", "mov", out_file
-#         ]
-#     elif mode == "MJPEG → H.264 (NVIDIA QP)" and cuda_available:
-#         return base_cmd + [
-#             "-hwaccel", "cuda", "-hwaccel_device", "0",
-#             "-vf", "yadif", "-codec:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
-#             "-pix_fmt", "yuv420p", "-rc", "vbr", "-cq", "18",
-#             "-codec:a", "aac", "-b:a", "384k", "-ar", "48000",
-#             "-movflags", "faststart", out_file
-#         ]
-#     elif mode == "MJPEG → H.264 (NVIDIA Bitrate)" and cuda_available:
-#         return base_cmd + [
-#             "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
-#             "-c:a", "copy", "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
-#             "-pix_fmt", "yuv420p", "-b:v", "10M", "-rc", "vbr",
-#             "-movflags", "faststart", out_file
-#         ]
-    elif mode == "MJPEG → H.264 (libx264 CPU)":
-        return base_cmd + [
-            "-vf", "yadif", "-codec:v", "libx264", "-preset", "slow", "-crf", "18",
-            "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
-            "-codec:a", "aac", "-b:a", "384k", "-ar", "48000",
-            "-movflags", "faststart", out_file
-        ]
-    elif mode == "MJPEG → H.265 (libx265 CPU)":
-        return base_cmd + [
-            "-vf", "yadif", "-c:v", "libx265", "-preset", "slow", "-crf", "22",
-            "-pix_fmt", "yuv420p", "-tag:v", "hvc1",
-            "-c:a", "aac", "-b:a", "384k", "-ar", "48000",
-            "-movflags", "faststart", out_file
-        ]
-    elif mode == "Optimisé YouTube (H.264 CPU libx264)":
-        return base_cmd + [
-            "-c:v", "libx264", "-preset", "slow", "-crf", "18",
-            "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
-            "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
-            "-movflags", "+faststart", out_file
-        ]
-#     elif mode == "Optimisé YouTube (H.264 NVIDIA QP)" and cuda_available:
-#         return base_cmd + [
-#             "-hwaccel", "cuda", "-hwaccel_device", "0",
-#             "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
-#             "-pix_fmt", "yuv420p", "-rc", "vbr", "-cq", "18",
-#             "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
-#             "-movflags", "+faststart", out_file
-#         ]
-#     elif mode == "Optimisé YouTube (H.264 NVIDIA Bitrate)" and cuda_available:
-#         return base_cmd + [
-#             "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
-#             "-c:v", "h264_nvenc", "-preset", "slow", "-profile:v", "high", "-level", "4.0",
-#             "-pix_fmt", "yuv420p", "-b:v", "20M", "-rc", "vbr",
-#             "-c:a", "aac", "-b:a", "320k", "-ar", "48000",
-#             "-movflags", "+faststart", out_file
-#         ]
-    else:
-        raise ValueError(f"{customlang.get("cuda_unknown")} : {mode}")
-    
+
 def cancel_conversion():
-    """Annule la conversion en cours."""
-    global current_process
-    logging.debug(f"Command FFmpeg : " + str(current_process.pid) + " canceled")  # Log de la commande FFmpeg
-    if current_process:
-        current_process.terminate()
-        current_process = None
-
-def convert(input_files: tk.Variable, conversion_option: tk.StringVar, output_dir: tk.StringVar,
-           progress_bar: ttk.Progressbar, progress_label: tk.Label, files_list: tk.Listbox,
-           root: tk.Tk, convert_button: tk.Button, cancel_button: tk.Button,
+    """Annule tout le lot en cours."""
+    global current_batch
+    if current_batch:
+        logging.debug("Batch canceled")
+        current_batch.cancel()
+
+def cancel_job(jobs_list: tk.Listbox) -> None:
+    """Annule uniquement le job sélectionné dans la liste des jobs."""
+    sel = jobs_list.curselection()
+    if not current_batch or not sel:
+        return
+    if sel[0] < len(job_rows):
+        current_batch.cancel_job(job_rows[sel[0]])
+
+def start_control_server() -> None:
+    """Ouvre le socket de contrôle (voir libcontrol) sur le lot en cours de l'interface."""
+    server = libcontrol.ControlServer(lambda: current_batch)
+    try:
+        server.start()
+    except OSError as e:
+        logging.warning(f"Control socket unavailable : {e}")
+        return
+    atexit.register(server.stop)
+
+def pause_conversion() -> None:
+    """Suspend le lot en cours : les FFmpeg gardent leur travail, aucun job n'est lancé."""
+    if current_batch:
+        logging.debug("Batch paused")
+        current_batch.pause()
+
+def resume_conversion() -> None:
+    """Reprend le lot suspendu."""
+    if current_batch:
+        logging.debug("Batch resumed")
+        current_batch.resume()
+
+def set_low_priority(low: bool) -> None:
+    """Baisse ou rétablit la priorité CPU/E-S du lot en cours et des suivants."""
+    global low_priority
+    low_priority = low
+    if current_batch:
+        current_batch.set_low_priority(low)
+
+def move_selected(jobs_list: tk.Listbox, offset: int) -> None:
+    """Avance (offset < 0) ou recule le job en attente sélectionné dans la file."""
+    sel = jobs_list.curselection()
+    if not current_batch or not sel or sel[0] >= len(job_rows):
+        return
+    job = current_batch.find_job(job_rows[sel[0]])
+    queued = current_batch.queued_jobs()
+    if job is None or job not in queued:
+        return
+    if current_batch.move_job(job.file_path, queued.index(job) + offset):
+        jobs_list.selection_clear(0, tk.END)
+        jobs_list.selection_set(current_batch.jobs.index(job))
+
+def job_row_text(job: libsched.Job) -> str:
+    text = f"{job.name} - {customlang.get('job_state_' + job.state)} - {job.percent:.1f}%"
+    if job.paused:
+        text += f" - {customlang.get('job_state_paused')}"
+    if job.strategy != libffmpeg.STRATEGY_ENCODE:
+        text += f" - {customlang.get('strategy_' + job.strategy)}"
+    if job.state == libsched.STATE_RUNNING and job.speed:
+        text += f" - {job.fps or 0:.1f} fps - {job.speed:.2f}x - {job.bitrate or 0:.0f} kbit/s"
+    placement = job.placement_info()
+    if job.state == libsched.STATE_RUNNING and placement:
+        text += f" - NUMA {placement['node']} CPU {placement['cpus']}"
+    return text
+
+def refresh_job_row(jobs_list: tk.Listbox, batch: libsched.BatchScheduler, job: libsched.Job) -> None:
+    """Affiche l'état et la progression d'un job du lot (thread Tk)."""
+    while jobs_list.size() < len(batch.jobs):
+        added = batch.jobs[jobs_list.size()]
+        jobs_list.insert(tk.END, job_row_text(added))
+        job_rows.append(added.file_path)
+    idx = batch.jobs.index(job)
+    text = job_row_text(job)
+    if jobs_list.get(idx) != text or job_rows[idx] != job.file_path:
+        selected = jobs_list.selection_includes(idx)
+        jobs_list.delete(idx)
+        jobs_list.insert(idx, text)
+        job_rows[idx] = job.file_path
+        if selected:
+            jobs_list.selection_set(idx)
+
+def refresh_job_rows(jobs_list: tk.Listbox, batch: libsched.BatchScheduler) -> None:
+    """Redessine toute la liste des jobs dans l'ordre de la file (après plan(), qui la trie)."""
+    for job in list(batch.jobs):
+        refresh_job_row(jobs_list, batch, job)
+
+def get_count(value_var: Optional[tk.StringVar], default: int = 0) -> Optional[int]:
+    """Valeur d'un champ numérique (threads, jobs ; 0 = auto), ou None si elle n'est pas un entier >= 0."""
+    if value_var is None:
+        return default
+    value = value_var.get().strip()
+    if not value:
+        return default
+    return int(value) if value.isdigit() else None
+
+def tune_text(mode: str) -> str:
+    """Résumé du réglage automatique enregistré pour un mode."""
+    tuning = libtune.get_tuning(mode)
+    if not tuning:
+        return f"{customlang.get('label_tune')} : {customlang.get('label_tune_none')}"
+    threads = tuning["threads"] or "auto"
+    return f"{customlang.get('label_tune')} : {tuning['jobs']} job(s) x {threads} thread(s) - {tuning['fps']:.0f} fps"
+
+def auto_tune(conversion_option: tk.StringVar, tune_label: tk.Label, tune_button: tk.Button) -> None:
+    """Lance la calibration du mode sélectionné en arrière-plan et affiche le réglage retenu."""
+    mode = conversion_option.get()
+    if not libffmpeg.mode_available(mode):
+        messagebox.showerror(customlang.get("error_label"), f"{customlang.get('mode_unavailable')}\n{mode}")
+        return
+    tune_button.config(state=tk.DISABLED)
+    tune_label.config(text=f"{customlang.get('label_tune')} : {customlang.get('label_tune_running')}")
+
+    def show(*args):
+        tune_button.config(state=tk.NORMAL)
+        tune_label.config(text=tune_text(mode))
+
+    def job():
+        try:
+            libtune.calibrate(mode)
+        except Exception as e:
+            logging.error(f"Auto-tune failed for {mode} : {e}")
+        libchannel.channel.post_event(show)
+    threading.Thread(target=job, daemon=True).start()
+
+def get_extra_modes(mode: str) -> List[str]:
+    """Modes des sorties supplémentaires cochées (hors mode principal et modes indisponibles)."""
+    return [m for m in load_param("extra_modes", default=[]) if m != mode and libffmpeg.mode_available(m)]
+
+def estimate_duration(file_queue: libqueue.QueueView, conversion_option: tk.StringVar, output_dir: tk.StringVar,
+                      estimate_label: tk.Label, num_jobs: Optional[tk.StringVar] = None) -> None:
+    """Affiche la durée prévue du lot d'après l'historique (calcul en arrière-plan)."""
+    files = file_queue.paths()
+    mode = conversion_option.get()
+    dest_dir = output_dir.get() or os.path.expanduser("~")
+    max_jobs = get_count(num_jobs, 1) or 0
+    fast_path = not load_param("force_encode", default=False)
+    extra_modes = get_extra_modes(mode)
+    resume = resume_requested
+    if not files:
+        estimate_label.config(text=f"{customlang.get('label_estimate')} : -")
+        return
+
+    def show(predicted):
+        if predicted is None:
+            estimate_label.config(text=f"{customlang.get('label_estimate')} : {customlang.get('label_no_history')}")
+        else:
+            estimate_label.config(text=f"{customlang.get('label_estimate')} : {libprogress.format_eta(predicted)}")
+
+    def job():
+        libchannel.channel.post_event(show, libsched.estimate_batch(files, mode, dest_dir, max_jobs, fast_path,
+                                                                    extra_modes, resume))
+    threading.Thread(target=job, daemon=True).start()
+
+def convert(file_queue: libqueue.QueueView, conversion_option: tk.StringVar, output_dir: tk.StringVar,
+           progress_bar: ttk.Progressbar, progress_label: tk.Label, root: tk.Tk, convert_button: tk.Button, cancel_button: tk.Button,
            select_button: tk.Button, remove_button: tk.Button, clear_button: tk.Button,
-           output_button: tk.Button, close_button: tk.Button, num_threads: tk.StringVar) -> None:
+           output_button: tk.Button, close_button: tk.Button, num_threads: tk.StringVar,
+           num_jobs: Optional[tk.StringVar] = None, jobs_list: Optional[tk.Listbox] = None,
+           estimate_label: Optional[tk.Label] = None) -> None:
     
-    global current_process
+    global current_batch, resume_requested
     
-    files = input_files.get()
+    files = file_queue.paths()
     mode = conversion_option.get()
     dest_dir = output_dir.get()
 
@@ -393,84 +456,104 @@ def convert(input_files: tk.Variable, conversion_option: tk.StringVar, output_di
     if not dest_dir:
         messagebox.showerror(customlang.get("error_label"), customlang.get("error_nodest"))
         return
+    if not libffmpeg.mode_available(mode):
+        messagebox.showerror(customlang.get("error_label"), f"{customlang.get('mode_unavailable')}\n{mode}")
+        return
+    max_jobs = get_count(num_jobs, 1)
+    threads = get_count(num_threads, 0)
+    if max_jobs is None or threads is None:
+        messagebox.showerror(customlang.get("error_label"), customlang.get("error_invalid_number"))
+        return
     
     progress_bar["value"] = 0
-    progress_label.config(text=customlang.get("conversion_inprogress"))
-
-    def start_batch():
-        set_ui_state("processing", convert_button, cancel_button, select_button, remove_button, clear_button, output_button, close_button)
-        for f in files:
-            process = run_ffmpeg(f, mode, dest_dir, progress_bar, progress_label, root, int(num_threads.get()))
-            if process is None:
-                break
-            process.wait()  # Attendre la fin de la conversion
-            if current_process is None:  # Si annulé
-                break
-        messagebox.showinfo(customlang.get("end_batch"), customlang.get("end_batch_notice"))
+    if jobs_list is not None:
+        jobs_list.delete(0, tk.END)
+        job_rows.clear()
+
+    save_param("jobs", max_jobs)
+    save_param("threads", threads)
+    if estimate_label is not None:
+        estimate_duration(file_queue, conversion_option, output_dir, estimate_label, num_jobs)
+
+    def show_progress(batch):
+        running = ", ".join(j.name for j in batch.running_jobs())
+        percent = batch.batch_percent()
+        speed = batch.batch_speed()
+        progress_bar["value"] = percent
+        progress_label.config(text=f"Conversion {mode}... ({running}) {percent:.1f}% - "
+                                   f"{speed or 0:.2f}x - ETA {libprogress.format_eta(batch.batch_eta())}")
+
+    def show_batch_end(batch):
+        global current_batch
+        failed = [j.name for j in batch.jobs if j.state == libsched.STATE_FAILED]
+        summary = "\n".join(f"{customlang.get('strategy_' + key)} : {count}"
+                            for key, count in batch.summary().items()
+                            if count and key not in (libsched.STATE_FAILED, libsched.STATE_CANCELED))
+        if failed:
+            messagebox.showwarning(customlang.get("end_batch"), f"{customlang.get('end_batch_failed')} :\n" + "\n".join(failed) + "\n\n" + summary)
+        else:
+            messagebox.showinfo(customlang.get("end_batch"), customlang.get("end_batch_notice") + "\n\n" + summary)
         progress_bar["value"] = 0
         progress_label.config(text=customlang.get("label_inwait"))
         set_ui_state("idle", convert_button, cancel_button, select_button, remove_button, clear_button, output_button, close_button)
-
-    threading.Thread(target=start_batch, daemon=True).start()
-
-def run_ffmpeg(file_path: str, mode: str, dest_dir: str, progress_bar: ttk.Progressbar,
-               progress_label: tk.Label, root: tk.Tk, num_threads: int) -> Optional[subprocess.Popen]:
-    
-    """Exécute FFmpeg et met à jour la progression. Retourne le processus."""
-
-    global current_process
-
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-
-    # Détermine l'extension de sortie en fonction du mode
-    if "ProRes" in mode and "Davinci Resolve" in mode:
-        out_file = os.path.join(dest_dir, f"{base_name}_ProRes_DV.mov")
-    elif "DNxHR" in mode and "Davinci Resolve" in mode:
-        out_file = os.path.join(dest_dir, f"{base_name}_DNxHR_DV.mov")
-    elif "MJPEG (Davinci Resolve)" in mode:
-        out_file = os.path.join(dest_dir, f"{base_name}_MJPEG_DV.mov")
-    elif mode == "H.264 → MJPEG":
-        out_file = os.path.join(dest_dir, f"{base_name}_mjpeg.mov")
-    elif "H.265" in mode:
-        out_file = os.path.join(dest_dir, f"{base_name}_h265.mp4")
-    elif "Web" in mode:
-        out_file = os.path.join(dest_dir, f"{base_name}_Web.mp4")
-    elif "YouTube" in mode:
-        out_file = os.path.join(dest_dir, f"{base_name}_YT.mp4")
-    else:
-        out_file = os.path.join(dest_dir, f"{base_name}_h264.mp4")
-
-    total_duration = get_duration(file_path)
-    if not total_duration:
-        messagebox.showerror(customlang.get("error_label"), f"{customlang.get("error_read_time")} : {file_path}")
-        return None
-
-    cmd = build_ffmpeg_command(file_path, mode, out_file, num_threads)
-
-    logging.debug(f"Command FFmpeg : {' '.join(cmd)}")  # Log de la commande FFmpeg
-
-    current_process = subprocess.Popen(cmd, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True, universal_newlines=True)
-
-    time_pattern = re.compile(r"time=(\d+):(\d+):(\d+\.\d+)")
-    def update_progress():
-        errors=[]
-        for line in current_process.stderr:
-            if current_process.poll() is not None:
-                break
-            if "error" in line.lower():
-                errors.append(line) 
-            match = time_pattern.search(line)
-            if match:
-                hours, minutes, seconds = match.groups()
-                elapsed = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
-                percent = (elapsed / total_duration) * 100
-                progress_bar["value"] = percent
-                progress_label.config(text=f"Conversion {mode}... ({os.path.basename(file_path)}) {percent:.1f}%")
-                root.update_idletasks()
-        
-        if errors:
-            logging.error("Errors FFmpeg :\n" + "\n".join(errors))
-    
-    threading.Thread(target=update_progress, daemon=True).start()
-
-    return current_process
+        current_batch = None
+
+    # Appelés depuis les threads de l'ordonnanceur : tout passe par le canal UI
+    def on_progress(job, batch):
+        libchannel.channel.post("batch", show_progress, batch)
+        libchannel.channel.post(("queue", job.file_path), file_queue.set_status, job.file_path,
+                                customlang.get("job_state_" + job.state))
+        if jobs_list is not None:
+            libchannel.channel.post(("job", job.file_path), refresh_job_row, jobs_list, batch, job)
+
+    def on_batch_end(batch):
+        libchannel.channel.post_event(show_batch_end, batch)
+
+    scratch_dir = load_param("scratch_dir", default="") or None
+    batch = libsched.BatchScheduler(list(files), mode, dest_dir, max_jobs=max_jobs,
+                                    num_threads=threads, on_progress=on_progress,
+                                    on_job_end=on_progress, on_batch_end=on_batch_end,
+                                    segment_workers=int(load_param("segment_workers", default=0)),
+                                    fast_path=not load_param("force_encode", default=False),
+                                    extra_modes=get_extra_modes(mode), scratch_dir=scratch_dir,
+                                    low_priority=low_priority,
+                                    placement=bool(load_param("placement", default=False)),
+                                    resume=resume_requested)
+
+    # Préparation (sondage, points de coupe) et contrôle de l'espace disque en arrière-plan :
+    # la fenêtre reste réactive, le lot peut déjà être annulé
+    set_ui_state("processing", convert_button, cancel_button, select_button, remove_button, clear_button, output_button, close_button)
+    # La reprise ne vaut que pour le lot rechargé ; les lots suivants convertissent tout
+    resume_requested = False
+    current_batch = batch
+
+    def stop_preparing():
+        global current_batch
+        progress_label.config(text=customlang.get("label_inwait"))
+        set_ui_state("idle", convert_button, cancel_button, select_button, remove_button, clear_button, output_button, close_button)
+        current_batch = None
+
+    def start_batch(space):
+        if batch.canceled:
+            stop_preparing()
+            return
+        if not space["ok"]:
+            message = (f"{customlang.get('space_required')} : {libspace.format_size(space['required'])}\n"
+                       f"{customlang.get('space_free')} : {libspace.format_size(space['free'])}")
+            if scratch_dir:
+                message += (f"\n{customlang.get('space_scratch')} : {libspace.format_size(space['scratch_required'])}"
+                            f" / {libspace.format_size(space['scratch_free'])}")
+            if not messagebox.askyesno(customlang.get("space_title"), f"{message}\n\n{customlang.get('space_question')}"):
+                stop_preparing()
+                return
+        if jobs_list is not None:
+            refresh_job_rows(jobs_list, batch)
+        progress_label.config(text=customlang.get("conversion_inprogress"))
+        batch.start()
+
+    def prepare():
+        batch.plan()
+        space = libspace.preflight(batch.jobs, dest_dir, scratch_dir, batch.max_jobs)
+        libchannel.channel.post_event(start_batch, space)
+    progress_label.config(text=customlang.get("conversion_preparing"))
+    threading.Thread(target=prepare, daemon=True).start()
@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import platform
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+import libs.libbench as libbench
+import libs.libcaps as libcaps
+import libs.libpaths as libpaths
+
+# Réglage automatique du nombre de threads par job et de jobs simultanés, par mode.
+# Des encodages courts de calibration (sources synthétiques du banc d'essai) mesurent le
+# débit cumulé de chaque combinaison ; la meilleure est enregistrée pour cette machine
+# (processeur, nombre de cœurs, version de FFmpeg) et appliquée quand les champs sont sur auto.
+
+TUNE_VERSION = 1
+# Durée et taille des sources de calibration
+CALIBRATION_SECONDS = 3
+CALIBRATION_SIZE = "1080p"
+# Nombre maximum de jobs simultanés essayés
+MAX_TUNE_JOBS = 8
+
+_lock = threading.Lock()
+# Fichier de réglage et modèle de processeur, lus une seule fois (voir _load et cpu_model)
+_machines = None
+_cpu_model = None
+
+def tune_file() -> str:
+    return os.path.join(libpaths.data_dir(), "tune.json")
+
+def _read_cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def cpu_model() -> str:
+    global _cpu_model
+    if _cpu_model is None:
+        _cpu_model = _read_cpu_model()
+    return _cpu_model
+
+def machine_key() -> str:
+    """Identifie la machine : un réglage n'est valable que pour ce processeur et ce FFmpeg."""
+    caps = libcaps.get_capabilities() or {}
+    return f"{cpu_model()}|{os.cpu_count()}|{caps.get('version')}"
+
+def candidates(cpu_count: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Combinaisons (threads par job, jobs) à essayer : FFmpeg auto seul, puis les cœurs
+    répartis entre 1, 2, 4... jobs."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    combos = [(0, 1)]
+    jobs = 1
+    while jobs <= min(cpu_count, MAX_TUNE_JOBS):
+        combos.append((max(1, cpu_count // jobs), jobs))
+        jobs *= 2
+    return combos
+
+def _load() -> dict:
+    """Réglages par machine, lus sur disque au premier appel (appelé avec _lock)."""
+    global _machines
+    if _machines is None:
+        _machines = {}
+        try:
+            with open(tune_file(), "r") as f:
+                data = json.load(f)
+            if data.get("version") == TUNE_VERSION:
+                _machines = data.get("machines", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+    return _machines
+
+def get_tuning(mode: str) -> Optional[dict]:
+    """Réglage enregistré pour ce mode sur cette machine (threads, jobs, fps), ou None."""
+    key = machine_key()
+    with _lock:
+        tuning = _load().get(key, {}).get(mode)
+        return dict(tuning) if tuning else None
+
+def save_tuning(mode: str, tuning: dict) -> None:
+    """Enregistre le réglage d'un mode ; le fichier est relu d'abord (réglages d'un autre processus)."""
+    global _machines
+    key = machine_key()
+    with _lock:
+        _machines = None
+        machines = _load()
+        machines.setdefault(key, {})[mode] = dict(tuning)
+        try:
+            libpaths.atomic_write_json(tune_file(), {"version": TUNE_VERSION, "machines": machines})
+        except OSError as e:
+            logging.debug(f"Unable to write tuning file : {e}")
+
+def calibrate(mode: str, on_result: Optional[Callable] = None,
+              stop: Optional[threading.Event] = None) -> Optional[dict]:
+    """Essaie chaque combinaison sur une source courte et enregistre la plus rapide.
+
+    Le critère est le débit cumulé (images/s de tous les jobs) ; retourne le réglage
+    enregistré, ou None si la source de calibration n'a pas pu être générée ou si aucun
+    encodage n'a réussi.
+    """
+    # Première source dont l'encodeur est disponible (libx264 absent de certains FFmpeg)
+    kinds = libbench.available_sources(mode)
+    if not kinds:
+        logging.error(f"Auto-tune {mode} : no encoder available for a calibration source")
+        return None
+    try:
+        source = libbench.generate_source(kinds[0], CALIBRATION_SIZE, CALIBRATION_SECONDS)
+    except (subprocess.CalledProcessError, OSError) as e:
+        logging.error(f"Auto-tune {mode} : unable to generate the {kinds[0]} calibration source : {e}")
+        return None
+    work_dir = os.path.join(libpaths.cache_dir(), "tune")
+    os.makedirs(work_dir, exist_ok=True)
+    best = None
+    for threads, jobs in candidates():
+        if stop is not None and stop.is_set():
+            return None
+        result = libbench.run_case(source, mode, threads, jobs, work_dir)
+        if on_result:
+            on_result(result)
+        if result["ok"] and result["fps"] and (best is None or result["fps"] > best["fps"]):
+            best = result
+    if best is None:
+        return None
+    tuning = {"threads": best["threads"], "jobs": best["jobs"], "fps": best["fps"], "tuned_at": time.time()}
+    save_tuning(mode, tuning)
+    logging.debug(f"Auto-tune {mode} : {tuning['jobs']} job(s) x {tuning['threads']} thread(s), {tuning['fps']} fps")
+    return tuning
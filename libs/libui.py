@@ -1,7 +1,14 @@
+import os
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import ttk
 import tkinter.font as tkFont
 import libs.libtools as libtools
+import libs.libffmpeg as libffmpeg
+import libs.libchannel as libchannel
+import libs.liblog as liblog
+import libs.libqueue as libqueue
+import libs.libscan as libscan
+import libs.libwatch as libwatch
 import config.style as customstyle
 import config.lang as customlang
 
@@ -13,7 +20,6 @@ def create_princ():
 
     bold_font = tkFont.Font(family="Helvetica", size=10, weight="bold")
     
-    input_files = tk.Variable(value=[])
     output_dir = tk.StringVar()
 
     # Création des onglets
@@ -28,15 +34,16 @@ def create_princ():
         width=20, bg=customstyle.bg_button_close, fg="white", bd=0, state=tk.NORMAL)
     close_button.pack(side="right", padx=10)
 
-    return root, notebook, input_files, output_dir, bold_font, close_button
+    # Rafraîchissement de l'interface depuis les threads de travail
+    libchannel.channel.start(root)
 
-def create_files_tab(notebook, input_files, output_dir):
+    return root, notebook, output_dir, bold_font, close_button
+
+def create_files_tab(notebook, output_dir):
     #### ONGLET FICHIERS
 
     file_tab = customstyle.gen_tab(notebook, customlang.get("tab_files_name"))
 
-    input_files = tk.Variable(value=[])
-
     # --- Cadre : Sélection des fichiers ---
     frame_files = tk.LabelFrame(file_tab, text=customlang.get("frame_files_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
     frame_files.pack(pady=10, fill="x", padx=10)
@@ -45,15 +52,20 @@ def create_files_tab(notebook, input_files, output_dir):
     frame_buttons.pack(fill="x")
 
     select_button = tk.Button(frame_buttons, text=customlang.get("button_files_name"), width=18,
-        command=lambda: libtools.select_files(input_files, files_list), bg=customstyle.bg_button_files, fg="white")
+        command=lambda: libtools.select_files(file_queue), bg=customstyle.bg_button_files, fg="white")
     select_button.pack(side="left")
 
+    folder_button = tk.Button(frame_buttons, text=customlang.get("button_folder_name"), width=18,
+        command=lambda: libtools.select_folder(file_queue, scan_extensions, scan_label),
+        bg=customstyle.bg_button_files, fg="white")
+    folder_button.pack(side="left", padx=(5, 0))
+
     remove_button = tk.Button(frame_buttons, text=customlang.get("button_remove_name"), width=18,
-        command=lambda: libtools.remove_selected(input_files, files_list), bg=customstyle.bg_button_remove, fg="white")
+        command=lambda: libtools.remove_selected(file_queue), bg=customstyle.bg_button_remove, fg="white")
     remove_button.pack(side="left", padx=5)
 
     clear_button = tk.Button(frame_buttons, text=customlang.get("button_allremove_name"), width=14,
-        command=lambda: libtools.clear_all(input_files, files_list), bg=customstyle.bg_button_clear, fg="white")
+        command=lambda: libtools.clear_all(file_queue), bg=customstyle.bg_button_clear, fg="white")
     clear_button.pack(side="left")
 
     # detect_button = tk.Button(frame_buttons, text="Détecter H.264/H.265", width=20,
@@ -61,13 +73,24 @@ def create_files_tab(notebook, input_files, output_dir):
     #     bg=customstyle.bg_button_detect, fg="black")
     # detect_button.pack(side="left", padx=5)
 
-    frame_list = tk.Frame(frame_files, bg=customstyle.bg_global)
-    frame_list.pack(fill="x", pady=5)
-    scrollbar = tk.Scrollbar(frame_list, orient="vertical")
-    scrollbar.pack(side="right", fill="y")
-    files_list = tk.Listbox(frame_list, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, width=80, height=8, relief="flat", yscrollcommand=scrollbar.set)
-    files_list.pack(side="left", fill="x", expand=True)
-    scrollbar.config(command=files_list.yview)
+    # Filtres de l'import de dossier : codec vidéo et extensions
+    frame_scan = tk.Frame(frame_files, bg=customstyle.bg_frame)
+    frame_scan.pack(fill="x", pady=(5, 0))
+    tk.Label(frame_scan, text="{} :".format(customlang.get("label_scan_codecs")), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left")
+    codec_labels = {customlang.get("scan_filter_" + key): key for key in libscan.CODEC_FILTERS}
+    codec_key = libtools.load_param("scan_codecs", default="all")
+    scan_codecs = tk.StringVar(value=customlang.get("scan_filter_" + (codec_key if codec_key in libscan.CODEC_FILTERS else "all")))
+    scan_codecs.trace_add("write", lambda *args: libtools.save_param("scan_codecs", codec_labels[scan_codecs.get()]))
+    ttk.Combobox(frame_scan, textvariable=scan_codecs, values=list(codec_labels), state="readonly", width=22).pack(side="left", padx=5)
+    tk.Label(frame_scan, text="{} :".format(customlang.get("label_scan_extensions")), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left", padx=(20, 0))
+    scan_extensions = tk.StringVar(value=libtools.load_param("scan_extensions", default=" ".join(e[1:] for e in libwatch.VIDEO_EXTENSIONS)))
+    scan_extensions.trace_add("write", lambda *args: libtools.save_param("scan_extensions", scan_extensions.get()))
+    tk.Entry(frame_scan, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, textvariable=scan_extensions, width=30).pack(side="left", padx=5)
+    scan_label = tk.Label(frame_scan, text="", bg=customstyle.bg_frame, fg=customstyle.fg_frame)
+    scan_label.pack(side="left", padx=10)
+
+    # File des fichiers : sélection multiple (Maj/Ctrl) pour le retrait
+    file_queue = libqueue.QueueView(frame_files)
 
     tk.Label(frame_files, text=customlang.get("label_h264_name"), fg="red", bg=customstyle.bg_frame).pack()
     tk.Label(frame_files, text=customlang.get("label_help_files_name1"), fg=customstyle.fg_global, bg=customstyle.bg_frame).pack()
@@ -86,13 +109,30 @@ def create_files_tab(notebook, input_files, output_dir):
 
     tk.Entry(frame_output, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, textvariable=output_dir, width=40, relief="flat").pack(side="left", padx=5)
 
-    return files_list, input_files, select_button, remove_button, clear_button, output_button, output_dir
+    return file_queue, select_button, remove_button, clear_button, output_button, output_dir
 
-def create_options_tab(notebook, bold_font):
-    cuda_available = libtools.check_cuda()
+def create_lazy_tab(notebook, name, build):
+    """Ajoute un onglet dont le contenu n'est construit qu'à sa première ouverture."""
+    tab = customstyle.gen_tab(notebook, name)
+    pending = [build]
+    def on_tab_changed(event):
+        if pending and notebook.select() == str(tab):
+            pending.pop()(tab)
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed, add="+")
+    return tab
 
-    #### ONGLET OPTIONS
-    option_tab = customstyle.gen_tab(notebook, customlang.get("tab_options_name"))
+def create_options_tab(notebook, bold_font):
+    #### ONGLET OPTIONS (construit à la première ouverture ; les variables existent dès le démarrage)
+    conversion_option = tk.StringVar(value=libtools.load_param("mode", default="H.264/H.265 → ProRes 422 HQ (Davinci Resolve)"))
+    conversion_option.trace_add("write", lambda *args: libtools.save_param("mode", conversion_option.get()))
+    num_threads = tk.StringVar(value=str(libtools.load_param("threads", default=0)))
+    num_jobs = tk.StringVar(value=str(libtools.load_param("jobs", default=1)))
+    create_lazy_tab(notebook, customlang.get("tab_options_name"),
+                    lambda tab: build_options_tab(tab, bold_font, conversion_option, num_threads, num_jobs))
+    return conversion_option, num_threads, num_jobs
+
+def build_options_tab(option_tab, bold_font, conversion_option, num_threads, num_jobs):
+    cuda_available = libffmpeg.check_cuda()
 
     # --- Cadre : Options de conversion ---
     frame_mode = tk.LabelFrame(option_tab, text=customlang.get("frame_options_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
@@ -117,16 +157,19 @@ def create_options_tab(notebook, bold_font):
     davinci_in_conversions = [
         ("H.264/H.265 → ProRes 422 HQ", "H.264/H.265 → ProRes 422 HQ (Davinci Resolve)"),
         ("H.264/H.265 → DNxHR HQX (UHD only)", "H.264/H.265 → DNxHR HQX (Davinci Resolve)"),
-        ("H.264/H.265 → MJPEG", "H.264/H.265 → MJPEG (Davinci Resolve)")
+        ("H.264/H.265 → MJPEG", "H.264/H.265 → MJPEG (Davinci Resolve)"),
+        ("Proxy ProRes Proxy (1/2)", "H.264/H.265 → ProRes Proxy (Proxy Davinci Resolve)"),
+        ("Proxy ProRes LT (1/2)", "H.264/H.265 → ProRes LT (Proxy Davinci Resolve)"),
+        ("Proxy DNxHR LB (1/2)", "H.264/H.265 → DNxHR LB (Proxy Davinci Resolve)")
     ]
 
-    conversion_option = tk.StringVar(value="H.264/H.265 → ProRes 422 HQ (Davinci Resolve)")
     for text, mode in davinci_in_conversions:
         fg_spec = customstyle.fg_global
         if text == "H.264/H.265 → ProRes 422 HQ":
             fg_spec = customstyle.fg_recommended
         tk.Radiobutton(frame_davinci_in, text=text, variable=conversion_option, value=mode,
-                       bg=customstyle.bg_frame, fg=fg_spec, bd=0, relief="flat", highlightthickness=0).pack(anchor='w', pady=2)
+                       bg=customstyle.bg_frame, fg=fg_spec, bd=0, relief="flat", highlightthickness=0,
+                       state=tk.NORMAL if libffmpeg.mode_available(mode) else tk.DISABLED).pack(anchor='w', pady=2)
 
     # Label pour les options de sortie de Davinci Resolve
     tk.Label(frame_davinci_out, text="{} :".format(customlang.get("label_foroutdv_name")), font=bold_font, bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(anchor="w", pady=(0, 10))
@@ -143,7 +186,8 @@ def create_options_tab(notebook, bold_font):
         if text == "ProRes/DNxHR → H.264 (YouTube)" or text == "ProRes/DNxHR → H.265 (Web/YouTube)":
             fg_spec = customstyle.fg_recommended
         tk.Radiobutton(frame_davinci_out, text=text, variable=conversion_option, value=mode,
-                       bg=customstyle.bg_frame, fg=fg_spec, bd=0, relief="flat", highlightthickness=0).pack(anchor='w', pady=2)
+                       bg=customstyle.bg_frame, fg=fg_spec, bd=0, relief="flat", highlightthickness=0,
+                       state=tk.NORMAL if libffmpeg.mode_available(mode) else tk.DISABLED).pack(anchor='w', pady=2)
 
     # Label pour les autres options
     tk.Label(frame_other, text="{} :".format(customlang.get("label_otheropt_name")), font=bold_font, bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(anchor="w", pady=(0, 10))
@@ -170,7 +214,29 @@ def create_options_tab(notebook, bold_font):
     for text, mode in other_conversions:
         fg_spec = customstyle.fg_global
         tk.Radiobutton(frame_other, text=text, variable=conversion_option, value=mode,
-                       bg=customstyle.bg_frame, fg=fg_spec, bd=0, relief="flat", highlightthickness=0).pack(anchor='w', pady=2)
+                       bg=customstyle.bg_frame, fg=fg_spec, bd=0, relief="flat", highlightthickness=0,
+                       state=tk.NORMAL if libffmpeg.mode_available(mode) else tk.DISABLED).pack(anchor='w', pady=2)
+
+    # Les modes dont l'encodeur est absent de FFmpeg sont grisés
+    libtools.ensure_mode_available(conversion_option)
+
+    # --- Cadre : Sorties supplémentaires (même décodage) ---
+    frame_extra = tk.LabelFrame(option_tab, text=customlang.get("frame_extra_outputs_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
+    frame_extra.pack(pady=10, fill="x", padx=10)
+    tk.Label(frame_extra, text=customlang.get("label_extra_outputs_help"), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(anchor="w")
+    extra_modes = libtools.load_param("extra_modes", default=[])
+    extra_vars = []
+    def save_extra_modes(*args):
+        libtools.save_param("extra_modes", [mode for mode, var in extra_vars if var.get()])
+    frame_extra_modes = tk.Frame(frame_extra, bg=customstyle.bg_frame)
+    frame_extra_modes.pack(anchor="w")
+    for i, (text, mode) in enumerate(davinci_in_conversions + davinci_out_conversions + other_conversions):
+        var = tk.BooleanVar(value=mode in extra_modes and libffmpeg.mode_available(mode))
+        var.trace_add("write", save_extra_modes)
+        extra_vars.append((mode, var))
+        tk.Checkbutton(frame_extra_modes, text=text, variable=var, bg=customstyle.bg_frame, fg=customstyle.fg_frame,
+                       bd=0, relief="flat", highlightthickness=0,
+                       state=tk.NORMAL if libffmpeg.mode_available(mode) else tk.DISABLED).grid(row=i // 3, column=i % 3, sticky="w", padx=(0, 10))
 
     frame_help = tk.LabelFrame(option_tab, text=customlang.get("frame_help_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
     frame_help.pack(pady=10, fill="x", padx=10)
@@ -181,20 +247,82 @@ def create_options_tab(notebook, bold_font):
     frame_threads.pack(pady=10, fill="x", padx=10)
 
     tk.Label(frame_threads, text="{} (0 = auto) :".format(customlang.get("frame_threads_name")), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left")
-    num_threads = tk.StringVar(value="0")
     tk.Entry(frame_threads, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, textvariable=num_threads, width=5).pack(side="left", padx=5)
 
-    return conversion_option, num_threads
+    tk.Label(frame_threads, text="{} (0 = auto) :".format(customlang.get("frame_jobs_name")), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left", padx=(20, 0))
+    tk.Entry(frame_threads, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, textvariable=num_jobs, width=5).pack(side="left", padx=5)
+
+    create_param_entry(frame_threads, "frame_probe_workers_name", "probe_workers", libtools.DEFAULT_PROBE_WORKERS, 1)
+
+    # Placement des jobs (affinité CPU / NUMA)
+    frame_placement = tk.Frame(option_tab, bg=customstyle.bg_frame)
+    frame_placement.pack(fill="x", padx=20)
+    placement = tk.BooleanVar(value=bool(libtools.load_param("placement", default=False)))
+    placement.trace_add("write", lambda *args: libtools.save_param("placement", placement.get()))
+    tk.Checkbutton(frame_placement, text=customlang.get("label_placement"), variable=placement,
+                   bg=customstyle.bg_frame, fg=customstyle.fg_frame, bd=0, relief="flat", highlightthickness=0).pack(side="left")
+
+    # Réglage automatique threads/jobs du mode sélectionné (appliqué aux champs laissés à 0)
+    frame_tune = tk.Frame(option_tab, bg=customstyle.bg_frame)
+    frame_tune.pack(fill="x", padx=20)
+    tune_label = tk.Label(frame_tune, text=libtools.tune_text(conversion_option.get()), bg=customstyle.bg_frame, fg=customstyle.fg_frame)
+    tune_button = tk.Button(frame_tune, text=customlang.get("button_tune_name"), width=18,
+                            command=lambda: libtools.auto_tune(conversion_option, tune_label, tune_button),
+                            bg=customstyle.bg_button_output, fg="white")
+    tune_button.pack(side="left")
+    tune_label.pack(side="left", padx=10)
+    conversion_option.trace_add("write", lambda *args: tune_label.config(text=libtools.tune_text(conversion_option.get())))
+
+    # --- Cadre : Encodage segmenté ---
+    frame_segments = tk.LabelFrame(option_tab, text=customlang.get("frame_segments_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
+    frame_segments.pack(pady=10, fill="x", padx=10)
+    create_param_entry(frame_segments, "label_segment_workers", "segment_workers", 0, 0, padx=0)
+    tk.Label(frame_segments, text=customlang.get("label_segments_help"), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left", padx=10)
+
+    # --- Cadre : Chemin rapide (remux / copie) ---
+    frame_fast = tk.LabelFrame(option_tab, text=customlang.get("frame_fast_path_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
+    frame_fast.pack(pady=10, fill="x", padx=10)
+    force_encode = tk.BooleanVar(value=bool(libtools.load_param("force_encode", default=False)))
+    force_encode.trace_add("write", lambda *args: libtools.save_param("force_encode", force_encode.get()))
+    tk.Checkbutton(frame_fast, text=customlang.get("label_force_encode"), variable=force_encode,
+                   bg=customstyle.bg_frame, fg=customstyle.fg_frame, bd=0, relief="flat", highlightthickness=0).pack(side="left")
+
+    # --- Cadre : Dossier de travail local ---
+    frame_scratch = tk.LabelFrame(option_tab, text=customlang.get("frame_scratch_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
+    frame_scratch.pack(pady=10, fill="x", padx=10)
+    scratch_dir = tk.StringVar(value=libtools.load_param("scratch_dir", default=""))
+    scratch_dir.trace_add("write", lambda *args: libtools.save_param("scratch_dir", scratch_dir.get().strip()))
+    tk.Entry(frame_scratch, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, textvariable=scratch_dir, width=40, relief="flat").pack(side="left", padx=5)
+    tk.Label(frame_scratch, text=customlang.get("label_scratch_help"), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left", padx=10)
+
+def create_param_entry(frame, label_key, param, default, minimum, padx=(20, 0)):
+    """Champ numérique enregistré directement dans les paramètres à chaque modification."""
+    tk.Label(frame, text="{} :".format(customlang.get(label_key)), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left", padx=padx)
+    value_var = tk.StringVar(value=str(libtools.load_param(param, default=default)))
+    def save_value(*args):
+        value = value_var.get()
+        if value.isdigit() and int(value) >= minimum:
+            libtools.save_param(param, int(value))
+    value_var.trace_add("write", save_value)
+    tk.Entry(frame, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, textvariable=value_var, width=5).pack(side="left", padx=5)
+    return value_var
 
 def close_app(root: tk.Tk) -> None:
     """Ferme l'application."""
     root.destroy()
 
-def create_processing_tab(root, notebook, input_files, output_dir, files_list,
+def create_processing_tab(root, notebook, file_queue, output_dir,
                                 select_button, remove_button, clear_button, output_button,
-                                close_button, conversion_option, num_threads):
-    #### ONGLET TRAITEMENT
-    process_tab = customstyle.gen_tab(notebook, customlang.get("tab_processing_name"))
+                                close_button, conversion_option, num_threads, num_jobs):
+    #### ONGLET TRAITEMENT (construit à la première ouverture)
+    create_lazy_tab(notebook, customlang.get("tab_processing_name"),
+                    lambda tab: build_processing_tab(tab, root, file_queue, output_dir,
+                                                     select_button, remove_button, clear_button, output_button,
+                                                     close_button, conversion_option, num_threads, num_jobs))
+
+def build_processing_tab(process_tab, root, file_queue, output_dir,
+                         select_button, remove_button, clear_button, output_button,
+                         close_button, conversion_option, num_threads, num_jobs):
 
     # --- Cadre : Progression ---
     frame_progress = tk.LabelFrame(process_tab, text=customlang.get("frame_progress_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
@@ -204,16 +332,29 @@ def create_processing_tab(root, notebook, input_files, output_dir, files_list,
     progress_bar.pack(pady=5)
     progress_label = tk.Label(frame_progress, text=customlang.get("label_inwait"), bg=customstyle.bg_frame, fg=customstyle.fg_frame)
     progress_label.pack()
+    estimate_label = tk.Label(frame_progress, text=f"{customlang.get('label_estimate')} : -", bg=customstyle.bg_frame, fg=customstyle.fg_frame)
+    estimate_label.pack()
+
+    # --- Cadre : Jobs du lot ---
+    frame_jobs = tk.LabelFrame(process_tab, text=customlang.get("frame_jobs_list_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
+    frame_jobs.pack(pady=10, fill="x", padx=10)
+
+    jobs_scrollbar = tk.Scrollbar(frame_jobs, orient="vertical")
+    jobs_scrollbar.pack(side="right", fill="y")
+    jobs_list = tk.Listbox(frame_jobs, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, width=80, height=6, relief="flat", yscrollcommand=jobs_scrollbar.set)
+    jobs_list.pack(side="left", fill="x", expand=True)
+    jobs_scrollbar.config(command=jobs_list.yview)
 
     # --- Cadre : Boutons de commande ---
     frame_command = tk.LabelFrame(process_tab, text=customlang.get("frame_command_name"), bg=customstyle.bg_frame, fg=customstyle.fg_frame, padx=10, pady=10)
     frame_command.pack(pady=10, fill="x", padx=10)
 
     convert_button = tk.Button(frame_command, text=customlang.get("button_convert_name"),
-        command=lambda: libtools.convert(input_files, conversion_option, output_dir,
-            progress_bar, progress_label, files_list, root,
+        command=lambda: libtools.convert(file_queue, conversion_option, output_dir,
+            progress_bar, progress_label, root,
             convert_button, cancel_button, select_button,
-            remove_button, clear_button, output_button, close_button, num_threads),
+            remove_button, clear_button, output_button, close_button, num_threads,
+            num_jobs, jobs_list, estimate_label),
         width=20, bg=customstyle.bg_button_convert, fg="white")
     convert_button.pack(side="left")
 
@@ -221,35 +362,113 @@ def create_processing_tab(root, notebook, input_files, output_dir, files_list,
         width=20, bg=customstyle.bg_button_cancel, fg="white", state=tk.DISABLED)
     cancel_button.pack(side="left", padx=5)
 
+    cancel_job_button = tk.Button(frame_command, text=customlang.get("button_cancel_job_name"), command=lambda: libtools.cancel_job(jobs_list),
+        width=20, bg=customstyle.bg_button_cancel, fg="white")
+    cancel_job_button.pack(side="left", padx=5)
+
+    estimate_button = tk.Button(frame_command, text=customlang.get("button_estimate_name"),
+        command=lambda: libtools.estimate_duration(file_queue, conversion_option, output_dir, estimate_label, num_jobs),
+        width=20, bg=customstyle.bg_button_output, fg="white")
+    estimate_button.pack(side="left", padx=5)
+
+    # --- Pause, priorité et ordre de la file ---
+    frame_queue = tk.Frame(frame_command, bg=customstyle.bg_frame)
+    frame_queue.pack(side="bottom", fill="x", pady=(10, 0), before=convert_button)
+    tk.Button(frame_queue, text=customlang.get("button_pause_name"), command=libtools.pause_conversion,
+        width=20, bg=customstyle.bg_button_output, fg="white").pack(side="left")
+    tk.Button(frame_queue, text=customlang.get("button_resume_name"), command=libtools.resume_conversion,
+        width=20, bg=customstyle.bg_button_output, fg="white").pack(side="left", padx=5)
+    tk.Button(frame_queue, text=customlang.get("button_move_up_name"), command=lambda: libtools.move_selected(jobs_list, -1),
+        width=10, bg=customstyle.bg_button_files, fg="white").pack(side="left", padx=5)
+    tk.Button(frame_queue, text=customlang.get("button_move_down_name"), command=lambda: libtools.move_selected(jobs_list, 1),
+        width=10, bg=customstyle.bg_button_files, fg="white").pack(side="left", padx=5)
+    low_priority = tk.BooleanVar(value=libtools.low_priority)
+    low_priority.trace_add("write", lambda *args: libtools.set_low_priority(low_priority.get()))
+    tk.Checkbutton(frame_queue, text=customlang.get("label_low_priority"), variable=low_priority,
+                   bg=customstyle.bg_frame, fg=customstyle.fg_frame, bd=0, relief="flat", highlightthickness=0).pack(side="left", padx=10)
+
 def create_debug_tab(notebook):
-    debug_tab = customstyle.gen_tab(notebook, customlang.get("tab_debug_name"))
+    # Construit à la première ouverture : le tampon garde les logs émis avant
+    return create_lazy_tab(notebook, customlang.get("tab_debug_name"), build_debug_tab)
+
+def build_debug_tab(debug_tab):
+    log_buffer = liblog.log_buffer
+
+    # --- Filtres : niveau minimal, job (nom de fichier), nombre de lignes conservées ---
+    frame_filters = tk.Frame(debug_tab, bg=customstyle.bg_frame)
+    frame_filters.pack(fill="x", padx=5, pady=(5, 0))
+    tk.Label(frame_filters, text="{} :".format(customlang.get("label_log_level")), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left")
+    level_var = tk.StringVar(value=liblog.LEVELS[0])
+    ttk.Combobox(frame_filters, textvariable=level_var, values=liblog.LEVELS, state="readonly", width=9).pack(side="left", padx=5)
+
+    def job_names():
+        batch = libtools.current_batch
+        return [""] + [os.path.basename(job.file_path) for job in batch.jobs] if batch else [""]
+    tk.Label(frame_filters, text="{} :".format(customlang.get("label_log_filter")), bg=customstyle.bg_frame, fg=customstyle.fg_frame).pack(side="left", padx=(20, 0))
+    filter_var = tk.StringVar()
+    job_filter = ttk.Combobox(frame_filters, textvariable=filter_var, width=30)
+    job_filter.configure(postcommand=lambda: job_filter.configure(values=job_names()))
+    job_filter.pack(side="left", padx=5)
+    max_lines_var = create_param_entry(frame_filters, "label_log_max_lines", "log_max_lines", liblog.DEFAULT_MAX_LINES, 100)
 
     debug_text = tk.Text(debug_tab, bg=customstyle.bg_field, fg=customstyle.fg_field, highlightthickness=1, highlightcolor=customstyle.bd_color, highlightbackground=customstyle.bd_color, height=15, width=80)
     debug_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+    def max_lines() -> int:
+        return log_buffer.records.maxlen
+
+    def accepted(entries):
+        min_level = libtools.logging.getLevelName(level_var.get())
+        text = filter_var.get().strip()
+        return [line for levelno, line in entries if liblog.matches((levelno, line), min_level, text)]
+
+    def append(lines):
+        """Ajoute un lot de lignes puis retire les plus anciennes au-delà de la limite."""
+        if not lines:
+            return
+        at_end = debug_text.yview()[1] >= 0.999
+        debug_text.insert(tk.END, "\n".join(lines) + "\n")
+        excess = int(debug_text.index("end-1c").split(".")[0]) - 1 - max_lines()
+        if excess > 0:
+            debug_text.delete("1.0", f"{excess + 1}.0")
+        if at_end:
+            debug_text.see(tk.END)
+
+    def refresh(*args):
+        """Réaffiche le tampon complet avec les filtres courants."""
+        debug_text.delete("1.0", tk.END)
+        append(accepted(log_buffer.snapshot()))
+
+    def flush():
+        append(accepted(log_buffer.take_pending()))
+
+    def apply_max_lines(*args):
+        value = max_lines_var.get()
+        if value.isdigit() and int(value) >= 100 and int(value) != max_lines():
+            log_buffer.set_max_lines(int(value))
+            refresh()
+
+    def clear():
+        log_buffer.clear()
+        debug_text.delete("1.0", tk.END)
+
+    level_var.trace_add("write", refresh)
+    filter_var.trace_add("write", refresh)
+    max_lines_var.trace_add("write", apply_max_lines)
+
     clear_button = tk.Button(debug_tab, text=customlang.get("button_emptylogs_name"), width=14,
-            command=lambda: debug_text.delete(1.0, tk.END), bg=customstyle.bg_button_clear, fg="white")
+            command=clear, bg=customstyle.bg_button_clear, fg="white")
     clear_button.pack(pady=5)
 
-    # Rediriger les logs vers cette zone de texte
-    class TextHandler(libtools.logging.Handler):
-        def __init__(self, text_widget):
-            super().__init__()
-            self.text_widget = text_widget
-
-        def emit(self, record):
-            self.text_widget.insert(tk.END, self.format(record) + "\n")
-            self.text_widget.see(tk.END)
-
-    text_handler = TextHandler(debug_text)
-    text_handler.setFormatter(libtools.logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    libtools.logging.getLogger().addHandler(text_handler)
-
-    return debug_tab
+    # Les enregistrements arrivent de tous les threads : affichage par lots depuis la boucle Tk
+    refresh()
+    log_buffer.on_new = lambda: libchannel.channel.post("debug_log", flush)
 
 def create_help_tab(notebook, bold_font):
-    #### ONGLET AIDE
-    help_tab = customstyle.gen_tab(notebook, "Aide")
+    #### ONGLET AIDE (construit à la première ouverture)
+    create_lazy_tab(notebook, "Aide", lambda tab: build_help_tab(tab, bold_font))
+
+def build_help_tab(help_tab, bold_font):
 
     # --- Cadre : Aide ---
     frame_help = tk.LabelFrame(help_tab, text=" Aide ", bg=customstyle.bg_frame, fg=customstyle.fg_frame, relief="flat", bd=0, padx=10, pady=10)
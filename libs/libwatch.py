@@ -0,0 +1,166 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Optional, Tuple
+import libs.libffmpeg as libffmpeg
+
+# Surveillance d'un dossier d'ingest : les nouveaux fichiers vidéo sont détectés (inotify,
+# sinon scrutation périodique), attendus jusqu'à ce que leur taille ne change plus
+# (copie terminée), puis transmis à la conversion.
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".flv", ".wmv", ".mts", ".m2ts")
+# Codecs vidéo convertis par défaut
+WATCH_CODECS = ("h264", "hevc")
+# Durée sans changement de taille ni de date avant de considérer un fichier comme complet (secondes)
+SETTLE_SECONDS = 5.0
+# Intervalle de vérification des fichiers en cours de copie (secondes)
+CHECK_INTERVAL = 1.0
+# Intervalle de scrutation sans inotify, et de re-scan de sécurité avec inotify (secondes)
+POLL_INTERVAL = 5.0
+RESCAN_INTERVAL = 60.0
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+
+class Inotify:
+    """Accès minimal à inotify (Linux) via la libc, sans dépendance externe."""
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, "inotify_add_watch")
+
+    def read(self, timeout: float) -> Tuple[list, bool]:
+        """Attend des évènements ; retourne (noms de fichiers, débordement de la file)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return [], False
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return [], False
+        names, overflow, offset = [], False, 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif name:
+                names.append(os.fsdecode(name))
+        return names, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+class FolderWatcher:
+    """Détecte les fichiers vidéo complets d'un dossier et les passe à on_ready(chemin).
+
+    Chaque fichier n'est transmis qu'une fois (tant qu'il n'est pas modifié). Le débit
+    de conversion est limité par l'appelant, qui met les fichiers en file d'attente.
+    """
+
+    def __init__(self, directory: str, on_ready: Callable, codecs=WATCH_CODECS,
+                 settle_seconds: float = SETTLE_SECONDS, use_inotify: bool = True):
+        self.directory = os.path.abspath(directory)
+        self.on_ready = on_ready
+        self.codecs = codecs
+        self.settle_seconds = settle_seconds
+        self.use_inotify = use_inotify
+        self._pending = {}   # chemin -> (taille, mtime_ns, instant du dernier changement)
+        self._seen = {}      # chemin -> (taille, mtime_ns) déjà traité
+
+    def _is_candidate(self, name: str) -> bool:
+        return not name.startswith(".") and name.lower().endswith(VIDEO_EXTENSIONS)
+
+    def _add(self, name: str) -> None:
+        if self._is_candidate(name):
+            path = os.path.join(self.directory, name)
+            if path not in self._pending:
+                self._pending[path] = (None, None, time.monotonic())
+
+    def scan(self) -> None:
+        """Parcourt le dossier et ajoute les fichiers non encore traités."""
+        present = set()
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and self._is_candidate(entry.name):
+                        present.add(entry.path)
+                        st = entry.stat()
+                        if self._seen.get(entry.path) != (st.st_size, st.st_mtime_ns):
+                            self._add(entry.name)
+        except OSError as e:
+            logging.error(f"Unable to scan watch folder {self.directory} : {e}")
+            return
+        # Oublie les fichiers retirés du dossier
+        for path in [p for p in self._seen if p not in present]:
+            del self._seen[path]
+
+    def check_pending(self) -> None:
+        """Transmet les fichiers dont la taille et la date n'ont plus changé depuis settle_seconds."""
+        now = time.monotonic()
+        for path, (size, mtime_ns, since) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]  # Fichier supprimé ou renommé entre-temps
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            if current != (size, mtime_ns):
+                self._pending[path] = current + (now,)
+            elif st.st_size > 0 and now - since >= self.settle_seconds:
+                del self._pending[path]
+                if self._seen.get(path) == current:
+                    continue  # Déjà transmis, inchangé
+                self._seen[path] = current
+                codec = libffmpeg.get_video_codec(path)
+                if codec in self.codecs:
+                    logging.debug(f"Watch folder : new file {path} ({codec})")
+                    self.on_ready(path)
+                else:
+                    logging.debug(f"Watch folder : ignored {path} ({codec})")
+
+    def run(self, stop: threading.Event) -> None:
+        """Boucle de surveillance jusqu'à ce que stop soit positionné."""
+        inotify: Optional[Inotify] = None
+        if self.use_inotify:
+            try:
+                inotify = Inotify(self.directory)
+            except (OSError, AttributeError) as e:
+                logging.debug(f"inotify unavailable, polling {self.directory} : {e}")
+        self.scan()
+        last_scan = time.monotonic()
+        try:
+            while not stop.is_set():
+                if inotify is not None:
+                    names, overflow = inotify.read(CHECK_INTERVAL)
+                    for name in names:
+                        self._add(name)
+                    if overflow or time.monotonic() - last_scan >= RESCAN_INTERVAL:
+                        self.scan()
+                        last_scan = time.monotonic()
+                else:
+                    stop.wait(CHECK_INTERVAL)
+                    if time.monotonic() - last_scan >= POLL_INTERVAL:
+                        self.scan()
+                        last_scan = time.monotonic()
+                self.check_pending()
+        finally:
+            if inotify is not None:
+                inotify.close()
@@ -0,0 +1,38 @@
+import os
+import pytest
+import libs.libprobe as libprobe
+
+# Propriétés sondées d'un clip H.264 1080p29.97 de 10 s avec audio AAC stéréo
+PROBE_INFO = {"codec": "h264", "profile": None, "duration": 10.0, "width": 1920, "height": 1080,
+              "fps": 29.97, "pix_fmt": "yuv420p", "field_order": "progressive", "bit_rate": None,
+              "format": None, "audio_codec": "aac", "audio_channels": 2, "audio_layout": "stereo",
+              "audio_sample_rate": 48000}
+
+class FakeProbe:
+    """Remplace libprobe.probe : info est retourné pour tous les fichiers (None : illisible),
+    sauf ceux dont le nom a des propriétés propres (set_file)."""
+
+    def __init__(self):
+        self.info = dict(PROBE_INFO)
+        self.files = {}
+
+    def set(self, **fields) -> None:
+        self.info = dict(PROBE_INFO, **fields)
+
+    def set_file(self, name: str, **fields) -> None:
+        self.files[name] = dict(PROBE_INFO, **fields)
+
+    def __call__(self, filename):
+        return self.files.get(os.path.basename(filename), self.info)
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Cache, configuration et état de l'outil dans un dossier temporaire."""
+    for env in ("XDG_CACHE_HOME", "XDG_CONFIG_HOME", "XDG_DATA_HOME", "XDG_STATE_HOME", "XDG_RUNTIME_DIR"):
+        monkeypatch.setenv(env, str(tmp_path / env.lower()))
+
+@pytest.fixture
+def probe(monkeypatch):
+    fake = FakeProbe()
+    monkeypatch.setattr(libprobe, "probe", fake)
+    return fake
@@ -0,0 +1,61 @@
+import subprocess
+import pytest
+import libs.libbench as libbench
+import libs.libcaps as libcaps
+import libs.libffmpeg as libffmpeg
+
+PRORES = libffmpeg.MODE_ALIASES["prores"]
+WEB = libffmpeg.MODE_ALIASES["web"]
+
+@pytest.fixture
+def encoders(monkeypatch):
+    """Encodeurs disponibles (tous les modes sont considérés comme disponibles)."""
+    available = {"libx264", "libx265", "prores_ks", "mjpeg"}
+    monkeypatch.setattr(libcaps, "has_encoder", lambda name: name in available)
+    monkeypatch.setattr(libcaps, "get_capabilities", lambda: {"version": "test"})
+    monkeypatch.setattr(libffmpeg, "mode_available", lambda mode: True)
+    return available
+
+def test_sources_for_mode():
+    assert libbench.sources_for_mode(PRORES) == ["h264", "hevc"]
+    assert libbench.sources_for_mode(WEB) == ["prores"]
+    assert libbench.sources_for_mode(libffmpeg.MODE_ALIASES["mjpeg-h264"]) == ["mjpeg"]
+
+def test_available_sources(encoders):
+    assert libbench.available_sources(PRORES) == ["h264", "hevc"]
+    encoders.discard("libx264")
+    assert libbench.available_sources(PRORES) == ["hevc"]
+    encoders.discard("libx265")
+    assert libbench.available_sources(PRORES) == []
+
+def test_source_generation_failure_is_reported(encoders, monkeypatch):
+    def generate_source(kind, size, duration):
+        if kind == "h264":
+            raise subprocess.CalledProcessError(1, ["ffmpeg"])
+        return libbench.source_file(kind, size, duration)
+    monkeypatch.setattr(libbench, "generate_source", generate_source)
+    monkeypatch.setattr(libbench, "run_case", lambda source, mode, threads, jobs, work_dir: {
+        "mode": mode, "source": source, "threads": threads, "jobs": jobs, "ok": True, "speed": 2.0,
+        "output_bytes": 1000})
+    results = []
+    report = libbench.run_bench([PRORES], thread_counts=(0, 4), duration=2, on_result=results.append)
+
+    assert report["results"] == results
+    failed = [r for r in results if not r["ok"]]
+    assert [(r["source"], r["threads"]) for r in failed] == [("testsrc2_1080p_2s_h264.mp4", 0),
+                                                            ("testsrc2_1080p_2s_h264.mp4", 4)]
+    assert all(r["error"] and r["speed"] is None for r in failed)
+    assert len(results) == 4
+
+    baseline = {"results": [dict(r, ok=True, speed=2.0, output_bytes=1000) for r in results]}
+    regressions = libbench.compare(report, baseline)
+    assert [(r["case"].split("|")[1], r["metric"]) for r in regressions] == [
+        ("testsrc2_1080p_2s_h264.mp4", "ok"), ("testsrc2_1080p_2s_h264.mp4", "ok")]
+
+def test_compare_speed_and_size():
+    base = {"mode": PRORES, "source": "s.mp4", "threads": 0, "jobs": 1, "ok": True, "speed": 2.0, "output_bytes": 1000}
+    report = {"results": [dict(base, speed=1.7, output_bytes=1200)]}
+    metrics = [r["metric"] for r in libbench.compare(report, {"results": [base]})]
+    assert metrics == ["speed", "output_bytes"]
+    report = {"results": [dict(base, speed=1.9, output_bytes=1050)]}
+    assert libbench.compare(report, {"results": [base]}) == []
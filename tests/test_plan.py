@@ -0,0 +1,62 @@
+import pytest
+import libs.libffmpeg as libffmpeg
+
+PRORES = libffmpeg.MODE_ALIASES["prores"]
+DNXHR = libffmpeg.MODE_ALIASES["dnxhr"]
+PROXY = libffmpeg.MODE_ALIASES["proxy-prores"]
+WEB = libffmpeg.MODE_ALIASES["web"]
+MJPEG_H264 = libffmpeg.MODE_ALIASES["mjpeg-h264"]
+
+def plan(file_path, mode):
+    return libffmpeg.plan_conversion(file_path, mode, libffmpeg.get_output_file(file_path, mode, "/out"))
+
+def test_unknown_file_is_encoded(probe):
+    probe.info = None
+    assert plan("clip.mp4", PRORES) == libffmpeg.STRATEGY_ENCODE
+
+def test_other_codec_is_encoded(probe):
+    probe.set(codec="h264")
+    assert plan("clip.mp4", PRORES) == libffmpeg.STRATEGY_ENCODE
+
+@pytest.mark.parametrize("file_path, audio_codec, expected", [
+    ("clip.mov", "pcm_s16le", libffmpeg.STRATEGY_SKIP),
+    ("clip.mov", None, libffmpeg.STRATEGY_SKIP),
+    ("clip.mkv", "pcm_s16le", libffmpeg.STRATEGY_REMUX),
+    ("clip.mov", "aac", libffmpeg.STRATEGY_COPY_VIDEO),
+    ("clip.mkv", "aac", libffmpeg.STRATEGY_COPY_VIDEO),
+])
+def test_prores_source_for_prores_mode(probe, file_path, audio_codec, expected):
+    probe.set(codec="prores", pix_fmt="yuv422p10le", audio_codec=audio_codec)
+    assert plan(file_path, PRORES) == expected
+
+def test_intermediate_codec_ignores_pix_fmt(probe):
+    probe.set(codec="prores", pix_fmt="yuv444p10le", audio_codec="pcm_s16le")
+    assert plan("clip.mov", PRORES) == libffmpeg.STRATEGY_SKIP
+
+def test_delivery_codec_checks_pix_fmt(probe):
+    probe.set(codec="h264", pix_fmt="yuv422p")
+    assert plan("clip.mp4", WEB) == libffmpeg.STRATEGY_ENCODE
+    probe.set(codec="h264", pix_fmt="yuv420p")
+    assert plan("clip.mp4", WEB) == libffmpeg.STRATEGY_SKIP
+    assert plan("clip.mov", WEB) == libffmpeg.STRATEGY_REMUX
+
+def test_proxy_is_always_encoded(probe):
+    probe.set(codec="prores", pix_fmt="yuv422p10le", audio_codec="pcm_s16le")
+    assert plan("clip.mov", PROXY) == libffmpeg.STRATEGY_ENCODE
+
+def test_fixed_size_and_rate(probe):
+    probe.set(codec="dnxhd", pix_fmt="yuv422p10le", audio_codec="pcm_s16le",
+                        width=1920, height=1080, fps=60.0)
+    assert plan("clip.mov", DNXHR) == libffmpeg.STRATEGY_ENCODE
+    probe.set(codec="dnxhd", pix_fmt="yuv422p10le", audio_codec="pcm_s16le",
+                        width=3840, height=2160, fps=29.97)
+    assert plan("clip.mov", DNXHR) == libffmpeg.STRATEGY_ENCODE
+    probe.set(codec="dnxhd", pix_fmt="yuv422p10le", audio_codec="pcm_s16le",
+                        width=3840, height=2160, fps=60.0)
+    assert plan("clip.mov", DNXHR) == libffmpeg.STRATEGY_SKIP
+
+def test_interlaced_source_with_deinterlace(probe):
+    probe.set(codec="h264", field_order="tt")
+    assert plan("clip.mp4", MJPEG_H264) == libffmpeg.STRATEGY_ENCODE
+    probe.set(codec="h264", field_order="progressive")
+    assert plan("clip.mp4", MJPEG_H264) == libffmpeg.STRATEGY_SKIP
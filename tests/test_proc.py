@@ -0,0 +1,59 @@
+import os
+import pytest
+import libs.libproc as libproc
+
+def test_parse_cpulist():
+    assert libproc.parse_cpulist("0-3,8-11\n") == [0, 1, 2, 3, 8, 9, 10, 11]
+    assert libproc.parse_cpulist("5") == [5]
+    assert libproc.parse_cpulist("") == []
+
+def test_format_cpulist():
+    assert libproc.format_cpulist([8, 0, 1, 2, 3]) == "0-3,8"
+    assert libproc.format_cpulist([]) == ""
+    assert libproc.parse_cpulist(libproc.format_cpulist([1, 3, 4, 5, 9])) == [1, 3, 4, 5, 9]
+
+@pytest.fixture
+def sysfs(tmp_path, monkeypatch):
+    """Arborescence /sys factice : 2 nœuds de 4 cœurs SMT (CPU n et n + 8 sur le même cœur)."""
+    node_dir, cpu_dir = tmp_path / "node", tmp_path / "cpu"
+    for node, cpulist in ((0, "0-3,8-11"), (1, "4-7,12-15")):
+        (node_dir / f"node{node}").mkdir(parents=True)
+        (node_dir / f"node{node}" / "cpulist").write_text(cpulist + "\n")
+    for cpu in range(16):
+        topology = cpu_dir / f"cpu{cpu}" / "topology"
+        topology.mkdir(parents=True)
+        (topology / "physical_package_id").write_text("0" if cpu % 8 < 4 else "1")
+        (topology / "core_id").write_text(str(cpu % 8))
+    monkeypatch.setattr(libproc, "NODE_DIR", str(node_dir))
+    monkeypatch.setattr(libproc, "CPU_DIR", str(cpu_dir))
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(16)))
+
+def test_numa_nodes_groups_smt_threads(sysfs):
+    assert libproc.numa_nodes() == [(0, [0, 8, 1, 9, 2, 10, 3, 11]), (1, [4, 12, 5, 13, 6, 14, 7, 15])]
+
+def test_numa_nodes_respects_affinity(sysfs, monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 8, 9})
+    assert libproc.numa_nodes() == [(0, [0, 8, 1, 9])]
+
+def test_numa_nodes_without_sysfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(libproc, "NODE_DIR", str(tmp_path / "missing"))
+    monkeypatch.setattr(libproc, "CPU_DIR", str(tmp_path / "missing"))
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {3, 1, 2})
+    assert libproc.numa_nodes() == [(0, [1, 2, 3])]
+
+def test_plan_slots_alternates_nodes(sysfs):
+    slots = libproc.plan_slots(4)
+    assert [node for node, _ in slots] == [0, 1, 0, 1]
+    assert slots[0] == (0, [0, 8, 1, 9])
+    assert slots[1] == (1, [4, 12, 5, 13])
+    cpus = [cpu for _, slot in slots for cpu in slot]
+    assert sorted(cpus) == list(range(16))
+
+def test_plan_slots_odd_count(sysfs):
+    slots = libproc.plan_slots(3)
+    assert [node for node, _ in slots] == [0, 1, 0]
+    assert [len(cpus) for _, cpus in slots] == [4, 8, 4]
+
+def test_plan_slots_more_jobs_than_cpus(monkeypatch):
+    monkeypatch.setattr(libproc, "numa_nodes", lambda: [(0, [0, 1])])
+    assert libproc.plan_slots(4) == [(0, [0]), (0, [1])]
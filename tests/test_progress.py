@@ -0,0 +1,48 @@
+import libs.libprogress as libprogress
+
+def feed_block(parser, lines):
+    results = [parser.feed(line) for line in lines]
+    assert all(r is None for r in results[:-1])
+    return results[-1]
+
+def test_block_parsed_at_progress_line():
+    parser = libprogress.ProgressParser()
+    snapshot = feed_block(parser, [
+        "frame=250", "fps=49.8", "bitrate=2345.6kbits/s", "total_size=1048576",
+        "out_time_us=10000000", "out_time_ms=10000000", "speed=1.99x", "progress=continue",
+    ])
+    assert snapshot == {"out_time": 10.0, "fps": 49.8, "speed": 1.99, "bitrate": 2345.6,
+                        "frame": 250, "total_size": 1048576, "end": False}
+
+def test_end_block_and_na_values():
+    parser = libprogress.ProgressParser()
+    snapshot = feed_block(parser, ["frame=0", "fps=N/A", "bitrate=N/A", "out_time_us=N/A",
+                                   "speed=N/A", "progress=end"])
+    assert snapshot["end"] is True
+    assert snapshot["out_time"] is None
+    assert snapshot["fps"] is None and snapshot["speed"] is None and snapshot["bitrate"] is None
+    assert snapshot["frame"] == 0 and snapshot["total_size"] == 0
+
+def test_out_time_ms_fallback_and_negative_clamp():
+    parser = libprogress.ProgressParser()
+    assert feed_block(parser, ["out_time_ms=2500000", "progress=continue"])["out_time"] == 2.5
+    assert feed_block(parser, ["out_time_us=-40000", "progress=continue"])["out_time"] == 0.0
+
+def test_blocks_are_independent():
+    parser = libprogress.ProgressParser()
+    feed_block(parser, ["frame=10", "fps=25", "progress=continue"])
+    snapshot = feed_block(parser, ["frame=20", "progress=continue"])
+    assert snapshot["frame"] == 20
+    assert snapshot["fps"] is None
+
+def test_lines_without_value_are_ignored():
+    parser = libprogress.ProgressParser()
+    assert parser.feed("") is None
+    assert parser.feed("Press [q] to stop") is None
+    assert feed_block(parser, ["frame=5", "progress=continue"])["frame"] == 5
+
+def test_format_eta():
+    assert libprogress.format_eta(None) == "--:--:--"
+    assert libprogress.format_eta(0) == "0:00:00"
+    assert libprogress.format_eta(59.6) == "0:01:00"
+    assert libprogress.format_eta(3725) == "1:02:05"
@@ -0,0 +1,37 @@
+import libs.libqueue as libqueue
+
+def test_add_keeps_order_and_skips_duplicates():
+    queue = libqueue.FileQueue()
+    assert queue.add(["b.mp4", "a.mp4", "b.mp4"]) == ["b.mp4", "a.mp4"]
+    assert queue.add(["a.mp4", "c.mp4"]) == ["c.mp4"]
+    assert queue.paths() == ["b.mp4", "a.mp4", "c.mp4"]
+    assert len(queue) == 3
+    assert "a.mp4" in queue
+    assert queue.get("a.mp4")["status"] == libqueue.STATUS_PROBING
+
+def test_remove_and_clear():
+    queue = libqueue.FileQueue()
+    queue.add(["a.mp4", "b.mp4", "c.mp4"])
+    queue.remove(["b.mp4", "missing.mp4"])
+    assert queue.paths() == ["a.mp4", "c.mp4"]
+    # Un fichier retiré puis ajouté à nouveau passe en fin de file
+    queue.add(["b.mp4"])
+    assert queue.paths() == ["a.mp4", "c.mp4", "b.mp4"]
+    queue.clear()
+    assert len(queue) == 0 and queue.paths() == []
+
+def test_update_removed_file():
+    queue = libqueue.FileQueue()
+    queue.add(["a.mp4"])
+    assert queue.update("a.mp4", status=libqueue.STATUS_READY, size=1024)
+    assert queue.get("a.mp4")["size"] == 1024
+    queue.remove(["a.mp4"])
+    assert not queue.update("a.mp4", status=libqueue.STATUS_READY)
+    assert queue.get("a.mp4") is None
+
+def test_format_row():
+    entry = {"info": {"codec": "h264", "duration": 3725.0, "width": 1920, "height": 1080},
+             "size": 5 * 1024 ** 2, "status": "ok"}
+    assert libqueue.format_row("a.mp4", entry) == ("a.mp4", "h264", "1:02:05", "1920x1080", "5 MiB", "ok")
+    entry = {"info": None, "size": None, "status": "ok"}
+    assert libqueue.format_row("a.mp4", entry) == ("a.mp4", "", "", "", "", "ok")
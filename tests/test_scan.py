@@ -0,0 +1,44 @@
+import os
+import libs.libscan as libscan
+import libs.libwatch as libwatch
+
+def test_tool_outputs_are_excluded():
+    assert libscan.is_tool_output("/media/clip_ProRes_DV.mov")
+    assert libscan.is_tool_output("/media/clip_DNxHR_DV.mov")
+    assert libscan.is_tool_output("/media/clip_Web.mp4")
+    assert libscan.is_tool_output("/media/Proxy/clip.mov")
+    assert libscan.is_tool_output("/media/.clip_ProRes_DV.mov.part.mov")
+
+def test_sources_are_kept():
+    assert not libscan.is_tool_output("/media/clip.mp4")
+    assert not libscan.is_tool_output("/media/Proxy_2024/clip.mov")
+    assert not libscan.is_tool_output("/media/clip_Web/source.mp4")
+
+def test_parse_extensions():
+    assert libscan.parse_extensions("mp4, MOV .mts") == (".mp4", ".mov", ".mts")
+    assert libscan.parse_extensions("") == libwatch.VIDEO_EXTENSIONS
+    assert libscan.parse_extensions(" , . ") == libwatch.VIDEO_EXTENSIONS
+
+def test_walk_skips_hidden_directories_and_symlinks(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a").mkdir()
+    (tmp_path / ".hidden").mkdir()
+    for name in ("a/1.mp4", "b/2.mp4", ".hidden/3.mp4", "top.mov"):
+        (tmp_path / name).write_bytes(b"")
+    os.symlink(tmp_path, tmp_path / "a" / "loop")
+    found = [os.path.relpath(p, tmp_path) for p in libscan.walk(str(tmp_path))]
+    assert sorted(found) == ["a/1.mp4", "b/2.mp4", "top.mov"]
+    assert found.index("a/1.mp4") < found.index("b/2.mp4")
+
+def test_folder_scan_counters(tmp_path):
+    (tmp_path / "Proxy").mkdir()
+    for name in ("clip.mp4", "clip_ProRes_DV.mov", "Proxy/clip.mov", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    found = []
+    counts = libscan.FolderScan(str(tmp_path), on_found=found.append).run()
+    assert found == [str(tmp_path / "clip.mp4")]
+    assert libscan.scan_files(str(tmp_path)) == found
+    assert counts["seen"] == 4
+    assert counts["candidates"] == 1
+    assert counts["excluded"] == 2
+    assert counts["added"] == 1
@@ -0,0 +1,25 @@
+import libs.libffmpeg as libffmpeg
+import libs.libsched as libsched
+
+PRORES = libffmpeg.MODE_ALIASES["prores"]
+
+def test_plan_reports_finished_jobs_after_sorting(probe, tmp_path):
+    probe.set_file("short.mp4", duration=10.0)
+    probe.set_file("unreadable.mp4", duration=None)
+    probe.set_file("ready.mov", codec="prores", pix_fmt="yuv422p10le", audio_codec="pcm_s16le", duration=30.0)
+    probe.set_file("long.mp4", duration=60.0)
+    files = [str(tmp_path / name) for name in ("short.mp4", "unreadable.mp4", "ready.mov", "long.mp4")]
+    ended = []
+
+    def on_job_end(job, batch):
+        ended.append((job.name, batch.jobs.index(job), [j.name for j in batch.jobs]))
+
+    batch = libsched.BatchScheduler(files, PRORES, str(tmp_path / "out"), max_jobs=1, num_threads=1,
+                                    on_job_end=on_job_end)
+    batch.plan()
+    order = ["long.mp4", "ready.mov", "short.mp4", "unreadable.mp4"]
+    assert [j.name for j in batch.jobs] == order
+    # Les jobs terminés pendant la préparation sont signalés avec leur place définitive
+    assert ended == [("unreadable.mp4", 3, order), ("ready.mov", 1, order)]
+    assert batch.find_job(files[2]).state == libsched.STATE_SKIPPED
+    assert batch.find_job(files[1]).state == libsched.STATE_FAILED
@@ -0,0 +1,40 @@
+import libs.libffmpeg as libffmpeg
+import libs.libprobe as libprobe
+import libs.libsegment as libsegment
+
+def test_regular_keyframes():
+    assert libsegment.choose_boundaries([float(k) for k in range(600)], 600.0, 4) == [150.0, 300.0, 450.0]
+
+def test_nearest_keyframe():
+    keyframes = [0.0, 100.0, 190.0, 260.0, 420.0, 590.0]
+    assert libsegment.choose_boundaries(keyframes, 600.0, 3) == [190.0, 420.0]
+
+def test_minimum_segment_length():
+    # 20 trop près du début, 580 trop près de la fin : aucun point de coupe possible
+    assert libsegment.choose_boundaries([0.0, 20.0, 580.0], 600.0, 4) == []
+    # Segments d'au moins min_len : le second point de coupe est repoussé
+    assert libsegment.choose_boundaries([0.0, 140.0, 150.0, 500.0], 600.0, 4, min_len=30) == [150.0, 500.0]
+
+def test_sparse_keyframes_give_fewer_segments():
+    assert libsegment.choose_boundaries([0.0, 300.0], 600.0, 4) == [300.0]
+
+def test_plan_segments_caches_cut_points(monkeypatch):
+    values, probes = {}, []
+    monkeypatch.setattr(libffmpeg, "get_duration", lambda path: 600.0)
+    monkeypatch.setattr(libprobe, "get_value", lambda path, key: values.get((path, key)))
+    monkeypatch.setattr(libprobe, "set_value", lambda path, key, value: values.__setitem__((path, key), value))
+
+    def get_keyframes(path):
+        probes.append(path)
+        return [float(k) for k in range(0, 600, 2)]
+    monkeypatch.setattr(libprobe, "get_keyframes", get_keyframes)
+
+    cuts = libsegment.plan_segments("clip.mp4", 2)
+    assert cuts == [150.0, 300.0, 450.0]
+    assert libsegment.plan_segments("clip.mp4", 2) == cuts
+    assert probes == ["clip.mp4"]
+
+def test_plan_segments_not_useful(monkeypatch):
+    monkeypatch.setattr(libffmpeg, "get_duration", lambda path: 120.0)
+    assert libsegment.plan_segments("clip.mp4", 1) == []
+    assert libsegment.plan_segments("clip.mp4", 4) == []
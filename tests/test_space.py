@@ -0,0 +1,83 @@
+import libs.libffmpeg as libffmpeg
+import libs.libspace as libspace
+
+PRORES = libffmpeg.MODE_ALIASES["prores"]
+DNXHR = libffmpeg.MODE_ALIASES["dnxhr"]
+
+class FakeJob:
+    def __init__(self, file_path, outputs, strategy=libffmpeg.STRATEGY_ENCODE, finished=False):
+        self.file_path = file_path
+        self.outputs = outputs
+        self.strategy = strategy
+        self.finished = finished
+
+    def is_finished(self):
+        return self.finished
+
+def test_parse_rate():
+    assert libspace._parse_rate("440M") == 440e6
+    assert libspace._parse_rate("192k") == 192e3
+    assert libspace._parse_rate("1500") == 1500.0
+    assert libspace._parse_rate(None) is None
+    assert libspace._parse_rate("fast") is None
+
+def test_prores_estimate_from_bits_per_pixel(probe):
+    video = libspace.PRORES_BITS_PER_PIXEL["3"] * 1920 * 1080 * 29.97
+    audio = 16 * 48000 * 2
+    expected = int((video + audio) / 8 * 10.0 * libspace.SIZE_MARGIN)
+    assert libspace.estimate_output_size("clip.mp4", PRORES) == expected
+
+def test_dnxhr_estimate_from_target_rate(probe):
+    size = libspace.estimate_output_size("clip.mp4", DNXHR)
+    # Débit fixé par -b:v, audio PCM 16 bits stéréo
+    assert size == int((440e6 + 16 * 48000 * 2) / 8 * 10.0 * libspace.SIZE_MARGIN)
+
+def test_no_audio_stream(probe):
+    with_audio = libspace.estimate_output_size("clip.mp4", PRORES)
+    probe.set(audio_codec=None)
+    assert libspace.estimate_output_size("clip.mp4", PRORES) < with_audio
+
+def test_fast_path_estimates(probe, tmp_path):
+    source = tmp_path / "clip.mov"
+    source.write_bytes(b"x" * 1000)
+    assert libspace.estimate_output_size(str(source), PRORES, libffmpeg.STRATEGY_SKIP) == 0
+    assert libspace.estimate_output_size(str(source), PRORES, libffmpeg.STRATEGY_REMUX) == 1150
+    assert libspace.estimate_output_size(str(source), PRORES, libffmpeg.STRATEGY_COPY_VIDEO) == 1150
+
+def test_unknown_duration(probe):
+    probe.info = None
+    assert libspace.estimate_output_size("clip.mp4", PRORES) is None
+
+def test_preflight(monkeypatch):
+    sizes = {"a.mp4": 100, "b.mp4": 300, "c.mp4": 200, "d.mp4": None}
+    monkeypatch.setattr(libspace, "estimate_output_size", lambda path, mode, strategy: sizes[path])
+    free = {"/dest": 10 * 1024 ** 3, "/scratch": 10 * 1024 ** 3}
+    monkeypatch.setattr(libspace, "free_space", lambda path: free[path])
+    jobs = [FakeJob(name, [(PRORES, "out")]) for name in sizes]
+    jobs.append(FakeJob("e.mp4", [(PRORES, "out")], finished=True))
+
+    result = libspace.preflight(jobs, "/dest", "/scratch", max_jobs=1)
+    assert result["required"] == 600
+    assert result["unknown"] == 1
+    # Dossier de travail : les 2 x max_jobs plus grosses sorties
+    assert result["scratch_required"] == 500
+    assert result["ok"] is True
+
+    free["/dest"] = libspace.MIN_FREE_BYTES + 599
+    assert libspace.preflight(jobs, "/dest", "/scratch")["ok"] is False
+
+def test_preflight_scratch_full(monkeypatch):
+    monkeypatch.setattr(libspace, "estimate_output_size", lambda path, mode, strategy: 1024 ** 3)
+    free = {"/dest": 100 * 1024 ** 3, "/scratch": 2 * 1024 ** 3}
+    monkeypatch.setattr(libspace, "free_space", lambda path: free[path])
+    jobs = [FakeJob(f"{i}.mp4", [(PRORES, "out")]) for i in range(4)]
+    assert libspace.preflight(jobs, "/dest")["ok"] is True
+    assert libspace.preflight(jobs, "/dest", "/scratch", max_jobs=2)["ok"] is False
+
+def test_free_space_of_missing_directory(tmp_path):
+    assert libspace.free_space(str(tmp_path / "a" / "b")) == libspace.free_space(str(tmp_path))
+
+def test_format_size():
+    assert libspace.format_size(None) == "?"
+    assert libspace.format_size(5 * 1024 ** 2) == "5 MiB"
+    assert libspace.format_size(1.5 * 1024 ** 3) == "1.5 GiB"
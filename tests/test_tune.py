@@ -0,0 +1,52 @@
+import subprocess
+import pytest
+import libs.libbench as libbench
+import libs.libcaps as libcaps
+import libs.libffmpeg as libffmpeg
+import libs.libtune as libtune
+
+PRORES = libffmpeg.MODE_ALIASES["prores"]
+
+@pytest.fixture
+def calibration(monkeypatch):
+    """Encodeurs disponibles et sources générées ; les encodages de calibration sont simulés."""
+    class Calibration:
+        encoders = {"libx265", "prores_ks"}
+        sources = []
+        error = None
+
+    def generate_source(kind, size, duration):
+        if Calibration.error:
+            raise Calibration.error
+        Calibration.sources.append(kind)
+        return libbench.source_file(kind, size, duration)
+
+    monkeypatch.setattr(libcaps, "has_encoder", lambda name: name in Calibration.encoders)
+    monkeypatch.setattr(libcaps, "get_capabilities", lambda: {"version": "test"})
+    monkeypatch.setattr(libtune, "_machines", None)
+    monkeypatch.setattr(libbench, "generate_source", generate_source)
+    monkeypatch.setattr(libbench, "run_case", lambda source, mode, threads, jobs, work_dir: {
+        "mode": mode, "threads": threads, "jobs": jobs, "ok": True, "fps": 10.0 * jobs + threads})
+    return Calibration
+
+def test_candidates():
+    assert libtune.candidates(8) == [(0, 1), (8, 1), (4, 2), (2, 4), (1, 8)]
+    assert libtune.candidates(1) == [(0, 1), (1, 1)]
+
+def test_source_with_available_encoder(calibration):
+    tuning = libtune.calibrate(PRORES)
+    assert calibration.sources == ["hevc"]
+    best = max(libtune.candidates(), key=lambda combo: 10.0 * combo[1] + combo[0])
+    assert (tuning["threads"], tuning["jobs"]) == best
+    assert libtune.get_tuning(PRORES) == tuning
+
+def test_no_source_encoder(calibration):
+    calibration.encoders = {"prores_ks"}
+    assert libtune.calibrate(PRORES) is None
+    assert calibration.sources == []
+
+@pytest.mark.parametrize("error", [subprocess.CalledProcessError(1, ["ffmpeg"]), OSError(28, "No space left")])
+def test_source_generation_failure(calibration, error):
+    calibration.error = error
+    assert libtune.calibrate(PRORES) is None
+    assert libtune.get_tuning(PRORES) is None